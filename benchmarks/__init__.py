@@ -0,0 +1 @@
+"""Main benchmarks init module."""
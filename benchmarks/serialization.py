@@ -0,0 +1,117 @@
+"""Benchmark of the response serialization paths on a full-season payload.
+
+It compares, for the body of `v1/matches-stats/batch` with every player of a
+season, the default path, which builds the response model and lets FastAPI
+validate it again against `response_model` before encoding it with
+`jsonable_encoder` and `json`, with the fast path of `PYFANTA_FAST_RESPONSES`,
+which encodes the serializers' data as it is with `FastJSONResponse`.
+
+Run it from the project directory with ```python -m benchmarks.serialization```.
+"""
+
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src.api.batch import batch_item
+from src.api.models import MatchesStatsBatchResponse, PlayerLink
+from src.api.responses import FastJSONResponse
+
+TEAMS: List[str] = [f"Team {i}" for i in range(20)]
+GRADED_SHARE: float = 0.6
+
+
+def season_items(players: int, game_days: int = 38) -> List[Dict[str, Any]]:
+    """Builds the batch items of a synthetic season, as the serializers do.
+
+    Parameters
+    ----------
+    players : int
+        Number of players of the season.
+    game_days : int
+        Number of game days of the season.
+
+    Returns:
+    -------
+    List[Dict[str, Any]]
+        One batch item per player, following `MatchesStatsBatchItem`.
+    """
+    rng = random.Random(0)
+    items: List[Dict[str, Any]] = []
+    for i in range(players):
+        name: str = f"Player {i}"
+        rows: List[Dict[str, Any]] = []
+        for game_day in range(1, game_days + 1):
+            graded: bool = rng.random() < GRADED_SHARE
+            rows.append(
+                {
+                    "name": name,
+                    "game_day": game_day,
+                    "grade": rng.choice([5.5, 6.0, 7.0]) if graded else None,
+                    "fanta_grade": rng.choice([5.0, 7.5, 9.0]) if graded else None,
+                    "bonus": rng.choice([0.0, 3.0]) if graded else None,
+                    "malus": rng.choice([0.0, 0.5]) if graded else None,
+                    "home_team": rng.choice(TEAMS),
+                    "guest_team": rng.choice(TEAMS),
+                    "home_team_score": rng.randint(0, 4),
+                    "guest_team_score": rng.randint(0, 4),
+                    "subsitution_in": rng.choice([None, 60.0]),
+                    "subsitution_out": rng.choice([None, 75.0]),
+                }
+            )
+        player_link = PlayerLink(name=name, link=f"https://example.com/{i}")
+        items.append(batch_item(player_link, rows))
+
+    return items
+
+
+def default_path(items: List[Dict[str, Any]]) -> bytes:
+    """Encodes the items the way FastAPI does for a returned response model."""
+    model = MatchesStatsBatchResponse(data=items)
+    validated = MatchesStatsBatchResponse.parse_obj(model.dict(by_alias=True))
+    return bytes(JSONResponse(jsonable_encoder(validated)).body)
+
+
+def fast_path(items: List[Dict[str, Any]]) -> bytes:
+    """Encodes the items the way `data_response` does on the fast path."""
+    return bytes(FastJSONResponse({"data": items}).body)
+
+
+def measure(
+    func: Callable[[List[Dict[str, Any]]], bytes],
+    items: List[Dict[str, Any]],
+    runs: int,
+) -> float:
+    """Median seconds taken by `func` over `runs` runs."""
+    timings: List[float] = []
+    for _ in range(runs):
+        started_at: float = time.perf_counter()
+        func(items)
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    """Runs the benchmark and prints its results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=int, default=600)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    items = season_items(players=args.players)
+    default_seconds: float = measure(default_path, items, args.runs)
+    fast_seconds: float = measure(fast_path, items, args.runs)
+
+    print(f"Payload: {args.players} players, {len(default_path(items))} bytes")
+    print(f"Default path: {default_seconds * 1000:.1f} ms")
+    print(f"Fast path (orjson): {fast_seconds * 1000:.1f} ms")
+    print(f"Speedup: {default_seconds / fast_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
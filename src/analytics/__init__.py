@@ -0,0 +1 @@
+"""Main analytics init module."""
@@ -0,0 +1,29 @@
+"""Module for the constants of the season analytics."""
+
+from typing import Tuple
+
+
+class SeasonMatrixConstants:
+    """Class containing the layout of the dense season matrices."""
+
+    game_days: int = 38
+    float_stats: Tuple[str, ...] = (
+        "grade",
+        "fanta_grade",
+        "bonus",
+        "malus",
+        "subsitution_in",
+        "subsitution_out",
+    )
+    team_stats: Tuple[str, ...] = ("home_team", "guest_team")
+    score_stats: Tuple[str, ...] = ("home_team_score", "guest_team_score")
+    missing_code: int = -1
+    index_file: str = "index.json"
+    version_prefix: str = "version-"
+
+
+class FormConstants:
+    """Class containing default settings of the form and consistency analytics."""
+
+    window: int = 5
+    match_minutes: float = 90.0
@@ -0,0 +1,333 @@
+"""Module to compute the form and consistency of every player of a season at once."""
+
+from typing import Any, Dict, List, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from src.analytics.constants import FormConstants, SeasonMatrixConstants
+from src.analytics.season_matrix import SeasonMatrix
+
+JsonData = Dict[str, Any]
+
+FORM_STATS: List[str] = [
+    "appearances",
+    "minutes_played",
+    "avg_minutes_played",
+    "graded_matches",
+    "avg_grade",
+    "avg_fanta_grade",
+    "std_fanta_grade",
+    "form_grade",
+    "form_fanta_grade",
+    "home_graded_matches",
+    "home_avg_fanta_grade",
+    "away_graded_matches",
+    "away_avg_fanta_grade",
+]
+
+
+def _divide(
+    numerator: npt.NDArray[Any], denominator: npt.NDArray[Any]
+) -> npt.NDArray[np.float64]:
+    """Divides element-wise, with NaN where the denominator is zero."""
+    result: npt.NDArray[np.float64] = np.full(
+        np.shape(numerator), np.nan, dtype=np.float64
+    )
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _nanmean(values: npt.NDArray[Any], axis: int = 1) -> npt.NDArray[np.float64]:
+    """Mean of the non-NaN values along an axis, NaN if there are none."""
+    valid: npt.NDArray[np.bool_] = ~np.isnan(values)
+    return _divide(np.where(valid, values, 0.0).sum(axis=axis), valid.sum(axis=axis))
+
+
+def nan_to_none(values: npt.NDArray[Any]) -> List[Any]:
+    """Converts an array of floats to nested lists, with `None` for NaN.
+
+    Parameters
+    ----------
+    values : npt.NDArray[Any]
+        Array of floats, of any shape.
+
+    Returns:
+    -------
+    List[Any]
+        Values of the array, as returned by `tolist`, `None` where NaN.
+    """
+    result: npt.NDArray[Any] = values.astype(object)
+    result[np.isnan(values)] = None
+    return list(result.tolist())
+
+
+def rolling_mean(values: npt.NDArray[Any], window: int) -> npt.NDArray[np.float64]:
+    """Rolling mean of each row over the last `window` columns, skipping NaN.
+
+    Computed from two cumulative sums, of the values and of the non-NaN values,
+    whatever the number of rows and of columns.
+
+    Parameters
+    ----------
+    values : npt.NDArray[Any]
+        Array of shape (n_players, game days).
+    window : int
+        Number of game days averaged, up to and including each one.
+
+    Returns:
+    -------
+    npt.NDArray[np.float64]
+        Float64 array of the same shape, NaN where the window has no values.
+    """
+    if window < 1:
+        raise ValueError("The window must be of at least one game day.")
+    valid: npt.NDArray[np.bool_] = ~np.isnan(values)
+    padding: npt.NDArray[np.float64] = np.zeros((values.shape[0], 1))
+    sums: npt.NDArray[np.float64] = np.concatenate(
+        (padding, np.cumsum(np.where(valid, values, 0.0), axis=1)), axis=1
+    )
+    counts: npt.NDArray[np.float64] = np.concatenate(
+        (padding, np.cumsum(valid, axis=1)), axis=1
+    )
+    ends: npt.NDArray[np.intp] = np.arange(1, values.shape[1] + 1)
+    starts: npt.NDArray[np.intp] = np.maximum(ends - window, 0)
+
+    return _divide(sums[:, ends] - sums[:, starts], counts[:, ends] - counts[:, starts])
+
+
+def appearances(matrix: SeasonMatrix) -> npt.NDArray[np.bool_]:
+    """Whether each player played in each game day.
+
+    A player played if graded or, when on the pitch too briefly to be graded, if
+    subbed in.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+
+    Returns:
+    -------
+    npt.NDArray[np.bool_]
+        Boolean array of shape (n_players, game days).
+    """
+    played: npt.NDArray[np.bool_] = ~np.isnan(matrix["fanta_grade"]) | ~np.isnan(
+        matrix["subsitution_in"]
+    )
+    return played
+
+
+def minutes_played(
+    matrix: SeasonMatrix, match_minutes: float = FormConstants.match_minutes
+) -> npt.NDArray[np.float32]:
+    """Approximates the minutes played by each player in each game day.
+
+    Players are on the pitch from the minute they are subbed in, or from the kick
+    off, to the minute they are subbed out, or to the end of the match. Stoppage
+    time is not known.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+    match_minutes : float
+        Minutes of a match.
+
+    Returns:
+    -------
+    npt.NDArray[np.float32]
+        Float32 array of shape (n_players, game days), zero where not played.
+    """
+    sub_in: npt.NDArray[Any] = matrix["subsitution_in"]
+    sub_out: npt.NDArray[Any] = matrix["subsitution_out"]
+    minutes: npt.NDArray[Any] = np.where(np.isnan(sub_out), match_minutes, sub_out) - (
+        np.where(np.isnan(sub_in), 0.0, sub_in)
+    )
+    return np.where(appearances(matrix), np.clip(minutes, 0.0, None), 0.0).astype(
+        np.float32
+    )
+
+
+def player_teams(matrix: SeasonMatrix) -> npt.NDArray[Any]:
+    """Guesses the team of each player, as the team in most of the player's matches.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+
+    Returns:
+    -------
+    npt.NDArray[Any]
+        Team code of each player, `SeasonMatrixConstants.missing_code` for the
+        players without matches.
+    """
+    n_teams: int = len(matrix.teams)
+    counts: npt.NDArray[np.int32] = np.zeros((len(matrix), n_teams + 1), dtype=np.int32)
+    rows: npt.NDArray[np.intp] = np.arange(len(matrix))[:, np.newaxis]
+    for stat in SeasonMatrixConstants.team_stats:
+        codes: npt.NDArray[Any] = np.asarray(matrix[stat])
+        np.add.at(counts, (rows, np.where(codes < 0, n_teams, codes)), 1)
+    counts = counts[:, :n_teams]
+    if n_teams == 0:
+        return np.full(len(matrix), SeasonMatrixConstants.missing_code)
+
+    return np.where(
+        counts.max(axis=1) > 0,
+        counts.argmax(axis=1),
+        SeasonMatrixConstants.missing_code,
+    )
+
+
+def last_game_day(matrix: SeasonMatrix) -> int:
+    """Gets the last game day any player of the season has a row of.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+
+    Returns:
+    -------
+    int
+        Last game day played so far, `0` if none.
+    """
+    scheduled: npt.NDArray[np.bool_] = (
+        np.asarray(matrix["home_team"]) != SeasonMatrixConstants.missing_code
+    ).any(axis=0)
+    game_days: npt.NDArray[np.intp] = np.flatnonzero(scheduled)
+    return int(game_days[-1]) + 1 if len(game_days) else 0
+
+
+def season_form(
+    matrix: SeasonMatrix,
+    window: int = FormConstants.window,
+    through_game_day: Union[int, None] = None,
+    match_minutes: float = FormConstants.match_minutes,
+) -> Dict[str, npt.NDArray[Any]]:
+    """Computes the form and consistency of every player of a season.
+
+    Every stat is computed for all the players at once, with a few operations
+    over the (n_players, game days) arrays of the matrix.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+    window : int
+        Number of game days the form is averaged over.
+    through_game_day : Union[int, None]
+        Last game day taken into account, the last one played if `None`.
+    match_minutes : float
+        Minutes of a match.
+
+    Returns:
+    -------
+    Dict[str, npt.NDArray[Any]]
+        One array of length n_players per stat of `FORM_STATS`, plus the `team`
+        codes. Averages are NaN for the players with nothing to average.
+    """
+    game_days: int = (
+        last_game_day(matrix) if through_game_day is None else through_game_day
+    )
+    if window < 1:
+        raise ValueError("The window must be of at least one game day.")
+    if not 0 <= game_days <= matrix.game_days:
+        raise ValueError(f"Game day {game_days} is out of the season.")
+
+    grade: npt.NDArray[np.float64] = np.asarray(
+        matrix["grade"][:, :game_days], dtype=np.float64
+    )
+    fanta_grade: npt.NDArray[np.float64] = np.asarray(
+        matrix["fanta_grade"][:, :game_days], dtype=np.float64
+    )
+    graded: npt.NDArray[np.bool_] = ~np.isnan(fanta_grade)
+    played: npt.NDArray[np.bool_] = appearances(matrix)[:, :game_days]
+    minutes: npt.NDArray[np.float32] = minutes_played(matrix, match_minutes)[
+        :, :game_days
+    ]
+
+    team: npt.NDArray[Any] = player_teams(matrix)
+    has_team: npt.NDArray[np.bool_] = (team != SeasonMatrixConstants.missing_code)[
+        :, np.newaxis
+    ]
+    at_home: npt.NDArray[np.bool_] = has_team & (
+        matrix["home_team"][:, :game_days] == team[:, np.newaxis]
+    )
+    away: npt.NDArray[np.bool_] = has_team & (
+        matrix["guest_team"][:, :game_days] == team[:, np.newaxis]
+    )
+
+    graded_matches: npt.NDArray[np.intp] = graded.sum(axis=1)
+    avg_fanta_grade: npt.NDArray[np.float64] = _nanmean(fanta_grade)
+    deviations: npt.NDArray[np.float64] = np.where(
+        graded, fanta_grade - avg_fanta_grade[:, np.newaxis], 0.0
+    )
+    if game_days:
+        form_grade: npt.NDArray[np.float64] = rolling_mean(grade, window)[:, -1]
+        form_fanta_grade: npt.NDArray[np.float64] = rolling_mean(fanta_grade, window)[
+            :, -1
+        ]
+    else:
+        form_grade = form_fanta_grade = np.full(len(matrix), np.nan)
+
+    return {
+        "team": team,
+        "appearances": played.sum(axis=1),
+        "minutes_played": minutes.sum(axis=1, dtype=np.float64),
+        "avg_minutes_played": _divide(
+            minutes.sum(axis=1, dtype=np.float64), played.sum(axis=1)
+        ),
+        "graded_matches": graded_matches,
+        "avg_grade": _nanmean(grade),
+        "avg_fanta_grade": avg_fanta_grade,
+        "std_fanta_grade": np.sqrt(
+            _divide((deviations**2).sum(axis=1), graded_matches)
+        ),
+        "form_grade": form_grade,
+        "form_fanta_grade": form_fanta_grade,
+        "home_graded_matches": (graded & at_home).sum(axis=1),
+        "home_avg_fanta_grade": _nanmean(np.where(at_home, fanta_grade, np.nan)),
+        "away_graded_matches": (graded & away).sum(axis=1),
+        "away_avg_fanta_grade": _nanmean(np.where(away, fanta_grade, np.nan)),
+    }
+
+
+def form_records(
+    matrix: SeasonMatrix, form: Dict[str, npt.NDArray[Any]]
+) -> List[JsonData]:
+    """Turns the arrays of `season_form` into one record per player.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season the form was computed on.
+    form : Dict[str, npt.NDArray[Any]]
+        Form of the players, as returned by `season_form`.
+
+    Returns:
+    -------
+    List[JsonData]
+        Name, link, team and form stats of each player, `None` for NaN.
+    """
+    columns: Dict[str, List[Any]] = {
+        stat: nan_to_none(form[stat])
+        if form[stat].dtype.kind == "f"
+        else form[stat].tolist()
+        for stat in FORM_STATS
+    }
+    teams: List[Union[str, None]] = [
+        matrix.teams[code] if code != SeasonMatrixConstants.missing_code else None
+        for code in form["team"].tolist()
+    ]
+
+    return [
+        {
+            "name": player["name"],
+            "link": player["link"],
+            "team": teams[row],
+            **{stat: values[row] for stat, values in columns.items()},
+        }
+        for row, player in enumerate(matrix.players)
+    ]
@@ -0,0 +1,32 @@
+"""Module for the bonus and malus rules fanta grades are computed with."""
+
+from typing import Dict
+
+from pydantic import BaseModel
+
+
+class ScoringRules(BaseModel):
+    """Data validation model for the bonus and malus rules of a league.
+
+    Values are the points added to the grade for each event, negative for a malus.
+    The defaults are the standard rules the site's fanta grades follow, which give
+    the goalkeepers a clean sheet bonus. Values by role are keyed by the site's
+    roles, e.g. "difensore", case-insensitive, and override the value for every
+    other role. "portiere" and "goalkeeper" both match every goalkeeper.
+    """
+
+    name: str = "standard"
+    goal: float = 3.0
+    goal_by_role: Dict[str, float] = {}
+    assist: float = 1.0
+    penalty_saved: float = 3.0
+    penalty_missed: float = -3.0
+    yellow_card: float = -0.5
+    red_card: float = -1.0
+    autogoal: float = -2.0
+    goal_conceded: float = -1.0
+    clean_sheet: float = 0.0
+    clean_sheet_by_role: Dict[str, float] = {"portiere": 1.0}
+
+
+SITE_RULES: ScoringRules = ScoringRules()
@@ -0,0 +1,295 @@
+"""Module to recompute the fanta grades of a season under custom league rules."""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from src.analytics.constants import SeasonMatrixConstants
+from src.analytics.form import nan_to_none
+from src.analytics.rules import SITE_RULES, ScoringRules
+from src.analytics.season_matrix import SeasonMatrix
+from src.scraper.constants import PlayerRolesConstants
+from src.scraper.utils import is_goalkeeper
+
+JsonData = Dict[str, Any]
+
+GOALKEEPER_ROLE: str = PlayerRolesConstants.goalkeeper_roles[0]
+
+
+def _role(role: str) -> str:
+    """Normalises a role, spelling the goalkeepers' one as `GOALKEEPER_ROLE`."""
+    return GOALKEEPER_ROLE if is_goalkeeper(role) else role.strip().lower()
+
+
+def player_counters(
+    matrix: SeasonMatrix, summaries: Dict[str, JsonData]
+) -> Dict[str, npt.NDArray[Any]]:
+    """Gathers the season counters of the players of a matrix from their summaries.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+    summaries : Dict[str, JsonData]
+        Summary stats of the players, keyed by link. Players without summary
+        stats get no counters and no role.
+
+    Returns:
+    -------
+    Dict[str, npt.NDArray[Any]]
+        One array of length n_players per counter, plus whether each player is a
+        `goalkeeper`, by player type or role, the lowercase `role`s, spelled
+        `GOALKEEPER_ROLE` for every goalkeeper, and the lowercase `team`s.
+    """
+    rows: List[JsonData] = [
+        summaries.get(player["link"], {}) for player in matrix.players
+    ]
+
+    def counter(name: str) -> npt.NDArray[np.float64]:
+        return np.array([row.get(name) or 0 for row in rows], dtype=np.float64)
+
+    goalkeeper: npt.NDArray[np.bool_] = np.array(
+        [
+            row.get("player_type") == "goalkeeper"
+            or is_goalkeeper(str(row.get("role", "")))
+            for row in rows
+        ],
+        dtype=bool,
+    )
+    roles: List[str] = [_role(str(row.get("role", ""))) for row in rows]
+
+    return {
+        "goalkeeper": goalkeeper,
+        "role": np.where(goalkeeper, GOALKEEPER_ROLE, np.array(roles, dtype=str)),
+        "team": np.array([str(row.get("team", "")).lower() for row in rows], dtype=str),
+        "goals": counter("goals"),
+        "assists": counter("assists"),
+        "penalties_saved": counter("penalties_saved"),
+        "penalties_missed": counter("penalties_shot") - counter("penalties_scored"),
+        "yellow_cards": counter("yellow_cards"),
+        "red_cards": counter("red_cards"),
+        "autogoals": counter("autogoals"),
+    }
+
+
+def _by_role(
+    roles: npt.NDArray[Any], value: float, by_role: Dict[str, float]
+) -> npt.NDArray[np.float64]:
+    """Gets the value of a rule for each player, given the player's role."""
+    values: npt.NDArray[np.float64] = np.full(len(roles), value, dtype=np.float64)
+    for role, role_value in by_role.items():
+        values[roles == _role(role)] = role_value
+    return values
+
+
+def _game_day_teams(
+    matrix: SeasonMatrix, teams: npt.NDArray[Any]
+) -> npt.NDArray[np.int64]:
+    """Gets the team each player played for in each game day.
+
+    Of the two teams of a match, it is the one the player has more matches with
+    over the season: a player transferred mid-season has many matches with each
+    of the clubs and only a few with each opponent. Ties, e.g. for the players
+    with a single match, go to the team of the player's summary stats.
+    """
+    n_teams: int = len(matrix.teams)
+    home: npt.NDArray[np.int64] = np.asarray(matrix["home_team"], dtype=np.int64)
+    guest: npt.NDArray[np.int64] = np.asarray(matrix["guest_team"], dtype=np.int64)
+    home_index: npt.NDArray[np.int64] = np.where(home < 0, n_teams, home)
+    guest_index: npt.NDArray[np.int64] = np.where(guest < 0, n_teams, guest)
+    rows: npt.NDArray[np.intp] = np.arange(len(matrix))[:, np.newaxis]
+    counts: npt.NDArray[np.float64] = np.zeros((len(matrix), n_teams + 1))
+    np.add.at(counts, (rows, home_index), 1.0)
+    np.add.at(counts, (rows, guest_index), 1.0)
+    codes: Dict[str, int] = {
+        team.lower(): code for code, team in enumerate(matrix.teams)
+    }
+    summary_codes: npt.NDArray[np.int64] = np.array(
+        [codes.get(str(team), n_teams) for team in teams], dtype=np.int64
+    )
+    counts[rows[:, 0], summary_codes] += 0.5
+
+    return np.where(
+        home < 0,
+        SeasonMatrixConstants.missing_code,
+        np.where(counts[rows, home_index] >= counts[rows, guest_index], home, guest),
+    )
+
+
+def _season_points(
+    rules: ScoringRules, counters: Dict[str, npt.NDArray[Any]]
+) -> Dict[str, npt.NDArray[Any]]:
+    """Gets the bonus and malus points each player earned in the season."""
+    bonus: npt.NDArray[np.float64] = (
+        counters["goals"] * _by_role(counters["role"], rules.goal, rules.goal_by_role)
+        + counters["assists"] * rules.assist
+        + counters["penalties_saved"] * rules.penalty_saved
+    )
+    malus: npt.NDArray[np.float64] = (
+        counters["penalties_missed"] * rules.penalty_missed
+        + counters["yellow_cards"] * rules.yellow_card
+        + counters["red_cards"] * rules.red_card
+        + counters["autogoals"] * rules.autogoal
+    )
+    return {"bonus": bonus, "malus": malus}
+
+
+def _ratio(
+    custom: npt.NDArray[np.float64], site: npt.NDArray[np.float64]
+) -> npt.NDArray[np.float64]:
+    """Ratio of the custom points to the site ones, `1` where the site has none."""
+    ratio: npt.NDArray[np.float64] = np.ones(np.shape(site), dtype=np.float64)
+    np.divide(custom, site, out=ratio, where=site != 0)
+    return ratio
+
+
+def recompute_fanta_grades(
+    matrix: SeasonMatrix,
+    summaries: Dict[str, JsonData],
+    rules: Sequence[ScoringRules],
+) -> npt.NDArray[np.float64]:
+    """Recomputes the fanta grades of every player and game day under many rules.
+
+    The site only publishes the total bonus and malus of each game day, not the
+    events behind them. Goals conceded and clean sheets are known per game day,
+    from the scores of the team each player played for that day, so the site's
+    points for them are taken out of the bonus and malus of each game day and the
+    custom ones added back. Every other event is only counted over the season, by
+    the summary stats: the rest of the bonus and malus of each game day are scaled
+    by how many more, or fewer, points the player's season events are worth under
+    the custom rules than under the site's. This is exact for the game days with a
+    single kind of event and for rules scaling every event alike.
+
+    All the rule sets are applied at once, broadcasting (rules, players, game
+    days) arrays, without any Python loop per player or game day.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+    summaries : Dict[str, JsonData]
+        Summary stats of the players, keyed by link.
+    rules : Sequence[ScoringRules]
+        Rules of each league.
+
+    Returns:
+    -------
+    npt.NDArray[np.float64]
+        Float64 array of shape (rules, n_players, game days), NaN where the player
+        has no fanta grade on the site.
+    """
+    if not rules:
+        raise ValueError("At least one set of scoring rules is needed.")
+    counters: Dict[str, npt.NDArray[Any]] = player_counters(matrix, summaries)
+    goalkeeper: npt.NDArray[np.bool_] = counters["goalkeeper"][:, np.newaxis]
+
+    grade: npt.NDArray[np.float64] = np.asarray(matrix["grade"], dtype=np.float64)
+    site_fanta_grade: npt.NDArray[np.float64] = np.asarray(
+        matrix["fanta_grade"], dtype=np.float64
+    )
+    graded: npt.NDArray[np.bool_] = ~np.isnan(site_fanta_grade)
+    bonus: npt.NDArray[np.float64] = np.nan_to_num(
+        np.asarray(matrix["bonus"], dtype=np.float64)
+    )
+    malus: npt.NDArray[np.float64] = -np.abs(
+        np.nan_to_num(np.asarray(matrix["malus"], dtype=np.float64))
+    )
+
+    team: npt.NDArray[np.int64] = _game_day_teams(matrix, counters["team"])
+    has_team: npt.NDArray[np.bool_] = team != SeasonMatrixConstants.missing_code
+    at_home: npt.NDArray[np.bool_] = has_team & (matrix["home_team"] == team)
+    away: npt.NDArray[np.bool_] = has_team & (matrix["guest_team"] == team)
+    conceded: npt.NDArray[np.float64] = np.where(
+        at_home,
+        matrix["guest_team_score"],
+        np.where(away, matrix["home_team_score"], 0),
+    ).astype(np.float64)
+    clean_sheet: npt.NDArray[np.bool_] = graded & (at_home | away) & (conceded == 0)
+    site_clean_sheet: npt.NDArray[np.float64] = _by_role(
+        counters["role"], SITE_RULES.clean_sheet, SITE_RULES.clean_sheet_by_role
+    )
+    # Bonus of the events other than the clean sheets
+    other_bonus: npt.NDArray[np.float64] = (
+        bonus - clean_sheet * site_clean_sheet[:, np.newaxis]
+    )
+    # Malus of the events other than the goals conceded by goalkeepers
+    other_malus: npt.NDArray[np.float64] = malus - np.where(
+        goalkeeper, conceded * SITE_RULES.goal_conceded, 0.0
+    )
+
+    site_points: Dict[str, npt.NDArray[Any]] = _season_points(SITE_RULES, counters)
+    bonus_ratios: List[npt.NDArray[np.float64]] = []
+    malus_ratios: List[npt.NDArray[np.float64]] = []
+    conceded_values: List[float] = []
+    clean_sheet_values: List[npt.NDArray[np.float64]] = []
+    for league in rules:
+        points: Dict[str, npt.NDArray[Any]] = _season_points(league, counters)
+        bonus_ratios.append(_ratio(points["bonus"], site_points["bonus"]))
+        malus_ratios.append(_ratio(points["malus"], site_points["malus"]))
+        conceded_values.append(league.goal_conceded)
+        clean_sheet_values.append(
+            _by_role(counters["role"], league.clean_sheet, league.clean_sheet_by_role)
+        )
+
+    fanta_grades: npt.NDArray[np.float64] = (
+        grade
+        + other_bonus * np.stack(bonus_ratios)[:, :, np.newaxis]
+        + other_malus * np.stack(malus_ratios)[:, :, np.newaxis]
+        + np.where(goalkeeper, conceded, 0.0)
+        * np.array(conceded_values)[:, np.newaxis, np.newaxis]
+        + clean_sheet * np.stack(clean_sheet_values)[:, :, np.newaxis]
+    )
+
+    return np.where(graded, fanta_grades, np.nan)
+
+
+def league_records(
+    matrix: SeasonMatrix,
+    rules: Sequence[ScoringRules],
+    fanta_grades: npt.NDArray[np.float64],
+) -> List[JsonData]:
+    """Turns the fanta grades of `recompute_fanta_grades` into records.
+
+    Parameters
+    ----------
+    matrix : SeasonMatrix
+        Matrix of the season.
+    rules : Sequence[ScoringRules]
+        Rules of each league.
+    fanta_grades : npt.NDArray[np.float64]
+        Fanta grades of shape (rules, n_players, game days).
+
+    Returns:
+    -------
+    List[JsonData]
+        Name and players' fanta grades of each league, `None` for NaN.
+    """
+    graded: npt.NDArray[np.bool_] = ~np.isnan(fanta_grades)
+    counts: npt.NDArray[np.intp] = graded.sum(axis=2)
+    graded_matches: List[int] = counts[0].tolist() if len(counts) else []
+    sums: npt.NDArray[np.float64] = np.where(graded, fanta_grades, 0.0).sum(axis=2)
+    averages: npt.NDArray[np.float64] = np.full(sums.shape, np.nan)
+    np.divide(sums, counts, out=averages, where=counts != 0)
+
+    leagues: List[JsonData] = []
+    for league, league_grades, league_averages in zip(rules, fanta_grades, averages):
+        values: List[Any] = nan_to_none(league_grades)
+        means: List[Any] = nan_to_none(league_averages)
+        leagues.append(
+            {
+                "name": league.name,
+                "players": [
+                    {
+                        "name": player["name"],
+                        "link": player["link"],
+                        "graded_matches": graded_matches[row],
+                        "avg_fanta_grade": means[row],
+                        "fanta_grades": values[row],
+                    }
+                    for row, player in enumerate(matrix.players)
+                ],
+            }
+        )
+
+    return leagues
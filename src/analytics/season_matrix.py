@@ -0,0 +1,255 @@
+"""Module to hold the match stats of a season as dense players x game days arrays."""
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Literal, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from src.analytics.constants import SeasonMatrixConstants
+
+JsonData = Dict[str, Any]
+MmapMode = Literal["r", "r+", "w+", "c"]
+
+
+class SeasonMatrix:
+    """Match stats of every player of a season, one (n_players, game days) array each.
+
+    Row `i` of every array belongs to `players[i]`, column `j` to game day `j + 1`.
+    Grades, bonus, malus and substitution minutes are float32 with NaN for missing
+    values, teams are int16 codes into `teams` and scores are int8, both with
+    `SeasonMatrixConstants.missing_code` for the game days a player has no row of.
+
+    Saved as one `.npy` file per stat, in a new version directory, plus an
+    `index.json` of the players, teams and current version, a season is loaded
+    back memory-mapped: it is mapped in no time whatever its size, and processes
+    mapping the same files share the same pages.
+
+    Attributes:
+    ----------
+    players : List[Dict[str, str]]
+        Names and links of the players, in row order.
+    teams : List[str]
+        Names of the teams, indexed by their codes.
+    arrays : Dict[str, npt.NDArray[Any]]
+        Arrays of the stats, keyed by the names of the `SingleMatch` fields.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        players: List[Dict[str, str]],
+        teams: List[str],
+        arrays: Dict[str, npt.NDArray[Any]],
+    ):
+        self.players: List[Dict[str, str]] = players
+        self.teams: List[str] = teams
+        self.arrays: Dict[str, npt.NDArray[Any]] = arrays
+        self.__rows: Dict[str, int] = {
+            player["link"]: row for row, player in enumerate(players)
+        }
+
+    def __getitem__(self, stat: str) -> npt.NDArray[Any]:  # noqa: D105
+        return self.arrays[stat]
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.players)
+
+    @property
+    def game_days(self) -> int:
+        """Number of game days, i.e. columns, of the arrays."""
+        return int(self.arrays["grade"].shape[1])
+
+    @property
+    def nbytes(self) -> int:
+        """Size in bytes of all the arrays."""
+        return sum(int(array.nbytes) for array in self.arrays.values())
+
+    def row(self, link: str) -> int:
+        """Gets the row of a player.
+
+        Parameters
+        ----------
+        link : str
+            Link of the player.
+
+        Returns:
+        -------
+        int
+            Row of the player in every array.
+        """
+        return self.__rows[link]
+
+    @classmethod
+    def from_players(
+        cls,
+        players: Iterable[Tuple[Dict[str, str], List[JsonData]]],
+        game_days: int = SeasonMatrixConstants.game_days,
+    ) -> "SeasonMatrix":
+        """Builds the matrix out of the match stats of each player.
+
+        Cells are gathered into flat lists and every array is then filled with a
+        single fancy-indexed assignment.
+
+        Parameters
+        ----------
+        players : Iterable[Tuple[Dict[str, str], List[JsonData]]]
+            Name and link of each player, with its rows following `SingleMatch`.
+        game_days : int
+            Number of game days of the season.
+
+        Returns:
+        -------
+        SeasonMatrix
+            Matrix of the season.
+        """
+        players_links: List[Dict[str, str]] = []
+        rows: List[int] = []
+        columns: List[int] = []
+        cells: Dict[str, List[Any]] = {
+            stat: []
+            for stat in (
+                *SeasonMatrixConstants.float_stats,
+                *SeasonMatrixConstants.team_stats,
+                *SeasonMatrixConstants.score_stats,
+            )
+        }
+        team_codes: Dict[str, int] = {}
+        for player_link, matches in players:
+            row: int = len(players_links)
+            players_links.append(
+                {"name": player_link["name"], "link": player_link["link"]}
+            )
+            for match in matches:
+                game_day: int = int(match["game_day"])
+                if not 1 <= game_day <= game_days:
+                    raise ValueError(
+                        f"Game day {game_day} of {player_link['name']} is out of "
+                        f"the {game_days} game days of the season."
+                    )
+                rows.append(row)
+                columns.append(game_day - 1)
+                for stat in SeasonMatrixConstants.float_stats:
+                    cells[stat].append(match[stat])
+                for stat in SeasonMatrixConstants.team_stats:
+                    team: str = match[stat]
+                    cells[stat].append(team_codes.setdefault(team, len(team_codes)))
+                for stat in SeasonMatrixConstants.score_stats:
+                    cells[stat].append(match[stat])
+
+        shape: Tuple[int, int] = (len(players_links), game_days)
+        arrays: Dict[str, npt.NDArray[Any]] = {}
+        for stat in SeasonMatrixConstants.float_stats:
+            arrays[stat] = np.full(shape, np.nan, dtype=np.float32)
+            arrays[stat][rows, columns] = np.array(cells[stat], dtype=np.float32)
+        for stats, dtype in (
+            (SeasonMatrixConstants.team_stats, np.int16),
+            (SeasonMatrixConstants.score_stats, np.int8),
+        ):
+            for stat in stats:
+                arrays[stat] = np.full(
+                    shape, SeasonMatrixConstants.missing_code, dtype=dtype
+                )
+                arrays[stat][rows, columns] = np.array(cells[stat], dtype=dtype)
+
+        return cls(players=players_links, teams=list(team_codes), arrays=arrays)
+
+    def save(self, directory: Union[str, Path]) -> None:
+        """Saves the arrays as `.npy` files, next to an index of players and teams.
+
+        Arrays are written into a new version directory, never over the files of
+        a loaded matrix, and the index pointing to it replaces the previous one
+        at once: a matrix is never loaded with an index not matching its arrays.
+        Versions older than the one replaced are then removed.
+
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            Directory of the files of the season.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        index_path: Path = directory / SeasonMatrixConstants.index_file
+        previous: Union[str, None] = (
+            self.__read_index(directory).get("version") if index_path.exists() else None
+        )
+        version: Path = Path(
+            tempfile.mkdtemp(prefix=SeasonMatrixConstants.version_prefix, dir=directory)
+        )
+        for stat, array in self.arrays.items():
+            np.save(version / f"{stat}.npy", array)
+        temp_path: Path = index_path.with_suffix(".tmp")
+        with temp_path.open(mode="w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "version": version.name,
+                    "game_days": self.game_days,
+                    "stats": list(self.arrays),
+                    "players": self.players,
+                    "teams": self.teams,
+                },
+                file,
+                ensure_ascii=False,
+            )
+        temp_path.replace(index_path)
+        for path in directory.glob(f"{SeasonMatrixConstants.version_prefix}*"):
+            if path.name not in (version.name, previous):
+                shutil.rmtree(path, ignore_errors=True)
+
+    @classmethod
+    def load(
+        cls, directory: Union[str, Path], mmap_mode: Union[MmapMode, None] = "r"
+    ) -> "SeasonMatrix":
+        """Loads the current version of the matrix of a season saved with `save`.
+
+        Parameters
+        ----------
+        directory : Union[str, Path]
+            Directory of the files of the season.
+        mmap_mode : Union[MmapMode, None]
+            Mode the arrays are memory-mapped with, see `numpy.load`. They are
+            read into memory if `None`.
+
+        Returns:
+        -------
+        SeasonMatrix
+            Matrix of the season, read-only memory-mapped by default.
+        """
+        directory = Path(directory)
+        index: JsonData = cls.__read_index(directory)
+        version: Path = directory / index["version"]
+        arrays: Dict[str, npt.NDArray[Any]] = {
+            stat: np.load(version / f"{stat}.npy", mmap_mode=mmap_mode)
+            for stat in index["stats"]
+        }
+
+        return cls(players=index["players"], teams=index["teams"], arrays=arrays)
+
+    @staticmethod
+    def __read_index(directory: Path) -> JsonData:
+        """Reads the index of the matrix saved in a directory."""
+        with (directory / SeasonMatrixConstants.index_file).open(
+            mode="r", encoding="utf-8"
+        ) as file:
+            index: JsonData = json.load(file)
+        return index
+
+
+def season_matrix_path(root: Union[str, Path], season: str) -> Path:
+    """Path of the directory of the matrix of a season, e.g. `season=2024-25/`.
+
+    Parameters
+    ----------
+    root : Union[str, Path]
+        Root directory of the season matrices.
+    season : str
+        Season, e.g. "2024-25".
+
+    Returns:
+    -------
+    Path
+        Directory of the files of the season.
+    """
+    return Path(root) / f"season={season}"
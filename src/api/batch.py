@@ -0,0 +1,166 @@
+"""Module to run scrapers over many players concurrently with bounded concurrency."""
+
+import asyncio
+from itertools import islice
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from src.scraper.exceptions import FetchError, PageStructureError
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def batch_item_error(exc: Exception) -> Dict[str, Union[int, str]]:
+    """Describes an exception raised while processing a single batch item.
+
+    Status codes mirror the ones returned by the app exception handlers for the
+    equivalent single-item endpoints.
+
+    Parameters
+    ----------
+    exc : Exception
+        The exception raised while processing the item.
+
+    Returns:
+    -------
+    Dict[str, Union[int, str]]
+        Data following the `BatchItemError` model.
+    """
+    if isinstance(exc, FetchError):
+        return {"status_code": 502, "detail": str(exc)}
+    if isinstance(exc, PageStructureError):
+        return {"status_code": 500, "detail": str(exc)}
+    if isinstance(exc, ValueError):
+        return {"status_code": 400, "detail": str(exc)}
+    return {"status_code": 500, "detail": "An internal server error occurred."}
+
+
+def batch_item(
+    player_link: T,
+    result: Union[R, Exception],
+) -> Dict[str, Union[T, R, Dict[str, Union[int, str]], None]]:
+    """Builds the response item of a single player of a batch.
+
+    Parameters
+    ----------
+    player_link : T
+        The player the item refers to.
+    result : Union[R, Exception]
+        The data scraped for the player, or the exception raised while scraping it.
+
+    Returns:
+    -------
+    Dict[str, Union[T, R, Dict[str, Union[int, str]], None]]
+        Data following the batch item models, with either `data` or `error` set
+        and the other one `None`.
+    """
+    if isinstance(result, Exception):
+        return {
+            "player_link": player_link,
+            "data": None,
+            "error": batch_item_error(result),
+        }
+    return {"player_link": player_link, "data": result, "error": None}
+
+
+async def run_batch(
+    items: List[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int,
+) -> List[Tuple[T, Union[R, Exception]]]:
+    """Runs `worker` on every item, with at most `concurrency` items in flight.
+
+    An exception raised by a single item does not stop the others: it is returned in
+    place of that item's result. Cancellation is propagated to all the items.
+
+    Parameters
+    ----------
+    items : List[T]
+        Items to process.
+    worker : Callable[[T], Awaitable[R]]
+        Coroutine function processing a single item.
+    concurrency : int
+        Maximum number of items processed at the same time.
+
+    Returns:
+    -------
+    List[Tuple[T, Union[R, Exception]]]
+        Each item paired with its result or with the exception it raised, in the same
+        order as `items`.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def guarded(item: T) -> Tuple[T, Union[R, Exception]]:
+        async with semaphore:
+            try:
+                return item, await worker(item)
+            except Exception as e:  # noqa: BLE001
+                return item, e
+
+    return list(await asyncio.gather(*(guarded(item) for item in items)))
+
+
+async def iter_batch_as_completed(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int,
+) -> AsyncIterator[Tuple[T, Union[R, Exception]]]:
+    """Runs `worker` on every item and yields each result as soon as it is ready.
+
+    At most `concurrency` items are in flight, and a new item is started only after
+    a finished one has been consumed: memory stays bounded even if the consumer is
+    slower than the workers. Closing the generator cancels the items still running.
+
+    Parameters
+    ----------
+    items : Iterable[T]
+        Items to process.
+    worker : Callable[[T], Awaitable[R]]
+        Coroutine function processing a single item.
+    concurrency : int
+        Maximum number of items processed at the same time.
+
+    Yields:
+    ------
+    Tuple[T, Union[R, Exception]]
+        Each item paired with its result or with the exception it raised, in
+        completion order.
+    """
+
+    async def guarded(item: T) -> Tuple[T, Union[R, Exception]]:
+        try:
+            return item, await worker(item)
+        except Exception as e:  # noqa: BLE001
+            return item, e
+
+    iterator = iter(items)
+    pending: Set["asyncio.Task[Tuple[T, Union[R, Exception]]]"] = set()
+    try:
+        for item in iterator:
+            pending.add(asyncio.ensure_future(guarded(item)))
+            if len(pending) >= max(1, concurrency):
+                break
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield task.result()
+                for next_item in islice(iterator, 1):
+                    pending.add(asyncio.ensure_future(guarded(next_item)))
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,329 @@
+"""Module to cache the data extracted by the scrapers in memory."""
+
+import sys
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    NamedTuple,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from src.api.models import PlayerLink
+
+V = TypeVar("V")
+
+CacheKey = Tuple[str, str, str]
+
+
+class CachedEndpoints:
+    """Class containing the names of the endpoints whose results can be cached."""
+
+    matches_stats: str = "matches-stats"
+    matches_stats_columns: str = "matches-stats-columns"
+    player_summary_stats: str = "player-summary-stats"
+    players_full: str = "players-full"
+
+
+class CacheEntry(NamedTuple):
+    """NamedTuple.
+
+    Where:
+    - [0] = value: Any
+    - [1] = expires_at: float
+    - [2] = size: int
+    - [3] = etag: Union[str, None], `ETag` of the value, if computed.
+    """
+
+    value: Any
+    expires_at: float
+    size: int
+    etag: Union[str, None] = None
+
+
+def approximate_size(value: Any) -> int:
+    """Approximates the memory used by a value made of dicts, lists and scalars.
+
+    Parameters
+    ----------
+    value : Any
+        Value to measure.
+
+    Returns:
+    -------
+    int
+        Approximate size in bytes.
+    """
+    size: int = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            approximate_size(key) + approximate_size(item)
+            for key, item in value.items()
+        )
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+def copy_value(value: Any) -> Any:
+    """Copies a value made of dicts, lists and scalars, sharing only the scalars.
+
+    Parameters
+    ----------
+    value : Any
+        Value to copy.
+
+    Returns:
+    -------
+    Any
+        Copy of the value, whose dicts and lists can be mutated freely.
+    """
+    if isinstance(value, dict):
+        return {key: copy_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_value(item) for item in value]
+    return value
+
+
+class ResultCache:
+    """In-process TTL cache with LRU eviction for the data extracted by the scrapers.
+
+    Entries are keyed by endpoint and player. The least recently used entries are
+    evicted as soon as either the number of entries or their approximate size in
+    bytes exceeds the configured limits. Values are copied when cached and when
+    served, so callers mutating them never alter the cached entries. The `ETag` of
+    a value can be cached along with it, so it is computed once per scrape rather
+    than once per request.
+
+    Attributes:
+    ----------
+    ttl : float
+        Seconds an entry is served before being scraped again. `0` disables the
+        cache.
+    max_entries : int
+        Maximum number of entries.
+    max_bytes : int
+        Maximum approximate size in bytes of all the entries.
+    disabled_endpoints : Set[str]
+        Endpoints that are never cached.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        disabled_endpoints: Iterable[str] = (),
+    ):
+        self.ttl: float = ttl
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.disabled_endpoints: Set[str] = set(disabled_endpoints)
+        self.__entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self.__size: int = 0
+        self.__counters: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "expirations": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def key(endpoint: str, player_link: PlayerLink) -> CacheKey:
+        """Builds the cache key of a player for an endpoint.
+
+        Parameters
+        ----------
+        endpoint : str
+            Name of the endpoint, e.g. "matches-stats".
+        player_link : PlayerLink
+            Input object containing the player's name and link.
+
+        Returns:
+        -------
+        CacheKey
+            Cache key.
+        """
+        return endpoint, str(player_link.link), str(player_link.name)
+
+    def is_enabled(self, endpoint: str) -> bool:
+        """Whether results of `endpoint` are cached."""
+        return (
+            self.ttl > 0
+            and self.max_entries > 0
+            and endpoint not in self.disabled_endpoints
+        )
+
+    def get(self, key: CacheKey) -> Union[Any, None]:
+        """Gets a cached value, marking it as the most recently used.
+
+        Parameters
+        ----------
+        key : CacheKey
+            Cache key.
+
+        Returns:
+        -------
+        Union[Any, None]
+            Copy of the cached value, or `None` if missing or expired.
+        """
+        entry: Union[CacheEntry, None] = self.__lookup(key)
+        if entry is None:
+            return None
+
+        return copy_value(entry.value)
+
+    def set(self, key: CacheKey, value: Any, etag: Union[str, None] = None) -> None:
+        """Caches a value, evicting the least recently used entries if needed.
+
+        Parameters
+        ----------
+        key : CacheKey
+            Cache key.
+        value : Any
+            Value to cache.
+        etag : Union[str, None]
+            `ETag` of the value, if any.
+        """
+        size: int = approximate_size(value)
+        if size > self.max_bytes:
+            return
+        if key in self.__entries:
+            self.__pop(key)
+        self.__entries[key] = CacheEntry(
+            value=copy_value(value),
+            expires_at=time.monotonic() + self.ttl,
+            size=size,
+            etag=etag,
+        )
+        self.__size += size
+        while len(self.__entries) > self.max_entries or self.__size > self.max_bytes:
+            oldest_key: CacheKey = next(iter(self.__entries))
+            self.__pop(oldest_key)
+            self.__counters["evictions"] += 1
+
+    async def get_or_compute(
+        self,
+        endpoint: str,
+        player_link: PlayerLink,
+        compute: Callable[[], Awaitable[V]],
+    ) -> V:
+        """Gets a cached value or computes and caches it.
+
+        Parameters
+        ----------
+        endpoint : str
+            Name of the endpoint, e.g. "matches-stats".
+        player_link : PlayerLink
+            Input object containing the player's name and link.
+        compute : Callable[[], Awaitable[V]]
+            Coroutine function scraping the value on a cache miss.
+
+        Returns:
+        -------
+        V
+            The cached or freshly computed value.
+        """
+        if not self.is_enabled(endpoint):
+            return await compute()
+        key: CacheKey = self.key(endpoint=endpoint, player_link=player_link)
+        cached: Union[Any, None] = self.get(key)
+        if cached is not None:
+            return cached  # type: ignore[no-any-return]
+        value: V = await compute()
+        self.set(key, value)
+
+        return value
+
+    async def get_or_compute_tagged(
+        self,
+        endpoint: str,
+        player_link: PlayerLink,
+        compute: Callable[[], Awaitable[V]],
+        tag: Callable[[V], str],
+        refresh: bool = False,
+    ) -> Tuple[V, str]:
+        """Gets a cached value and its `ETag`, or computes and caches both.
+
+        Parameters
+        ----------
+        endpoint : str
+            Name of the endpoint, e.g. "matches-stats".
+        player_link : PlayerLink
+            Input object containing the player's name and link.
+        compute : Callable[[], Awaitable[V]]
+            Coroutine function scraping the value on a cache miss.
+        tag : Callable[[V], str]
+            Function computing the `ETag` of a freshly computed value.
+        refresh : bool
+            Whether to compute the value even if cached, replacing the cached one.
+
+        Returns:
+        -------
+        Tuple[V, str]
+            The cached or freshly computed value, and its `ETag`.
+        """
+        if not self.is_enabled(endpoint):
+            value: V = await compute()
+            return value, tag(value)
+        key: CacheKey = self.key(endpoint=endpoint, player_link=player_link)
+        entry: Union[CacheEntry, None] = None if refresh else self.__lookup(key)
+        if entry is not None and entry.etag is not None:
+            return copy_value(entry.value), entry.etag
+        value = await compute()
+        etag: str = tag(value)
+        self.set(key, value, etag=etag)
+
+        return value, etag
+
+    def clear(self) -> None:
+        """Removes all the entries."""
+        self.__entries.clear()
+        self.__size = 0
+
+    def stats(self) -> Dict[str, Union[int, float, bool]]:
+        """Report statistics about the cache.
+
+        Returns:
+        -------
+        Dict[str, Union[int, float, bool]]
+            Cache configuration, occupancy and counters.
+        """
+        stats: Dict[str, Union[int, float, bool]] = {
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "entries": len(self.__entries),
+            "bytes": self.__size,
+        }
+        stats.update(self.__counters)
+
+        return stats
+
+    def __lookup(self, key: CacheKey) -> Union[CacheEntry, None]:
+        """Gets an unexpired entry, marking it as the most recently used."""
+        entry: Union[CacheEntry, None] = self.__entries.get(key)
+        if entry is None:
+            self.__counters["misses"] += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self.__pop(key)
+            self.__counters["expirations"] += 1
+            self.__counters["misses"] += 1
+            return None
+        self.__entries.move_to_end(key)
+        self.__counters["hits"] += 1
+
+        return entry
+
+    def __pop(self, key: CacheKey) -> None:
+        """Removes an entry keeping the total size up to date."""
+        entry: CacheEntry = self.__entries.pop(key)
+        self.__size -= entry.size
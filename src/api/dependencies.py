@@ -0,0 +1,188 @@
+"""Module to define FastAPI dependencies shared by the routers."""
+
+from typing import Annotated, NamedTuple, Union
+
+from fastapi import Depends, Request
+
+from src.api.cache import ResultCache
+from src.api.season_tables import SeasonMatrices, SeasonTables
+from src.api.settings import Settings, get_settings
+from src.api.store import SeasonStore
+from src.scraper.fetcher import Fetcher
+from src.scraper.parser import PageParser
+
+
+def get_fetcher(request: Request) -> Fetcher:
+    """Get the shared fetcher owned by the app lifespan.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns:
+    -------
+    Fetcher
+        The app-wide pooled fetcher.
+    """
+    fetcher: Fetcher = request.app.state.fetcher
+    assert isinstance(fetcher, Fetcher)
+    return fetcher
+
+
+def get_result_cache(request: Request) -> ResultCache:
+    """Get the in-process cache of scraped results owned by the app lifespan.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns:
+    -------
+    ResultCache
+        The app-wide results cache.
+    """
+    result_cache: ResultCache = request.app.state.result_cache
+    assert isinstance(result_cache, ResultCache)
+    return result_cache
+
+
+def get_parser(request: Request) -> PageParser:
+    """Get the shared page parser owned by the app lifespan.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns:
+    -------
+    PageParser
+        The app-wide page parser.
+    """
+    parser: PageParser = request.app.state.parser
+    assert isinstance(parser, PageParser)
+    return parser
+
+
+def get_store(request: Request) -> Union[SeasonStore, None]:
+    """Get the SQLite store owned by the app lifespan, if enabled.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns:
+    -------
+    Union[SeasonStore, None]
+        The app-wide store, `None` if `PYFANTA_STORE_ENABLED` is not set.
+    """
+    store: Union[SeasonStore, None] = request.app.state.store
+    return store
+
+
+def get_season_tables(request: Request) -> Union[SeasonTables, None]:
+    """Get the columnar season tables owned by the app lifespan, if enabled.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns:
+    -------
+    Union[SeasonTables, None]
+        The app-wide season tables, `None` if `PYFANTA_STORE_ENABLED` is not set.
+    """
+    season_tables: Union[SeasonTables, None] = request.app.state.season_tables
+    return season_tables
+
+
+def get_season_matrices(request: Request) -> Union[SeasonMatrices, None]:
+    """Get the season matrices owned by the app lifespan, if enabled.
+
+    Parameters
+    ----------
+    request : Request
+        The incoming HTTP request.
+
+    Returns:
+    -------
+    Union[SeasonMatrices, None]
+        The app-wide season matrices, `None` if `PYFANTA_STORE_ENABLED` is not set.
+    """
+    season_matrices: Union[SeasonMatrices, None] = request.app.state.season_matrices
+    return season_matrices
+
+
+FetcherDep = Annotated[Fetcher, Depends(get_fetcher)]
+ResultCacheDep = Annotated[ResultCache, Depends(get_result_cache)]
+ParserDep = Annotated[PageParser, Depends(get_parser)]
+StoreDep = Annotated[Union[SeasonStore, None], Depends(get_store)]
+SeasonTablesDep = Annotated[Union[SeasonTables, None], Depends(get_season_tables)]
+SeasonMatricesDep = Annotated[Union[SeasonMatrices, None], Depends(get_season_matrices)]
+SettingsDep = Annotated[Settings, Depends(get_settings)]
+
+
+class ScrapeContext(NamedTuple):
+    """NamedTuple.
+
+    Resources shared by the endpoints scraping player pages.
+
+    Where:
+    - [0] = fetcher: Fetcher
+    - [1] = parser: Union[PageParser, None]
+    - [2] = result_cache: Union[ResultCache, None]
+    - [3] = store: Union[SeasonStore, None]
+    - [4] = settings: Settings
+
+    Pages are parsed with BeautifulSoup if `parser` is `None`, results are not
+    cached if `result_cache` is `None` and not stored if `store` is `None`.
+    """
+
+    fetcher: Fetcher
+    parser: Union[PageParser, None]
+    result_cache: Union[ResultCache, None]
+    store: Union[SeasonStore, None]
+    settings: Settings
+
+
+def get_scrape_context(
+    fetcher: FetcherDep,
+    parser: ParserDep,
+    result_cache: ResultCacheDep,
+    store: StoreDep,
+    settings: SettingsDep,
+) -> ScrapeContext:
+    """Get the resources shared by the endpoints scraping player pages.
+
+    Parameters
+    ----------
+    fetcher : Fetcher
+        The app-wide pooled fetcher.
+    parser : PageParser
+        The app-wide page parser.
+    result_cache : ResultCache
+        The app-wide results cache.
+    store : Union[SeasonStore, None]
+        The app-wide store, if enabled.
+    settings : Settings
+        API settings.
+
+    Returns:
+    -------
+    ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
+    """
+    return ScrapeContext(
+        fetcher=fetcher,
+        parser=parser,
+        result_cache=result_cache,
+        store=store,
+        settings=settings,
+    )
+
+
+ScrapeContextDep = Annotated[ScrapeContext, Depends(get_scrape_context)]
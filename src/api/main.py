@@ -1,24 +1,118 @@
 """Main API module."""
 
-from typing import no_type_check
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Union, no_type_check
 
 from fastapi import FastAPI
 
+from src.api.cache import ResultCache
 from src.api.exceptions import register_exception_handlers
 from src.api.routers.links_router import router as links_router
 from src.api.routers.matches_router import router as matches_router
 from src.api.routers.players_router import router as players_router
+from src.api.routers.seasons_router import router as seasons_router
+from src.api.routers.stats_router import router as stats_router
+from src.api.season_tables import SeasonMatrices, SeasonTables
+from src.api.settings import Settings, get_settings
+from src.api.store import SeasonStore
+from src.scraper.fetcher import Fetcher
+from src.scraper.page_cache import PageCache
+from src.scraper.parser import PageParser
+from src.scraper.rate_limiter import RateLimiter
+from src.scraper.retry import RetryPolicy
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open the resources shared by all the requests and close them on shutdown.
+
+    Parameters
+    ----------
+    app : FastAPI
+        FastAPI app.
+    """
+    settings: Settings = get_settings()
+    page_cache: Union[PageCache, None] = None
+    if settings.page_cache_enabled:
+        page_cache = PageCache(
+            directory=settings.page_cache_dir,
+            fresh_for=settings.page_cache_fresh_for,
+            immutable_patterns=settings.page_cache_immutable_seasons,
+            offline=settings.page_cache_offline,
+        )
+    retry_policy = RetryPolicy(
+        max_attempts=settings.retry_max_attempts,
+        base_delay=settings.retry_base_delay,
+        max_delay=settings.retry_max_delay,
+    )
+    async with PageParser(
+        backend=settings.parser_backend,
+        pool=settings.parser_pool,
+        max_workers=settings.parser_pool_size,
+        memo_entries=settings.parser_memo_entries,
+    ) as parser, Fetcher(
+        limit=settings.http_limit,
+        limit_per_host=settings.http_limit_per_host,
+        keepalive_timeout=settings.http_keepalive_timeout,
+        ttl_dns_cache=settings.http_ttl_dns_cache,
+        total_timeout=settings.http_total_timeout,
+        connect_timeout=settings.http_connect_timeout,
+        read_timeout=settings.http_read_timeout,
+        page_cache=page_cache,
+        rate_limiter=RateLimiter(
+            rate=settings.rate_limit_rps,
+            burst=settings.rate_limit_burst,
+            min_rate=settings.rate_limit_min_rps,
+            backoff_factor=settings.rate_limit_backoff_factor,
+            recovery_step=settings.rate_limit_recovery_step,
+        ),
+        retry_policy=retry_policy,
+        retry_policies={
+            endpoint: retry_policy._replace(**overrides.dict(exclude_none=True))
+            for endpoint, overrides in settings.retry_policies.items()
+        },
+        circuit_failure_threshold=settings.circuit_failure_threshold,
+        circuit_reset_timeout=settings.circuit_reset_timeout,
+    ) as fetcher:
+        app.state.fetcher = fetcher
+        app.state.parser = parser
+        app.state.result_cache = ResultCache(
+            ttl=settings.cache_ttl,
+            max_entries=settings.cache_max_entries,
+            max_bytes=settings.cache_max_bytes,
+            disabled_endpoints=settings.cache_disabled_endpoints,
+        )
+        app.state.store = (
+            SeasonStore(path=settings.store_path) if settings.store_enabled else None
+        )
+        app.state.season_tables = (
+            SeasonTables(store=app.state.store) if app.state.store is not None else None
+        )
+        app.state.season_matrices = (
+            SeasonMatrices(store=app.state.store)
+            if app.state.store is not None
+            else None
+        )
+        try:
+            yield
+        finally:
+            if app.state.store is not None:
+                app.state.store.close()
+
 
 app = FastAPI(
     title="pyFanta API",
     description="An API to get players' information for the fantacalcio.",
     version="0.1.1",
+    lifespan=lifespan,
 )
 
 # Include routers
 app.include_router(links_router)
 app.include_router(matches_router)
 app.include_router(players_router)
+app.include_router(seasons_router)
+app.include_router(stats_router)
 
 # Register exception handlers
 register_exception_handlers(app=app)
@@ -1,8 +1,8 @@
 """Module to organize Pydantic data validation models for FastAPI endpoints."""
 
-from typing import List, Union
+from typing import Annotated, List, Literal, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class PlayerLink(BaseModel):
@@ -41,6 +41,57 @@ class MatchesStatsResponse(BaseModel):
     data: Union[SingleMatch, List[SingleMatch]]
 
 
+class MatchesStatsColumns(BaseModel):
+    """Data validation model for a player's match stats, one array per stat.
+
+    Arrays are parallel: their i-th values belong to the i-th game day. The name of
+    the player is stored once.
+    """
+
+    name: str
+    game_day: List[int]
+    grade: List[Union[float, None]]
+    fanta_grade: List[Union[float, None]]
+    bonus: List[Union[float, None]]
+    malus: List[Union[float, None]]
+    home_team: List[str]
+    guest_team: List[str]
+    home_team_score: List[int]
+    guest_team_score: List[int]
+    subsitution_in: List[Union[float, None]]
+    subsitution_out: List[Union[float, None]]
+
+
+class MatchesStatsColumnarResponse(BaseModel):
+    """Data validation model for a player's match stats in the columnar layout."""
+
+    data: MatchesStatsColumns
+
+
+class BatchItemError(BaseModel):
+    """Data validation model for the error raised by a single item of a batch."""
+
+    status_code: int
+    detail: str
+
+
+class MatchesStatsBatchItem(BaseModel):
+    """Data validation model for the match stats of a single player in a batch.
+
+    Exactly one between `data` and `error` is set.
+    """
+
+    player_link: PlayerLink
+    data: Union[List[SingleMatch], None] = None
+    error: Union[BatchItemError, None] = None
+
+
+class MatchesStatsBatchResponse(BaseModel):
+    """Data validation model for the match stats of many players."""
+
+    data: List[MatchesStatsBatchItem]
+
+
 class BasePlayerSummaryStats(BaseModel):
     """Data validation model for a single player summary stats in a season.
 
@@ -68,6 +119,7 @@ class OutfieldPlayerSummaryStats(BasePlayerSummaryStats):
     - defenders
     """
 
+    player_type: Literal["outfield"] = "outfield"
     graded_matches: int
     goals: int
     assists: int
@@ -96,6 +148,7 @@ class OutfieldPlayerSummaryStatsResponse(BaseModel):
 class GoalkeeperSummaryStats(BasePlayerSummaryStats):
     """Data validation model for a single goalkeeper summary stats in a season."""
 
+    player_type: Literal["goalkeeper"] = "goalkeeper"
     graded_matches: int
     goals_conceded: int
     assists: int
@@ -111,3 +164,274 @@ class GoalkeeperSummaryStatsResponse(BaseModel):
     """Data validation model for all the goalkeepers."""
 
     data: Union[GoalkeeperSummaryStats, List[GoalkeeperSummaryStats]]
+
+
+PlayerSummaryStats = Annotated[
+    Union[OutfieldPlayerSummaryStats, GoalkeeperSummaryStats],
+    Field(discriminator="player_type"),
+]
+
+
+class PlayerSummaryStatsBatchItem(BaseModel):
+    """Data validation model for the summary stats of a single player in a batch.
+
+    `data` follows the outfield player or the goalkeeper model depending on its
+    `player_type`. Exactly one between `data` and `error` is set.
+    """
+
+    player_link: PlayerLink
+    data: Union[PlayerSummaryStats, None] = None
+    error: Union[BatchItemError, None] = None
+
+
+class PlayerSummaryStatsBatchResponse(BaseModel):
+    """Data validation model for the summary stats of many players of any role."""
+
+    data: List[PlayerSummaryStatsBatchItem]
+
+
+class SeasonPlayersQuery(BaseModel):
+    """Data validation model for the filters, sort and limit of a season query.
+
+    E.g. the top 20 midfielders by median fanta grade with at least 10 graded
+    matches: `role="centrocampista", min_graded_matches=10, limit=20`.
+    """
+
+    role: Union[str, None] = None
+    team: Union[str, None] = None
+    player_type: Union[Literal["outfield", "goalkeeper"], None] = None
+    min_graded_matches: int = 0
+    sort: str = "median_fanta_grade"
+    order: Literal["asc", "desc"] = "desc"
+    limit: Union[int, None] = 20
+
+
+class SeasonPlayersResponse(BaseModel):
+    """Data validation model for the summary stats of the players of a season query."""
+
+    data: List[PlayerSummaryStats]
+
+
+class PlayerForm(BaseModel):
+    """Data validation model for a single player form and consistency in a season.
+
+    `form_*` stats average the last game days of the window, `std_fanta_grade`
+    measures how consistent the fanta grades are. Minutes are approximated from the
+    substitutions, without stoppage time.
+    """
+
+    name: str
+    link: str
+    team: Union[str, None]
+    appearances: int
+    minutes_played: float
+    avg_minutes_played: Union[float, None]
+    graded_matches: int
+    avg_grade: Union[float, None]
+    avg_fanta_grade: Union[float, None]
+    std_fanta_grade: Union[float, None]
+    form_grade: Union[float, None]
+    form_fanta_grade: Union[float, None]
+    home_graded_matches: int
+    home_avg_fanta_grade: Union[float, None]
+    away_graded_matches: int
+    away_avg_fanta_grade: Union[float, None]
+
+
+class SeasonForm(BaseModel):
+    """Data validation model for the form of every player of a season."""
+
+    window: int
+    through_game_day: int
+    players: List[PlayerForm]
+
+
+class SeasonFormResponse(BaseModel):
+    """Data validation model for the form of every player of a season."""
+
+    data: SeasonForm
+
+
+class PlayerScores(BaseModel):
+    """Data validation model for a single player fanta grades under a league rules.
+
+    `fanta_grades` has one value per game day, from the first one.
+    """
+
+    name: str
+    link: str
+    graded_matches: int
+    avg_fanta_grade: Union[float, None]
+    fanta_grades: List[Union[float, None]]
+
+
+class LeagueScores(BaseModel):
+    """Data validation model for the fanta grades of a season under a league rules."""
+
+    name: str
+    players: List[PlayerScores]
+
+
+class LeagueScoresResponse(BaseModel):
+    """Data validation model for the fanta grades of a season under many rules."""
+
+    data: List[LeagueScores]
+
+
+class FullPlayerStats(BaseModel):
+    """Data validation model for a player's match stats and summary stats."""
+
+    name: str
+    matches: List[SingleMatch]
+    summary: PlayerSummaryStats
+
+
+class FullPlayerStatsResponse(BaseModel):
+    """Data validation model for a player's match stats and summary stats."""
+
+    data: FullPlayerStats
+
+
+class PoolStats(BaseModel):
+    """Data validation model for the shared HTTP connection pool statistics."""
+
+    started: bool
+    limit: int
+    limit_per_host: int
+    keepalive_timeout: float
+    ttl_dns_cache: int
+    total_timeout: float
+    coalesced: int
+    requests: int
+    failures: int
+    retries: int
+    bytes_received: int
+    in_flight: int
+    max_in_flight: int
+    connections_created: int
+    connections_reused: int
+    dns_cache_hits: int
+    dns_cache_misses: int
+
+
+class PoolStatsResponse(BaseModel):
+    """Data validation model for the shared HTTP connection pool statistics."""
+
+    data: PoolStats
+
+
+class ParserStats(BaseModel):
+    """Data validation model for the page parser statistics."""
+
+    started: bool
+    backend: str
+    pool: str
+    max_workers: int
+    memoized: int
+    parsed: int
+    memo_hits: int
+    fallbacks: int
+    pending: int
+    max_pending: int
+    queue_depth: int
+    coalesced: int
+
+
+class ParserStatsResponse(BaseModel):
+    """Data validation model for the page parser statistics."""
+
+    data: ParserStats
+
+
+class RateLimiterStats(BaseModel):
+    """Data validation model for the rate limiter statistics."""
+
+    enabled: bool
+    rate: float
+    burst: int
+    min_rate: float
+    current_rate: float
+    blocked_for: float
+    acquired: int
+    delayed: int
+    throttled: int
+
+
+class RateLimiterStatsResponse(BaseModel):
+    """Data validation model for the rate limiter statistics."""
+
+    data: Union[RateLimiterStats, None]
+
+
+class CircuitBreakerStats(BaseModel):
+    """Data validation model for the circuit breaker statistics of a host."""
+
+    host: str
+    state: str
+    consecutive_failures: int
+    opened: int
+    short_circuited: int
+
+
+class CircuitBreakersStatsResponse(BaseModel):
+    """Data validation model for the circuit breakers statistics."""
+
+    data: List[CircuitBreakerStats]
+
+
+class CacheStats(BaseModel):
+    """Data validation model for the scraped results cache statistics."""
+
+    ttl: float
+    max_entries: int
+    max_bytes: int
+    entries: int
+    bytes: int
+    hits: int
+    misses: int
+    expirations: int
+    evictions: int
+
+
+class CacheStatsResponse(BaseModel):
+    """Data validation model for the scraped results cache statistics."""
+
+    data: CacheStats
+
+
+class PageCacheStats(BaseModel):
+    """Data validation model for the on-disk page cache statistics."""
+
+    enabled: bool
+    directory: Union[str, None] = None
+    codec: Union[str, None] = None
+    fresh_for: Union[float, None] = None
+    offline: Union[bool, None] = None
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stored: int = 0
+
+
+class PageCacheStatsResponse(BaseModel):
+    """Data validation model for the on-disk page cache statistics."""
+
+    data: PageCacheStats
+
+
+class StoreStats(BaseModel):
+    """Data validation model for the SQLite store statistics."""
+
+    path: str
+    players: int
+    matches: int
+    summary_stats: int
+    writes: int
+    reads: int
+    hits: int
+
+
+class StoreStatsResponse(BaseModel):
+    """Data validation model for the SQLite store statistics."""
+
+    data: Union[StoreStats, None]
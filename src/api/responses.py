@@ -0,0 +1,72 @@
+"""Module to encode responses without validating again what the scrapers produced."""
+
+from typing import Any, Dict, Type, Union
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(value: Any) -> Any:
+    """Encodes the values the JSON encoders do not know, i.e. pydantic models."""
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encodes content as compact JSON with `orjson`.
+
+    Parameters
+    ----------
+    content : Any
+        Data made of JSON types and pydantic models.
+
+    Returns:
+    -------
+    bytes
+        UTF-8 encoded JSON.
+    """
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response encoded with `orjson`, several times faster than `json`."""
+
+    def render(self, content: Any) -> bytes:
+        """Encodes the content of the response."""
+        return dumps(content)
+
+
+def data_response(
+    model: Type[BaseModel],
+    data: Any,
+    fast: bool,
+    headers: Union[Dict[str, str], None] = None,
+) -> Union[BaseModel, FastJSONResponse]:
+    """Wraps the data of an endpoint into its response.
+
+    On the fast path the data is encoded as it is, returning a `FastJSONResponse`:
+    FastAPI then skips the `response_model` validation, and so does this function.
+    It must only be used for data already built by the serializers, whose values
+    are typed by the scrapers.
+
+    Parameters
+    ----------
+    model : Type[BaseModel]
+        Response model of the endpoint, with a single `data` field.
+    data : Any
+        Data of the response.
+    fast : bool
+        Whether to take the fast path, i.e. `PYFANTA_FAST_RESPONSES`.
+    headers : Union[Dict[str, str], None]
+        Headers of the response on the fast path.
+
+    Returns:
+    -------
+    Union[BaseModel, FastJSONResponse]
+        The validated response model, or the encoded response on the fast path.
+    """
+    if fast:
+        return FastJSONResponse({"data": data}, headers=headers)
+    return model(data=data)
@@ -4,7 +4,9 @@ from typing import Dict, List, no_type_check
 
 from fastapi import APIRouter
 
+from src.api.dependencies import FetcherDep, ParserDep, SettingsDep, StoreDep
 from src.api.models import PlayersLinksResponse
+from src.api.responses import data_response
 from src.scraper.get_players_links import GetPlayersLinks
 
 router = APIRouter()
@@ -17,19 +19,35 @@ router = APIRouter()
     tags=["Links"],
 )
 @no_type_check
-async def get_players_links(year: str) -> PlayersLinksResponse:
+async def get_players_links(
+    year: str,
+    fetcher: FetcherDep,
+    parser: ParserDep,
+    store: StoreDep,
+    settings: SettingsDep,
+) -> PlayersLinksResponse:
     """Endpoint to get players' names and links for a specified year.
 
     Parameters
     ----------
     year : str
         The year for which player links are to be fetched, e.g., "2023-24", "2022-23".
+    fetcher : Fetcher
+        The app-wide pooled fetcher.
+    parser : PageParser
+        The app-wide page parser.
+    store : Union[SeasonStore, None]
+        The app-wide store the links are written to, if enabled.
+    settings : Settings
+        API settings.
 
     Returns:
     -------
     PlayersLinksResponse
         Players' names and links for a the `year` season.
     """
-    scraper = GetPlayersLinks(year=year)
+    scraper = GetPlayersLinks(year=year, fetcher=fetcher, parser=parser)
     data: List[Dict[str, str]] = await scraper.get_links()
-    return PlayersLinksResponse(data=data)
+    if store is not None:
+        await store.save_players_links(year, data)
+    return data_response(PlayersLinksResponse, data, fast=settings.fast_responses)
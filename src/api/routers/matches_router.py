@@ -1,68 +1,242 @@
 """Module to define a router to get matches stats."""
 
-from typing import no_type_check
+from functools import partial
+from typing import Callable, List, Literal, Tuple, TypeVar, Union, no_type_check
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 
-from src.api.models import MatchesStatsResponse, PlayerLink
+from src.api.batch import batch_item, run_batch
+from src.api.cache import CachedEndpoints
+from src.api.dependencies import ScrapeContext, ScrapeContextDep
+from src.api.models import (
+    MatchesStatsBatchResponse,
+    MatchesStatsColumnarResponse,
+    MatchesStatsResponse,
+    PlayerLink,
+)
+from src.api.responses import data_response
+from src.api.serializers import (
+    Columns,
+    MatchesLayouts,
+    Record,
+    data_etag,
+    matches_stats_columns,
+    matches_stats_columns_of_rows,
+    matches_stats_rows,
+)
 from src.scraper.get_matches_stats import GetMatchesStats
 
 router = APIRouter()
 
+T = TypeVar("T", List[Record], Columns)
+
+
+async def _scrape_matches_stats(
+    player_link: PlayerLink,
+    context: ScrapeContext,
+    endpoint: str,
+    serialize: Callable[[GetMatchesStats], T],
+    refresh: bool = False,
+) -> Tuple[T, str]:
+    """Scrapes a player's match stats and serializes them, unless already cached.
+
+    The `ETag` of the stats is computed once per scrape and cached along with them.
+    On `refresh` the stats are scraped again even if cached.
+    """
+
+    async def scrape() -> T:
+        scraper = GetMatchesStats(
+            player_link=player_link, fetcher=context.fetcher, parser=context.parser
+        )
+        await scraper.scrape_all()
+        if context.store is not None:
+            await context.store.save_matches(player_link, matches_stats_rows(scraper))
+        return serialize(scraper)
+
+    if context.result_cache is None:
+        data: T = await scrape()
+        return data, data_etag(data)
+    return await context.result_cache.get_or_compute_tagged(
+        endpoint=endpoint,
+        player_link=player_link,
+        compute=scrape,
+        tag=data_etag,
+        refresh=refresh,
+    )
+
+
+async def scrape_matches_stats_rows(
+    player_link: PlayerLink, context: ScrapeContext
+) -> List[Record]:
+    """Scrapes a player's match stats into rows, unless already cached.
+
+    Parameters
+    ----------
+    player_link: PlayerLink
+        Input object containing the player's name and link.
+    context : ScrapeContext
+        The fetcher, parser, results cache and store the rows are scraped with.
+
+    Returns:
+    -------
+    List[Record]
+        One row per game day, following the `SingleMatch` model.
+    """
+    rows, _ = await _scrape_matches_stats(
+        player_link=player_link,
+        context=context,
+        endpoint=CachedEndpoints.matches_stats,
+        serialize=matches_stats_rows,
+    )
+    return rows
+
+
+async def scrape_matches_stats_columns(
+    player_link: PlayerLink, context: ScrapeContext
+) -> Columns:
+    """Scrapes a player's match stats into columns, unless already cached.
+
+    Parameters
+    ----------
+    player_link: PlayerLink
+        Input object containing the player's name and link.
+    context : ScrapeContext
+        The fetcher, parser, results cache and store the rows are scraped with.
+
+    Returns:
+    -------
+    Columns
+        One array per stat, following the `MatchesStatsColumns` model.
+    """
+    columns, _ = await _scrape_matches_stats(
+        player_link=player_link,
+        context=context,
+        endpoint=CachedEndpoints.matches_stats_columns,
+        serialize=matches_stats_columns,
+    )
+    return columns
+
 
 @router.post(
     "/v1/matches-stats",
-    response_model=MatchesStatsResponse,
+    response_model=Union[MatchesStatsResponse, MatchesStatsColumnarResponse],
     summary="Get player's match stats",
     tags=["Matches"],
 )
 @no_type_check
-async def get_matches_stats(player_link: PlayerLink) -> MatchesStatsResponse:
+async def get_matches_stats(
+    player_link: PlayerLink,
+    request: Request,
+    response: Response,
+    context: ScrapeContextDep,
+    layout: Literal["rows", "columnar"] = MatchesLayouts.rows,
+) -> Union[MatchesStatsResponse, MatchesStatsColumnarResponse]:
     """Endpoint to get player's match stats.
 
+    With `?layout=columnar` the stats are returned as one array per stat, with the
+    name of the player stored once, instead of one object per game day. With
+    `PYFANTA_STORE_READS` the stats are served from the store when stored there.
+
+    The response carries an `ETag` of the rows. A request whose `If-None-Match`
+    header matches it is answered with an empty 304 response, so that a client
+    refreshing a season only downloads the players whose stats changed. Such a
+    conditional request is a refresh: the page is scraped again, bypassing the
+    results cache and the store, which could hold stats older than the game day.
+
     Parameters
     ----------
     player_link: PlayerLink
         Input object containing the player's name and link.
+    request : Request
+        The incoming request.
+    response : Response
+        The outgoing response, to set the `ETag` header.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
+    layout : Literal["rows", "columnar"]
+        Layout of the stats, one of `MatchesLayouts`.
 
     Returns:
     -------
-    MatchesStatsResponse
+    Union[MatchesStatsResponse, MatchesStatsColumnarResponse]
         The match stats of the player.
     """
-    scraper = GetMatchesStats(player_link=player_link)
-
-    await scraper.scrape_all()
-
-    name = scraper.name
-    game_days = scraper.game_day
-    grades = scraper.grade
-    fanta_grades = scraper.fanta_grade
-    bonuses = scraper.bonus
-    maluses = scraper.malus
-    home_teams = scraper.home_team
-    guest_teams = scraper.guest_team
-    home_team_scores = scraper.home_team_score
-    guest_team_scores = scraper.guest_team_score
-    subs_in = scraper.sub_in
-    subs_out = scraper.sub_out
-
-    rows = []
-    for i in range(len(game_days)):
-        row = {
-            "name": name,
-            "game_day": game_days[i],
-            "grade": grades[i],
-            "fanta_grade": fanta_grades[i],
-            "bonus": bonuses[i],
-            "malus": maluses[i],
-            "home_team": home_teams[i],
-            "guest_team": guest_teams[i],
-            "home_team_score": home_team_scores[i],
-            "guest_team_score": guest_team_scores[i],
-            "subsitution_in": subs_in[i],
-            "subsitution_out": subs_out[i],
-        }
-        rows.append(row)
-
-    return MatchesStatsResponse(data=rows)
+    if_none_match = request.headers.get("if-none-match")
+    data = None
+    if (
+        context.store is not None
+        and context.settings.store_reads
+        and if_none_match is None
+    ):
+        data = await context.store.matches(player_link)
+        if data is not None and layout == MatchesLayouts.columnar:
+            data = matches_stats_columns_of_rows(data)
+    if data is None:
+        endpoint, serialize = (
+            (CachedEndpoints.matches_stats_columns, matches_stats_columns)
+            if layout == MatchesLayouts.columnar
+            else (CachedEndpoints.matches_stats, matches_stats_rows)
+        )
+        data, etag = await _scrape_matches_stats(
+            player_link=player_link,
+            context=context,
+            endpoint=endpoint,
+            serialize=serialize,
+            refresh=if_none_match is not None,
+        )
+    else:
+        etag = data_etag(data)
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    model = (
+        MatchesStatsColumnarResponse
+        if layout == MatchesLayouts.columnar
+        else MatchesStatsResponse
+    )
+    return data_response(
+        model, data, fast=context.settings.fast_responses, headers={"ETag": etag}
+    )
+
+
+@router.post(
+    "/v1/matches-stats/batch",
+    response_model=MatchesStatsBatchResponse,
+    summary="Get many players' match stats",
+    tags=["Matches"],
+)
+@no_type_check
+async def get_matches_stats_batch(
+    player_links: List[PlayerLink],
+    context: ScrapeContextDep,
+) -> MatchesStatsBatchResponse:
+    """Endpoint to get many players' match stats with a single request.
+
+    Players are scraped concurrently, with at most `PYFANTA_BATCH_CONCURRENCY`
+    pages fetched at the same time. A player that fails does not fail the whole
+    batch: its item carries the error instead of the data.
+
+    Parameters
+    ----------
+    player_links: List[PlayerLink]
+        Input objects containing the players' names and links.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
+
+    Returns:
+    -------
+    MatchesStatsBatchResponse
+        The match stats of each player, in the same order as `player_links`.
+    """
+    results = await run_batch(
+        items=player_links,
+        worker=partial(scrape_matches_stats_rows, context=context),
+        concurrency=context.settings.batch_concurrency,
+    )
+
+    items = [batch_item(player_link, result) for player_link, result in results]
+
+    return data_response(
+        MatchesStatsBatchResponse, items, fast=context.settings.fast_responses
+    )
@@ -1,22 +1,78 @@
 """Module to define a router to get players stats."""
 
+from functools import partial
 from typing import Dict, List, Union, no_type_check
 
 from fastapi import APIRouter, HTTPException
 
+from src.api.batch import batch_item, run_batch
+from src.api.cache import CachedEndpoints
+from src.api.dependencies import ScrapeContext, ScrapeContextDep
 from src.api.models import (
+    FullPlayerStatsResponse,
     GoalkeeperSummaryStatsResponse,
     OutfieldPlayerSummaryStatsResponse,
     PlayerLink,
+    PlayerSummaryStatsBatchResponse,
 )
-from src.scraper.get_players_stats import (
-    GetGoalkeeperSummaryStats,
-    GetOufieldPlayerSummaryStats,
+from src.api.responses import data_response
+from src.api.serializers import (
+    Record,
+    full_player_stats,
+    player_summary_stats,
 )
+from src.scraper.get_full_player_stats import GetFullPlayerStats
+from src.scraper.get_players_stats import scrape_role_aware_summary_stats
 
 router = APIRouter()
 
 
+async def scrape_player_summary_stats(
+    player_link: PlayerLink, context: ScrapeContext
+) -> Record:
+    """Scrapes a player's summary stats, whatever its role, unless already cached.
+
+    Parameters
+    ----------
+    player_link: PlayerLink
+        Input object containing the player's name and link.
+    context : ScrapeContext
+        The fetcher, parser, results cache and store the stats are scraped with.
+
+    Returns:
+    -------
+    Record
+        Data following the `OutfieldPlayerSummaryStats` or `GoalkeeperSummaryStats`
+        model, told apart by `player_type`.
+    """
+
+    async def scrape() -> Record:
+        scraper = await scrape_role_aware_summary_stats(
+            player_link=player_link, fetcher=context.fetcher, parser=context.parser
+        )
+        data = player_summary_stats(scraper=scraper)
+        if context.store is not None:
+            await context.store.save_summary_stats(player_link, data)
+        return data
+
+    if context.result_cache is None:
+        return await scrape()
+    return await context.result_cache.get_or_compute(
+        endpoint=CachedEndpoints.player_summary_stats,
+        player_link=player_link,
+        compute=scrape,
+    )
+
+
+async def summary_stats(player_link: PlayerLink, context: ScrapeContext) -> Record:
+    """Gets a player's summary stats from the store if enabled, scraping otherwise."""
+    if context.store is not None and context.settings.store_reads:
+        data = await context.store.summary_stats(player_link)
+        if data is not None:
+            return data
+    return await scrape_player_summary_stats(player_link=player_link, context=context)
+
+
 @router.post(
     "/v1/player-summary-stats/outfield",
     response_model=OutfieldPlayerSummaryStatsResponse,
@@ -32,6 +88,7 @@ router = APIRouter()
 @no_type_check
 async def get_outfield_player_summary_stats(
     player_link: PlayerLink,
+    context: ScrapeContextDep,
 ) -> OutfieldPlayerSummaryStatsResponse:
     """Endpoint to get an outfield player's summary stats in a season.
 
@@ -44,46 +101,25 @@ async def get_outfield_player_summary_stats(
     ----------
     player_link: PlayerLink
         Input object containing the player's name and link.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
 
     Returns:
     -------
     OutfieldPlayerSummaryStatsResponse
         The outfield player's summary stats in a season.
     """
-    scraper = GetOufieldPlayerSummaryStats(player_link=player_link)
+    data = await summary_stats(player_link=player_link, context=context)
 
-    await scraper.scrape_all()
-
-    if scraper.role.lower() == "goalkeeper":
+    if data["player_type"] == "goalkeeper":
         raise HTTPException(
             status_code=400,
             detail="The player is a goalkeeper. Use the goalkeepers endpoint.",
         )
 
-    data: Dict[str, List[Union[int, float, str, None]]] = {
-        "name": scraper.name,
-        "avg_grade": scraper.avg_grade,
-        "avg_fanta_grade": scraper.avg_fanta_grade,
-        "median_grade": scraper.median_grade,
-        "median_fanta_grade": scraper.median_fanta_grade,
-        "role": scraper.role,
-        "mantra_role": scraper.mantra_role,
-        "graded_matches": scraper.graded_matches,
-        "goals": scraper.goals,
-        "assists": scraper.assists,
-        "home_game_goals": scraper.home_game_goals,
-        "away_game_goals": scraper.away_game_goals,
-        "penalties_scored": scraper.penalties_scored,
-        "penalties_shot": scraper.penalties_shot,
-        "penalties_ratio": scraper.penalties_ratio,
-        "autogoals": scraper.autogoals,
-        "yellow_cards": scraper.yellow_cards,
-        "red_cards": scraper.red_cards,
-        "team": scraper.team,
-        "description": scraper.description,
-    }
-
-    return OutfieldPlayerSummaryStatsResponse(data=data)
+    return data_response(
+        OutfieldPlayerSummaryStatsResponse, data, fast=context.settings.fast_responses
+    )
 
 
 @router.post(
@@ -95,6 +131,7 @@ async def get_outfield_player_summary_stats(
 @no_type_check
 async def get_goalkeeper_summary_stats(
     player_link: PlayerLink,
+    context: ScrapeContextDep,
 ) -> GoalkeeperSummaryStatsResponse:
     """Endpoint to get an goalkeeper's summary stats in a season.
 
@@ -102,42 +139,117 @@ async def get_goalkeeper_summary_stats(
     ----------
     player_link: PlayerLink
         Input object containing the player's name and link.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
 
     Returns:
     -------
     GoalkeeperSummaryStatsResponse
         The goalkeepr's summary stats in a season.
     """
-    scraper = GetGoalkeeperSummaryStats(player_link=player_link)
-
-    await scraper.scrape_all()
+    data = await summary_stats(player_link=player_link, context=context)
 
-    if scraper.role.lower() != "portiere":
+    if data["player_type"] != "goalkeeper":
         raise HTTPException(
             status_code=400,
             detail="""The player is an outfield player.
             Use the outfield player endpoint.""",
         )
 
-    data: Dict[str, List[Union[int, float, str, None]]] = {
-        "name": scraper.name,
-        "avg_grade": scraper.avg_grade,
-        "avg_fanta_grade": scraper.avg_fanta_grade,
-        "median_grade": scraper.median_grade,
-        "median_fanta_grade": scraper.median_fanta_grade,
-        "role": scraper.role,
-        "mantra_role": scraper.mantra_role,
-        "graded_matches": scraper.graded_matches,
-        "goals_conceded": scraper.goals_conceded,
-        "assists": scraper.assists,
-        "home_game_goals_conceded": scraper.home_game_goals_conceded,
-        "away_game_goals_conceded": scraper.away_game_goals_conceded,
-        "penalties_saved": scraper.penalties_saved,
-        "autogoals": scraper.autogoals,
-        "yellow_cards": scraper.yellow_cards,
-        "red_cards": scraper.red_cards,
-        "team": scraper.team,
-        "description": scraper.description,
-    }
-
-    return GoalkeeperSummaryStatsResponse(data=data)
+    return data_response(
+        GoalkeeperSummaryStatsResponse, data, fast=context.settings.fast_responses
+    )
+
+
+@router.post(
+    "/v1/player-summary-stats/batch",
+    response_model=PlayerSummaryStatsBatchResponse,
+    summary="Get many players' summary stats for a season, whatever their role.",
+    tags=["Players"],
+)
+@no_type_check
+async def get_player_summary_stats_batch(
+    player_links: List[PlayerLink],
+    context: ScrapeContextDep,
+) -> PlayerSummaryStatsBatchResponse:
+    """Endpoint to get many players' summary stats with a single request.
+
+    Each page is fetched and parsed once: the role is read from the parsed page and
+    the outfield player or goalkeeper stats are extracted in the same pass. Items
+    are told apart by their `player_type`. Players are scraped concurrently, with
+    at most `PYFANTA_BATCH_CONCURRENCY` pages fetched at the same time.
+
+    Parameters
+    ----------
+    player_links: List[PlayerLink]
+        Input objects containing the players' names and links.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
+
+    Returns:
+    -------
+    PlayerSummaryStatsBatchResponse
+        The summary stats of each player, in the same order as `player_links`.
+    """
+    results = await run_batch(
+        items=player_links,
+        worker=partial(scrape_player_summary_stats, context=context),
+        concurrency=context.settings.batch_concurrency,
+    )
+
+    items = [batch_item(player_link, result) for player_link, result in results]
+
+    return data_response(
+        PlayerSummaryStatsBatchResponse, items, fast=context.settings.fast_responses
+    )
+
+
+@router.post(
+    "/v1/players/full",
+    response_model=FullPlayerStatsResponse,
+    summary="Get player's match stats and summary stats with a single fetch.",
+    tags=["Players"],
+)
+@no_type_check
+async def get_full_player_stats(
+    player_link: PlayerLink,
+    context: ScrapeContextDep,
+) -> FullPlayerStatsResponse:
+    """Endpoint to get a player's match stats and summary stats in a season.
+
+    The player page is fetched and parsed only once. The summary stats follow the
+    outfield player or the goalkeeper model depending on the player's role.
+
+    Parameters
+    ----------
+    player_link: PlayerLink
+        Input object containing the player's name and link.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
+
+    Returns:
+    -------
+    FullPlayerStatsResponse
+        The match stats and the summary stats of the player in a season.
+    """
+
+    async def scrape() -> Dict[str, Union[str, List[Record], Record]]:
+        scraper = GetFullPlayerStats(
+            player_link=player_link, fetcher=context.fetcher, parser=context.parser
+        )
+        await scraper.scrape_all()
+        data = full_player_stats(scraper=scraper)
+        if context.store is not None:
+            await context.store.save_matches(player_link, data["matches"])
+            await context.store.save_summary_stats(player_link, data["summary"])
+        return data
+
+    data = await context.result_cache.get_or_compute(
+        endpoint=CachedEndpoints.players_full,
+        player_link=player_link,
+        compute=scrape,
+    )
+
+    return data_response(
+        FullPlayerStatsResponse, data, fast=context.settings.fast_responses
+    )
@@ -0,0 +1,315 @@
+"""Module to define a router to get whole-season data."""
+
+import asyncio
+from functools import partial
+from typing import Annotated, AsyncIterator, Dict, List, Union, no_type_check
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from src.analytics.constants import FormConstants
+from src.analytics.form import form_records, last_game_day, season_form
+from src.analytics.rules import ScoringRules
+from src.analytics.scoring import league_records, recompute_fanta_grades
+from src.api.batch import batch_item, iter_batch_as_completed
+from src.api.dependencies import (
+    ScrapeContextDep,
+    SeasonMatricesDep,
+    SeasonTablesDep,
+    SettingsDep,
+    StoreDep,
+)
+from src.api.models import (
+    LeagueScoresResponse,
+    MatchesStatsBatchItem,
+    MatchesStatsResponse,
+    PlayerLink,
+    SeasonFormResponse,
+    SeasonPlayersQuery,
+    SeasonPlayersResponse,
+)
+from src.api.responses import data_response, dumps
+from src.api.routers.matches_router import scrape_matches_stats_rows
+from src.scraper.get_players_links import GetPlayersLinks
+
+router = APIRouter()
+
+
+@router.get(
+    "/v1/seasons/{year}/matches-stats",
+    response_class=StreamingResponse,
+    summary="Stream all players' match stats for a specified year as NDJSON",
+    tags=["Seasons"],
+)
+@no_type_check
+async def stream_season_matches_stats(
+    year: str,
+    request: Request,
+    context: ScrapeContextDep,
+) -> StreamingResponse:
+    """Endpoint to stream the match stats of every player of a season.
+
+    The response is newline-delimited JSON: each line follows the
+    `MatchesStatsBatchItem` model and is sent as soon as that player has been
+    scraped, in completion order. At most `PYFANTA_BATCH_CONCURRENCY` pages are
+    fetched at the same time and no more players are started than the client
+    consumes, so the memory used does not grow with the number of players. If the
+    client disconnects, the outstanding fetches are cancelled.
+
+    Parameters
+    ----------
+    year : str
+        The season to stream, e.g., "2023-24", "2022-23".
+    request : Request
+        The incoming HTTP request, used to detect client disconnects.
+    context : ScrapeContext
+        The app-wide fetcher, parser, results cache, store and settings.
+
+    Returns:
+    -------
+    StreamingResponse
+        NDJSON stream of the match stats of each player of the `year` season.
+    """
+    links: List[Dict[str, str]] = await GetPlayersLinks(
+        year=year, fetcher=context.fetcher, parser=context.parser
+    ).get_links()
+    player_links: List[PlayerLink] = [PlayerLink(**link) for link in links]
+
+    async def ndjson_lines() -> AsyncIterator[Union[str, bytes]]:
+        results = iter_batch_as_completed(
+            items=player_links,
+            worker=partial(scrape_matches_stats_rows, context=context),
+            concurrency=context.settings.batch_concurrency,
+        )
+        try:
+            async for player_link, result in results:
+                if await request.is_disconnected():
+                    break
+                if context.settings.fast_responses:
+                    yield dumps(batch_item(player_link, result)) + b"\n"
+                    continue
+                item = MatchesStatsBatchItem(**batch_item(player_link, result))
+                yield item.json() + "\n"
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@router.get(
+    "/v1/seasons/{year}/game-days/{game_day}/matches-stats",
+    response_model=MatchesStatsResponse,
+    summary="Get all stored players' match stats for a game day of a specified year",
+    tags=["Seasons"],
+)
+@no_type_check
+async def get_game_day_matches_stats(
+    year: str,
+    game_day: int,
+    store: StoreDep,
+    settings: SettingsDep,
+    team: Union[str, None] = None,
+) -> MatchesStatsResponse:
+    """Endpoint to get the match stats of every stored player in a game day.
+
+    Rows are read from the store through its (season, game day) index, without
+    fetching any page: only the players whose match stats were already scraped by
+    the other endpoints, or harvested, are returned.
+
+    Parameters
+    ----------
+    year : str
+        The season, e.g., "2023-24", "2022-23".
+    game_day : int
+        The game day, from 1.
+    store : Union[SeasonStore, None]
+        The app-wide store, if enabled.
+    settings : Settings
+        API settings.
+    team : Union[str, None]
+        Only the players of the matches played by this team, if given.
+
+    Returns:
+    -------
+    MatchesStatsResponse
+        One row per player, sorted by name.
+    """
+    if store is None:
+        raise HTTPException(
+            status_code=503,
+            detail="The store is disabled. Set PYFANTA_STORE_ENABLED=true.",
+        )
+
+    data = await store.game_day_matches(season=year, game_day=game_day, team=team)
+
+    return data_response(MatchesStatsResponse, data, fast=settings.fast_responses)
+
+
+@router.get(
+    "/v1/seasons/{year}/players",
+    response_model=SeasonPlayersResponse,
+    summary="Filter, sort and rank all stored players' summary stats of a year",
+    tags=["Seasons"],
+)
+@no_type_check
+async def query_season_players(
+    year: str,
+    query: Annotated[SeasonPlayersQuery, Depends()],
+    season_tables: SeasonTablesDep,
+    settings: SettingsDep,
+) -> SeasonPlayersResponse:
+    """Endpoint to query the summary stats of every stored player of a season.
+
+    E.g. the top 20 midfielders by median fanta grade with at least 10 graded
+    matches: `?role=centrocampista&min_graded_matches=10&limit=20`. The query is
+    evaluated with vectorized NumPy operations over a columnar copy of the summary
+    stats in the store, rebuilt only after new summary stats of the season are
+    stored: only the players already scraped by the other endpoints, or harvested,
+    are returned.
+
+    Parameters
+    ----------
+    year : str
+        The season, e.g., "2023-24", "2022-23".
+    query : SeasonPlayersQuery
+        Filters, sort and limit of the players, read from the query string.
+    season_tables : Union[SeasonTables, None]
+        The app-wide season tables, if the store is enabled.
+    settings : Settings
+        API settings.
+
+    Returns:
+    -------
+    SeasonPlayersResponse
+        Summary stats of the matching players, sorted.
+    """
+    if season_tables is None:
+        raise HTTPException(
+            status_code=503,
+            detail="The store is disabled. Set PYFANTA_STORE_ENABLED=true.",
+        )
+
+    table = await season_tables.get(year)
+    data = table.query(query)
+
+    return data_response(SeasonPlayersResponse, data, fast=settings.fast_responses)
+
+
+@router.get(
+    "/v1/seasons/{year}/form",
+    response_model=SeasonFormResponse,
+    summary="Get all stored players' form and consistency for a specified year",
+    tags=["Seasons"],
+)
+@no_type_check
+async def get_season_form(
+    year: str,
+    season_matrices: SeasonMatricesDep,
+    settings: SettingsDep,
+    window: int = FormConstants.window,
+    through_game_day: Union[int, None] = None,
+) -> SeasonFormResponse:
+    """Endpoint to get the form and consistency of every stored player of a season.
+
+    For each player: rolling averages of the grades over the last `window` game
+    days, mean and standard deviation of the fanta grades, appearances and minutes
+    played, and home and away splits. The whole league is computed at once with a
+    few NumPy operations over the season matrix of the match stats in the store,
+    rebuilt only after new match stats of the season are stored, e.g. by a
+    game-day refresh. Only the players already scraped by the other endpoints, or
+    harvested, are returned.
+
+    Parameters
+    ----------
+    year : str
+        The season, e.g., "2023-24", "2022-23".
+    season_matrices : Union[SeasonMatrices, None]
+        The app-wide season matrices, if the store is enabled.
+    settings : Settings
+        API settings.
+    window : int
+        Number of game days the form is averaged over.
+    through_game_day : Union[int, None]
+        Last game day taken into account, the last one played if not given.
+
+    Returns:
+    -------
+    SeasonFormResponse
+        The form of each player, sorted by link.
+    """
+    if season_matrices is None:
+        raise HTTPException(
+            status_code=503,
+            detail="The store is disabled. Set PYFANTA_STORE_ENABLED=true.",
+        )
+
+    matrix = await season_matrices.get(year)
+    if through_game_day is None:
+        through_game_day = last_game_day(matrix)
+    form = season_form(matrix, window=window, through_game_day=through_game_day)
+    data = {
+        "window": window,
+        "through_game_day": through_game_day,
+        "players": form_records(matrix, form),
+    }
+
+    return data_response(SeasonFormResponse, data, fast=settings.fast_responses)
+
+
+@router.post(
+    "/v1/seasons/{year}/fanta-grades",
+    response_model=LeagueScoresResponse,
+    summary="Recompute all stored players' fanta grades under many leagues' rules",
+    tags=["Seasons"],
+)
+@no_type_check
+async def recompute_season_fanta_grades(
+    year: str,
+    rules: List[ScoringRules],
+    season_matrices: SeasonMatricesDep,
+    season_tables: SeasonTablesDep,
+    settings: SettingsDep,
+) -> LeagueScoresResponse:
+    """Endpoint to recompute the fanta grades of a season under custom rules.
+
+    Every game day of every stored player is scored under each set of rules in a
+    single vectorized pass over the season matrix of the match stats, from the
+    grades, the bonus and malus of each game day and the counters of the summary
+    stats in the store, without scraping any page. Players without stored summary
+    stats keep the site's bonus and malus.
+
+    Parameters
+    ----------
+    year : str
+        The season, e.g., "2023-24", "2022-23".
+    rules : List[ScoringRules]
+        Bonus and malus rules of each league.
+    season_matrices : Union[SeasonMatrices, None]
+        The app-wide season matrices, if the store is enabled.
+    season_tables : Union[SeasonTables, None]
+        The app-wide season tables, if the store is enabled.
+    settings : Settings
+        API settings.
+
+    Returns:
+    -------
+    LeagueScoresResponse
+        The fanta grades of each player under each set of rules, in the same order
+        as `rules`.
+    """
+    if season_matrices is None or season_tables is None:
+        raise HTTPException(
+            status_code=503,
+            detail="The store is disabled. Set PYFANTA_STORE_ENABLED=true.",
+        )
+
+    matrix = await season_matrices.get(year)
+    table = await season_tables.get(year)
+
+    def score() -> List[Dict[str, object]]:
+        fanta_grades = recompute_fanta_grades(matrix, table.summaries(), rules)
+        return league_records(matrix, rules, fanta_grades)
+
+    data = await asyncio.to_thread(score)
+
+    return data_response(LeagueScoresResponse, data, fast=settings.fast_responses)
@@ -0,0 +1,200 @@
+"""Module to define a router to get the API runtime statistics."""
+
+from typing import no_type_check
+
+from fastapi import APIRouter
+
+from src.api.dependencies import FetcherDep, ParserDep, ResultCacheDep, StoreDep
+from src.api.models import (
+    CacheStatsResponse,
+    CircuitBreakersStatsResponse,
+    PageCacheStatsResponse,
+    ParserStatsResponse,
+    PoolStatsResponse,
+    RateLimiterStatsResponse,
+    StoreStatsResponse,
+)
+
+router = APIRouter()
+
+
+@router.get(
+    "/v1/stats/pool",
+    response_model=PoolStatsResponse,
+    summary="Get the shared HTTP connection pool statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_pool_stats(
+    fetcher: FetcherDep,
+) -> PoolStatsResponse:
+    """Endpoint to get the shared HTTP connection pool statistics.
+
+    Parameters
+    ----------
+    fetcher : Fetcher
+        The app-wide pooled fetcher.
+
+    Returns:
+    -------
+    PoolStatsResponse
+        Configuration and counters of the connection pool.
+    """
+    return PoolStatsResponse(data=fetcher.stats())
+
+
+@router.get(
+    "/v1/stats/cache",
+    response_model=CacheStatsResponse,
+    summary="Get the scraped results cache statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_cache_stats(
+    result_cache: ResultCacheDep,
+) -> CacheStatsResponse:
+    """Endpoint to get the scraped results cache statistics.
+
+    Parameters
+    ----------
+    result_cache : ResultCache
+        The app-wide results cache.
+
+    Returns:
+    -------
+    CacheStatsResponse
+        Configuration, occupancy and counters of the cache.
+    """
+    return CacheStatsResponse(data=result_cache.stats())
+
+
+@router.get(
+    "/v1/stats/page-cache",
+    response_model=PageCacheStatsResponse,
+    summary="Get the on-disk page cache statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_page_cache_stats(
+    fetcher: FetcherDep,
+) -> PageCacheStatsResponse:
+    """Endpoint to get the on-disk page cache statistics.
+
+    Parameters
+    ----------
+    fetcher : Fetcher
+        The app-wide pooled fetcher.
+
+    Returns:
+    -------
+    PageCacheStatsResponse
+        Configuration and counters of the page cache.
+    """
+    if fetcher.page_cache is None:
+        return PageCacheStatsResponse(data={"enabled": False})
+    return PageCacheStatsResponse(data={"enabled": True, **fetcher.page_cache.stats()})
+
+
+@router.get(
+    "/v1/stats/parser",
+    response_model=ParserStatsResponse,
+    summary="Get the page parser pool statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_parser_stats(
+    parser: ParserDep,
+) -> ParserStatsResponse:
+    """Endpoint to get the page parser pool statistics.
+
+    Parameters
+    ----------
+    parser : PageParser
+        The app-wide page parser.
+
+    Returns:
+    -------
+    ParserStatsResponse
+        Configuration, queue depth and counters of the parser pool.
+    """
+    return ParserStatsResponse(data=parser.stats())
+
+
+@router.get(
+    "/v1/stats/rate-limiter",
+    response_model=RateLimiterStatsResponse,
+    summary="Get the rate limiter statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_rate_limiter_stats(
+    fetcher: FetcherDep,
+) -> RateLimiterStatsResponse:
+    """Endpoint to get the statistics of the rate limiter of the shared fetcher.
+
+    Parameters
+    ----------
+    fetcher : Fetcher
+        The app-wide pooled fetcher.
+
+    Returns:
+    -------
+    RateLimiterStatsResponse
+        Configuration, current rate and counters of the rate limiter, `None` if
+        the fetcher has none.
+    """
+    if fetcher.rate_limiter is None:
+        return RateLimiterStatsResponse(data=None)
+    return RateLimiterStatsResponse(data=fetcher.rate_limiter.stats())
+
+
+@router.get(
+    "/v1/stats/circuit-breakers",
+    response_model=CircuitBreakersStatsResponse,
+    summary="Get the circuit breakers statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_circuit_breakers_stats(
+    fetcher: FetcherDep,
+) -> CircuitBreakersStatsResponse:
+    """Endpoint to get the state of the circuit breaker of each host.
+
+    Parameters
+    ----------
+    fetcher : Fetcher
+        The app-wide pooled fetcher.
+
+    Returns:
+    -------
+    CircuitBreakersStatsResponse
+        State and counters of the circuit breaker of each host contacted so far.
+    """
+    return CircuitBreakersStatsResponse(data=fetcher.circuit_breakers_stats())
+
+
+@router.get(
+    "/v1/stats/store",
+    response_model=StoreStatsResponse,
+    summary="Get the SQLite store statistics",
+    tags=["Stats"],
+)
+@no_type_check
+async def get_store_stats(
+    store: StoreDep,
+) -> StoreStatsResponse:
+    """Endpoint to get the SQLite store statistics.
+
+    Parameters
+    ----------
+    store : Union[SeasonStore, None]
+        The app-wide store, if enabled.
+
+    Returns:
+    -------
+    StoreStatsResponse
+        Rows stored and counters of the store, `None` if the store is disabled.
+    """
+    if store is None:
+        return StoreStatsResponse(data=None)
+    return StoreStatsResponse(data=await store.stats())
@@ -0,0 +1,218 @@
+"""Module to query the data of a season over in-memory columnar copies."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Generic, List, Tuple, TypeVar, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from src.analytics.season_matrix import SeasonMatrix
+from src.api.models import SeasonPlayersQuery
+from src.api.serializers import Record
+from src.api.store import SUMMARY_COLUMNS, SeasonStore
+
+V = TypeVar("V")
+
+NUMERIC_COLUMNS: List[str] = [
+    name for name, sql_type in SUMMARY_COLUMNS.items() if sql_type != "TEXT"
+]
+
+
+class SortOrders:
+    """Class containing the orders the players of a season can be sorted by."""
+
+    asc: str = "asc"
+    desc: str = "desc"
+
+
+class SeasonTable:
+    """Columnar copy of the summary stats of every stored player of a season.
+
+    Numeric stats are held as one float64 array per stat, with NaN for missing
+    values and for the stats of the other role, and the text stats filtered on as
+    one lowercase array per stat. Queries are evaluated with boolean masks and a
+    single `argsort` over the matching players, without any Python loop per player.
+
+    Attributes:
+    ----------
+    links : List[str]
+        Link of each player.
+    records : List[Record]
+        Summary stats of each player, as stored.
+    """
+
+    def __init__(self, records: Dict[str, Record]):  # noqa: D107
+        self.links: List[str] = list(records)
+        self.records: List[Record] = list(records.values())
+        self.__numeric: Dict[str, npt.NDArray[np.float64]] = {
+            name: np.array(
+                [record.get(name) for record in self.records], dtype=np.float64
+            )
+            for name in NUMERIC_COLUMNS
+        }
+        self.__text: Dict[str, npt.NDArray[np.str_]] = {
+            name: np.array(
+                [str(record[name]).lower() for record in self.records], dtype=str
+            )
+            for name in ("role", "team", "player_type")
+        }
+
+    def __len__(self) -> int:  # noqa: D105
+        return len(self.records)
+
+    def summaries(self) -> Dict[str, Record]:
+        """Gets the summary stats of each player, keyed by the link of the player."""
+        return dict(zip(self.links, self.records))
+
+    def query(self, query: SeasonPlayersQuery) -> List[Record]:
+        """Filters, sorts and truncates the players of the season.
+
+        Roles and teams are matched case-insensitively. Players missing the stat
+        sorted by come last, ties keep the order by name. Every player is returned
+        if `query.limit` is `None`.
+
+        Parameters
+        ----------
+        query : SeasonPlayersQuery
+            Filters, numeric stat to sort by, sort order, one of `SortOrders`, and
+            maximum number of players.
+
+        Returns:
+        -------
+        List[Record]
+            Summary stats of the matching players, sorted.
+        """
+        if query.sort not in self.__numeric:
+            raise ValueError(
+                f"Cannot sort by '{query.sort}'. "
+                f"Sortable stats: {', '.join(NUMERIC_COLUMNS)}."
+            )
+        if query.order not in (SortOrders.asc, SortOrders.desc):
+            raise ValueError(f"Unknown sort order '{query.order}'.")
+        if query.limit is not None and query.limit < 0:
+            raise ValueError("The limit cannot be negative.")
+
+        mask: npt.NDArray[np.bool_] = np.ones(len(self), dtype=bool)
+        filters: Dict[str, Union[str, None]] = {
+            "role": query.role,
+            "team": query.team,
+            "player_type": query.player_type,
+        }
+        for name, value in filters.items():
+            if value is not None:
+                mask &= self.__text[name] == value.lower()
+        if query.min_graded_matches > 0:
+            mask &= self.__numeric["graded_matches"] >= query.min_graded_matches
+
+        indices: npt.NDArray[np.intp] = np.flatnonzero(mask)
+        values: npt.NDArray[np.float64] = self.__numeric[query.sort][indices]
+        if query.order == SortOrders.desc:
+            values = -values
+        indices = indices[np.argsort(values, kind="stable")[: query.limit]]
+
+        return [self.records[i] for i in indices]
+
+
+class SeasonViews(ABC, Generic[V]):
+    """Base class of the per-season views built from the store and kept up to date.
+
+    The view of a season is built from the store on the first request and rebuilt
+    only once rows of that season were stored again. Every other request is served
+    by the view in memory, so concurrent requests take milliseconds and only read
+    the version of the season from the database. Subclasses implement `_version`
+    and `_build`.
+
+    Attributes:
+    ----------
+    store : SeasonStore
+        The store the views are built from.
+    """
+
+    def __init__(self, store: SeasonStore):  # noqa: D107
+        self.store: SeasonStore = store
+        self.__views: Dict[str, Tuple[int, V]] = {}
+        self.__lock = asyncio.Lock()
+
+    async def get(self, season: str) -> V:
+        """Gets the up-to-date view of a season, building it if needed.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+
+        Returns:
+        -------
+        V
+            View of the rows stored for the season.
+        """
+        view: Union[V, None] = await self.__fresh(season)
+        if view is not None:
+            return view
+        async with self.__lock:
+            view = await self.__fresh(season)
+            if view is not None:
+                return view
+            version: int = await self._version(season)
+            view = await self._build(season)
+            self.__views[season] = (version, view)
+
+        return view
+
+    @abstractmethod
+    async def _version(self, season: str) -> int:
+        """Gets the version of the rows of a season the view is built from."""
+
+    @abstractmethod
+    async def _build(self, season: str) -> V:
+        """Builds the view of a season."""
+
+    async def __fresh(self, season: str) -> Union[V, None]:
+        """Gets the view of a season, unless missing or outdated."""
+        entry: Union[Tuple[int, V], None] = self.__views.get(season)
+        if entry is None or entry[0] != await self._version(season):
+            return None
+        return entry[1]
+
+
+class SeasonTables(SeasonViews[SeasonTable]):
+    """Per-season `SeasonTable`s of the summary stats in the store.
+
+    Tables are rebuilt in a worker thread once summary stats of their season were
+    stored again.
+    """
+
+    async def _version(self, season: str) -> int:
+        return await self.store.summary_stats_version(season)
+
+    async def _build(self, season: str) -> SeasonTable:
+        records: Dict[str, Record] = await self.store.season_summary_stats(season)
+        return await asyncio.to_thread(SeasonTable, records)
+
+
+class SeasonMatrices(SeasonViews[SeasonMatrix]):
+    """Per-season `SeasonMatrix`es of the match stats in the store.
+
+    Matrices are rebuilt in a worker thread once match stats of their season were
+    stored again, e.g. after each game-day refresh. Players are sorted by link.
+    """
+
+    async def _version(self, season: str) -> int:
+        return await self.store.matches_version(season)
+
+    async def _build(self, season: str) -> SeasonMatrix:
+        rows: List[Record] = await self.store.season_matches(season)
+
+        def build() -> SeasonMatrix:
+            players: List[Tuple[Dict[str, str], List[Record]]] = []
+            for link, player_rows in groupby(rows, key=itemgetter("link")):
+                matches: List[Record] = list(player_rows)
+                players.append(
+                    ({"name": str(matches[0]["name"]), "link": str(link)}, matches)
+                )
+            return SeasonMatrix.from_players(players)
+
+        return await asyncio.to_thread(build)
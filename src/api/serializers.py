@@ -0,0 +1,292 @@
+"""Module to turn scrapers' attributes into the data expected by the response models."""
+
+import hashlib
+import json
+from typing import Dict, List, Sequence, Union
+
+from src.scraper.get_full_player_stats import GetFullPlayerStats
+from src.scraper.get_matches_stats import GetMatchesStats
+from src.scraper.get_players_stats import (
+    GetGoalkeeperSummaryStats,
+    GetOufieldPlayerSummaryStats,
+)
+
+Record = Dict[str, Union[int, float, str, None]]
+Column = Sequence[Union[int, float, str, None]]
+Columns = Dict[str, Union[str, Column]]
+
+
+class MatchesLayouts:
+    """Class containing the layouts match stats can be returned in."""
+
+    rows: str = "rows"
+    columnar: str = "columnar"
+
+
+def matches_stats_rows(
+    scraper: GetMatchesStats,
+) -> List[Record]:
+    """Builds one row per game day out of a scraped `GetMatchesStats`.
+
+    Parameters
+    ----------
+    scraper : GetMatchesStats
+        Scraper on which `scrape_all` or `extract_all` has already been awaited.
+
+    Returns:
+    -------
+    List[Record]
+        Rows following the `SingleMatch` model.
+    """
+    name = scraper.name
+    game_days = scraper.game_day
+    grades = scraper.grade
+    fanta_grades = scraper.fanta_grade
+    bonuses = scraper.bonus
+    maluses = scraper.malus
+    home_teams = scraper.home_team
+    guest_teams = scraper.guest_team
+    home_team_scores = scraper.home_team_score
+    guest_team_scores = scraper.guest_team_score
+    subs_in = scraper.sub_in
+    subs_out = scraper.sub_out
+    assert isinstance(game_days, list)
+    assert isinstance(grades, list) and isinstance(fanta_grades, list)
+    assert isinstance(bonuses, list) and isinstance(maluses, list)
+    assert isinstance(home_teams, list) and isinstance(guest_teams, list)
+    assert isinstance(home_team_scores, list) and isinstance(guest_team_scores, list)
+    assert isinstance(subs_in, list) and isinstance(subs_out, list)
+
+    rows: List[Record] = []
+    for i in range(len(game_days)):
+        row: Record = {
+            "name": name,
+            "game_day": game_days[i],
+            "grade": grades[i],
+            "fanta_grade": fanta_grades[i],
+            "bonus": bonuses[i],
+            "malus": maluses[i],
+            "home_team": home_teams[i],
+            "guest_team": guest_teams[i],
+            "home_team_score": home_team_scores[i],
+            "guest_team_score": guest_team_scores[i],
+            "subsitution_in": subs_in[i],
+            "subsitution_out": subs_out[i],
+        }
+        rows.append(row)
+
+    return rows
+
+
+def _column(values: Union[Column, None]) -> Column:
+    """Gets a stat scraped for every game day, which must have been scraped."""
+    assert isinstance(values, list)
+    return values
+
+
+def matches_stats_columns(
+    scraper: GetMatchesStats,
+) -> Columns:
+    """Builds one array per stat out of a scraped `GetMatchesStats`.
+
+    The arrays are the scraper's own lists, handed over without building a row per
+    game day.
+
+    Parameters
+    ----------
+    scraper : GetMatchesStats
+        Scraper on which `scrape_all` or `extract_all` has already been awaited.
+
+    Returns:
+    -------
+    Columns
+        Arrays following the `MatchesStatsColumns` model.
+    """
+    return {
+        "name": scraper.name,
+        "game_day": _column(scraper.game_day),
+        "grade": _column(scraper.grade),
+        "fanta_grade": _column(scraper.fanta_grade),
+        "bonus": _column(scraper.bonus),
+        "malus": _column(scraper.malus),
+        "home_team": _column(scraper.home_team),
+        "guest_team": _column(scraper.guest_team),
+        "home_team_score": _column(scraper.home_team_score),
+        "guest_team_score": _column(scraper.guest_team_score),
+        "subsitution_in": _column(scraper.sub_in),
+        "subsitution_out": _column(scraper.sub_out),
+    }
+
+
+def matches_stats_columns_of_rows(rows: List[Record]) -> Columns:
+    """Builds one array per stat out of rows following the `SingleMatch` model.
+
+    Parameters
+    ----------
+    rows : List[Record]
+        One row per game day of a single player.
+
+    Returns:
+    -------
+    Columns
+        Arrays following the `MatchesStatsColumns` model.
+    """
+    columns: Columns = {"name": str(rows[0]["name"]) if rows else ""}
+    for key in (
+        "game_day",
+        "grade",
+        "fanta_grade",
+        "bonus",
+        "malus",
+        "home_team",
+        "guest_team",
+        "home_team_score",
+        "guest_team_score",
+        "subsitution_in",
+        "subsitution_out",
+    ):
+        columns[key] = [row[key] for row in rows]
+
+    return columns
+
+
+def outfield_summary_stats(
+    scraper: GetOufieldPlayerSummaryStats,
+) -> Record:
+    """Builds the summary stats of an outfield player out of its scraper.
+
+    Parameters
+    ----------
+    scraper : GetOufieldPlayerSummaryStats
+        Scraper on which `scrape_all` or `extract_all` has already been awaited.
+
+    Returns:
+    -------
+    Record
+        Data following the `OutfieldPlayerSummaryStats` model.
+    """
+    return {
+        "player_type": "outfield",
+        "name": scraper.name,
+        "avg_grade": scraper.avg_grade,
+        "avg_fanta_grade": scraper.avg_fanta_grade,
+        "median_grade": scraper.median_grade,
+        "median_fanta_grade": scraper.median_fanta_grade,
+        "role": scraper.role,
+        "mantra_role": scraper.mantra_role,
+        "graded_matches": scraper.graded_matches,
+        "goals": scraper.goals,
+        "assists": scraper.assists,
+        "home_game_goals": scraper.home_game_goals,
+        "away_game_goals": scraper.away_game_goals,
+        "penalties_scored": scraper.penalties_scored,
+        "penalties_shot": scraper.penalties_shot,
+        "penalties_ratio": scraper.penalties_ratio,
+        "autogoals": scraper.autogoals,
+        "yellow_cards": scraper.yellow_cards,
+        "red_cards": scraper.red_cards,
+        "team": scraper.team,
+        "description": scraper.description,
+    }
+
+
+def goalkeeper_summary_stats(
+    scraper: GetGoalkeeperSummaryStats,
+) -> Record:
+    """Builds the summary stats of a goalkeeper out of its scraper.
+
+    Parameters
+    ----------
+    scraper : GetGoalkeeperSummaryStats
+        Scraper on which `scrape_all` or `extract_all` has already been awaited.
+
+    Returns:
+    -------
+    Record
+        Data following the `GoalkeeperSummaryStats` model.
+    """
+    return {
+        "player_type": "goalkeeper",
+        "name": scraper.name,
+        "avg_grade": scraper.avg_grade,
+        "avg_fanta_grade": scraper.avg_fanta_grade,
+        "median_grade": scraper.median_grade,
+        "median_fanta_grade": scraper.median_fanta_grade,
+        "role": scraper.role,
+        "mantra_role": scraper.mantra_role,
+        "graded_matches": scraper.graded_matches,
+        "goals_conceded": scraper.goals_conceded,
+        "assists": scraper.assists,
+        "home_game_goals_conceded": scraper.home_game_goals_conceded,
+        "away_game_goals_conceded": scraper.away_game_goals_conceded,
+        "penalties_saved": scraper.penalties_saved,
+        "autogoals": scraper.autogoals,
+        "yellow_cards": scraper.yellow_cards,
+        "red_cards": scraper.red_cards,
+        "team": scraper.team,
+        "description": scraper.description,
+    }
+
+
+def player_summary_stats(
+    scraper: Union[GetOufieldPlayerSummaryStats, GetGoalkeeperSummaryStats],
+) -> Record:
+    """Builds the summary stats of a player of any role out of its scraper.
+
+    Parameters
+    ----------
+    scraper : Union[GetOufieldPlayerSummaryStats, GetGoalkeeperSummaryStats]
+        Scraper on which `scrape_all` or `extract_all` has already been awaited.
+
+    Returns:
+    -------
+    Record
+        Data following the `OutfieldPlayerSummaryStats` or `GoalkeeperSummaryStats`
+        model, told apart by `player_type`.
+    """
+    if isinstance(scraper, GetGoalkeeperSummaryStats):
+        return goalkeeper_summary_stats(scraper=scraper)
+    return outfield_summary_stats(scraper=scraper)
+
+
+def full_player_stats(
+    scraper: GetFullPlayerStats,
+) -> Dict[str, Union[str, List[Record], Record]]:
+    """Builds match stats and summary stats of a player out of its scraper.
+
+    Parameters
+    ----------
+    scraper : GetFullPlayerStats
+        Scraper on which `scrape_all` or `extract_all` has already been awaited.
+
+    Returns:
+    -------
+    Dict[str, Union[str, List[Record], Record]]
+        Data following the `FullPlayerStats` model.
+    """
+    assert scraper.summary is not None
+
+    return {
+        "name": scraper.matches.name,
+        "matches": matches_stats_rows(scraper=scraper.matches),
+        "summary": player_summary_stats(scraper=scraper.summary),
+    }
+
+
+def data_etag(data: Union[List[Record], Columns]) -> str:
+    """Builds a strong `ETag` out of response data, changing whenever any value does.
+
+    Parameters
+    ----------
+    data : Union[List[Record], Columns]
+        Data of a response, as rows or as columns.
+
+    Returns:
+    -------
+    str
+        Quoted SHA-256 of the data serialized as canonical JSON.
+    """
+    canonical: bytes = json.dumps(data, sort_keys=True, separators=(",", ":")).encode(
+        "utf-8"
+    )
+    return f'"{hashlib.sha256(canonical).hexdigest()}"'
@@ -0,0 +1,85 @@
+"""Module to define the API settings, configurable through environment variables."""
+
+from functools import lru_cache
+from typing import Dict, List, Union
+
+from pydantic import BaseModel, BaseSettings
+
+from src.scraper.constants import (
+    FetcherConstants,
+    ParserConstants,
+    RateLimiterConstants,
+    RetryConstants,
+)
+from src.scraper.parser import ParserBackends, ParserPools
+
+
+class RetryPolicyOverrides(BaseModel):
+    """Retry policy settings of a kind of page, overriding the default ones."""
+
+    max_attempts: Union[int, None] = None
+    base_delay: Union[float, None] = None
+    max_delay: Union[float, None] = None
+    retry_on_timeout: Union[bool, None] = None
+
+
+class Settings(BaseSettings):
+    """API settings.
+
+    Every setting can be overridden with an environment variable named after the
+    setting and prefixed with `PYFANTA_`, e.g. `PYFANTA_HTTP_LIMIT_PER_HOST=4`.
+    Complex settings are read as JSON, e.g.
+    `PYFANTA_RETRY_POLICIES='{"players-links": {"max_attempts": 5}}'`.
+    """
+
+    http_limit: int = FetcherConstants.limit
+    http_limit_per_host: int = FetcherConstants.limit_per_host
+    http_keepalive_timeout: float = FetcherConstants.keepalive_timeout
+    http_ttl_dns_cache: int = FetcherConstants.ttl_dns_cache
+    http_total_timeout: float = FetcherConstants.total_timeout
+    http_connect_timeout: Union[float, None] = None
+    http_read_timeout: Union[float, None] = None
+    rate_limit_rps: float = RateLimiterConstants.rate
+    rate_limit_burst: int = RateLimiterConstants.burst
+    rate_limit_min_rps: float = RateLimiterConstants.min_rate
+    rate_limit_backoff_factor: float = RateLimiterConstants.backoff_factor
+    rate_limit_recovery_step: float = RateLimiterConstants.recovery_step
+    retry_max_attempts: int = RetryConstants.max_attempts
+    retry_base_delay: float = RetryConstants.base_delay
+    retry_max_delay: float = RetryConstants.max_delay
+    retry_policies: Dict[str, RetryPolicyOverrides] = {}
+    circuit_failure_threshold: int = RetryConstants.circuit_failure_threshold
+    circuit_reset_timeout: float = RetryConstants.circuit_reset_timeout
+    page_cache_enabled: bool = False
+    page_cache_dir: str = "data/page_cache"
+    page_cache_fresh_for: float = 3600.0
+    page_cache_immutable_seasons: List[str] = []
+    page_cache_offline: bool = False
+    parser_backend: str = ParserBackends.bs4
+    parser_pool: str = ParserPools.thread
+    parser_pool_size: Union[int, None] = ParserConstants.pool_size
+    parser_memo_entries: int = ParserConstants.memo_entries
+    batch_concurrency: int = 8
+    fast_responses: bool = False
+    store_enabled: bool = False
+    store_path: str = "data/pyfanta.sqlite3"
+    store_reads: bool = False
+    cache_ttl: float = 3600.0
+    cache_max_entries: int = 4096
+    cache_max_bytes: int = 128 * 1024 * 1024
+    cache_disabled_endpoints: List[str] = []
+
+    class Config:  # noqa: D106
+        env_prefix = "PYFANTA_"
+
+
+@lru_cache()
+def get_settings() -> Settings:
+    """Get the API settings, read once from the environment.
+
+    Returns:
+    -------
+    Settings
+        API settings.
+    """
+    return Settings()
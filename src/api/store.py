@@ -0,0 +1,439 @@
+"""Module to persist the scraped data in an embedded, indexed SQLite store."""
+
+import asyncio
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel
+
+from src.api.models import (
+    GoalkeeperSummaryStats,
+    OutfieldPlayerSummaryStats,
+    PlayerLink,
+    SingleMatch,
+)
+from src.api.serializers import Record
+
+_SEASON = re.compile(r"\d{4}-\d{2}$")
+
+_SQL_TYPES: Dict[type, str] = {int: "INTEGER", float: "REAL", str: "TEXT"}
+
+
+def season_of(link: str) -> Union[str, None]:
+    """Gets the season a player link refers to, e.g. "2024-25".
+
+    Parameters
+    ----------
+    link : str
+        Link of the player, as returned by `GetPlayersLinks`.
+
+    Returns:
+    -------
+    Union[str, None]
+        Season at the end of the link, `None` if the link has none.
+    """
+    match = _SEASON.search(link.rstrip("/"))
+    return match.group(0) if match else None
+
+
+def _columns(*models: Type[BaseModel]) -> Dict[str, str]:
+    """Gets the SQL columns of the fields of the models, in declaration order."""
+    columns: Dict[str, str] = {}
+    for model in models:
+        for name, field in model.__fields__.items():
+            columns.setdefault(name, _SQL_TYPES.get(field.type_, "TEXT"))
+    return columns
+
+
+MATCH_COLUMNS: Dict[str, str] = _columns(SingleMatch)
+SUMMARY_COLUMNS: Dict[str, str] = _columns(
+    OutfieldPlayerSummaryStats, GoalkeeperSummaryStats
+)
+SUMMARY_FIELDS: Dict[str, List[str]] = {
+    "outfield": list(OutfieldPlayerSummaryStats.__fields__),
+    "goalkeeper": list(GoalkeeperSummaryStats.__fields__),
+}
+
+
+def _definitions(columns: Dict[str, str]) -> str:
+    """Builds the column definitions of a table."""
+    return ", ".join(f"{name} {sql_type}" for name, sql_type in columns.items())
+
+
+SCHEMA: str = f"""
+CREATE TABLE IF NOT EXISTS players (
+    season TEXT NOT NULL,
+    link TEXT NOT NULL,
+    name TEXT NOT NULL,
+    PRIMARY KEY (season, link)
+);
+CREATE TABLE IF NOT EXISTS matches (
+    season TEXT NOT NULL,
+    link TEXT NOT NULL,
+    {_definitions(MATCH_COLUMNS)},
+    PRIMARY KEY (season, link, game_day)
+);
+CREATE INDEX IF NOT EXISTS matches_season_game_day ON matches (season, game_day);
+CREATE INDEX IF NOT EXISTS matches_home_team ON matches (season, home_team);
+CREATE INDEX IF NOT EXISTS matches_guest_team ON matches (season, guest_team);
+CREATE TABLE IF NOT EXISTS summary_stats (
+    season TEXT NOT NULL,
+    link TEXT NOT NULL,
+    {_definitions(SUMMARY_COLUMNS)},
+    PRIMARY KEY (season, link)
+);
+CREATE INDEX IF NOT EXISTS summary_stats_team ON summary_stats (season, team);
+CREATE TABLE IF NOT EXISTS versions (
+    season TEXT NOT NULL,
+    tbl TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (season, tbl)
+);
+"""
+
+_BUMP: str = (
+    "INSERT INTO versions (season, tbl, version) VALUES (?, ?, 1) "
+    "ON CONFLICT (season, tbl) DO UPDATE SET version = version + 1"
+)
+
+Statement = Tuple[str, Sequence[Sequence[Any]]]
+
+
+class SeasonStore:
+    """Embedded SQLite store of the players, match stats and summary stats scraped.
+
+    Tables mirror `PlayerLink`, `SingleMatch` and the summary stats models, keyed
+    by season and player link, which also index them by (season, player). Match
+    rows are indexed by (season, game day) and by team, summary stats by team, so
+    that e.g. all the rows of a game day are read without scraping any page.
+
+    Queries run in a worker thread, one at a time, on a single connection in WAL
+    mode: reads from other processes never block on writes. Every write of match
+    or summary stats bumps the version of their season in the `versions` table,
+    in the same transaction, so every process sharing the database sees it.
+
+    Attributes:
+    ----------
+    path : Path
+        Path of the database file.
+    """
+
+    def __init__(self, path: Union[str, Path]):  # noqa: D107
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.__connection.row_factory = sqlite3.Row
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(SCHEMA)
+        self.__counters: Dict[str, int] = {"writes": 0, "reads": 0, "hits": 0}
+
+    def close(self) -> None:
+        """Closes the connection to the database."""
+        with self.__lock:
+            self.__connection.close()
+
+    async def save_players_links(
+        self, season: str, players_links: List[Dict[str, str]]
+    ) -> None:
+        """Stores the names and links of the players of a season.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+        players_links : List[Dict[str, str]]
+            Names and links of the players.
+        """
+        await self.__write(
+            (
+                "INSERT OR REPLACE INTO players (season, link, name) VALUES (?, ?, ?)",
+                [(season, link["link"], link["name"]) for link in players_links],
+            )
+        )
+
+    async def save_matches(self, player_link: PlayerLink, rows: List[Record]) -> None:
+        """Stores the match stats of a player, replacing all the previous ones.
+
+        Rows of game days no longer in `rows` are deleted in the same transaction.
+
+        Parameters
+        ----------
+        player_link : PlayerLink
+            The player the rows belong to.
+        rows : List[Record]
+            One row per game day, following the `SingleMatch` model.
+        """
+        season: Union[str, None] = season_of(player_link.link)
+        if season is None:
+            return
+        await self.__write(
+            (
+                "DELETE FROM matches WHERE season = ? AND link = ?",
+                [(season, player_link.link)],
+            ),
+            (
+                self.__insert("matches", MATCH_COLUMNS),
+                [
+                    (
+                        season,
+                        player_link.link,
+                        *(row.get(name) for name in MATCH_COLUMNS),
+                    )
+                    for row in rows
+                ],
+            ),
+            (_BUMP, [(season, "matches")]),
+        )
+
+    async def save_summary_stats(self, player_link: PlayerLink, record: Record) -> None:
+        """Stores the summary stats of a player, replacing the previous ones.
+
+        Parameters
+        ----------
+        player_link : PlayerLink
+            The player the stats belong to.
+        record : Record
+            Data following the `OutfieldPlayerSummaryStats` or
+            `GoalkeeperSummaryStats` model.
+        """
+        season: Union[str, None] = season_of(player_link.link)
+        if season is None:
+            return
+        await self.__write(
+            (
+                self.__insert("summary_stats", SUMMARY_COLUMNS),
+                [
+                    (
+                        season,
+                        player_link.link,
+                        *(record.get(name) for name in SUMMARY_COLUMNS),
+                    )
+                ],
+            ),
+            (_BUMP, [(season, "summary_stats")]),
+        )
+
+    async def matches(self, player_link: PlayerLink) -> Union[List[Record], None]:
+        """Gets the stored match stats of a player.
+
+        Parameters
+        ----------
+        player_link : PlayerLink
+            The player to get the rows of.
+
+        Returns:
+        -------
+        Union[List[Record], None]
+            One row per game day, `None` if the player was never stored.
+        """
+        rows: List[Record] = await self.__read(
+            f"SELECT {', '.join(MATCH_COLUMNS)} FROM matches "
+            "WHERE season = ? AND link = ? ORDER BY game_day",
+            (season_of(player_link.link), player_link.link),
+        )
+        return rows or None
+
+    async def season_matches(self, season: str) -> List[Record]:
+        """Gets the stored match stats of every player of a season.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+
+        Returns:
+        -------
+        List[Record]
+            Rows following the `SingleMatch` model plus the `link` of the player,
+            sorted by player and game day.
+        """
+        return await self.__read(
+            f"SELECT link, {', '.join(MATCH_COLUMNS)} FROM matches "
+            "WHERE season = ? ORDER BY link, game_day",
+            (season,),
+        )
+
+    async def game_day_matches(
+        self, season: str, game_day: int, team: Union[str, None] = None
+    ) -> List[Record]:
+        """Gets the stored match stats of every player in a game day.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+        game_day : int
+            Game day, from 1.
+        team : Union[str, None]
+            Only the rows of the matches played by this team, if given.
+
+        Returns:
+        -------
+        List[Record]
+            One row per player, following the `SingleMatch` model.
+        """
+        query: str = (
+            f"SELECT {', '.join(MATCH_COLUMNS)} FROM matches "
+            "WHERE season = ? AND game_day = ?"
+        )
+        parameters: List[Any] = [season, game_day]
+        if team is not None:
+            query += " AND (home_team = ? OR guest_team = ?)"
+            parameters += [team, team]
+        return await self.__read(query + " ORDER BY name", tuple(parameters))
+
+    async def summary_stats(self, player_link: PlayerLink) -> Union[Record, None]:
+        """Gets the stored summary stats of a player.
+
+        Parameters
+        ----------
+        player_link : PlayerLink
+            The player to get the stats of.
+
+        Returns:
+        -------
+        Union[Record, None]
+            Data following the model of the player's role, `None` if never stored.
+        """
+        rows: List[Record] = await self.__read(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM summary_stats "
+            "WHERE season = ? AND link = ?",
+            (season_of(player_link.link), player_link.link),
+        )
+        if not rows:
+            return None
+        return self.__summary_record(rows[0])
+
+    async def season_summary_stats(self, season: str) -> Dict[str, Record]:
+        """Gets the stored summary stats of every player of a season.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+
+        Returns:
+        -------
+        Dict[str, Record]
+            Data following the model of each player's role, keyed by the link of
+            the player and sorted by name.
+        """
+        rows: List[Record] = await self.__read(
+            f"SELECT link, {', '.join(SUMMARY_COLUMNS)} FROM summary_stats "
+            "WHERE season = ? ORDER BY name",
+            (season,),
+        )
+        return {str(row["link"]): self.__summary_record(row) for row in rows}
+
+    async def summary_stats_version(self, season: str) -> int:
+        """Gets how many times summary stats of a season were stored, by any process.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+
+        Returns:
+        -------
+        int
+            Version of the summary stats of the season, increasing on every write.
+        """
+        return await self.__version("summary_stats", season)
+
+    async def matches_version(self, season: str) -> int:
+        """Gets how many times match stats of a season were stored, by any process.
+
+        Parameters
+        ----------
+        season : str
+            Season, e.g. "2024-25".
+
+        Returns:
+        -------
+        int
+            Version of the match stats of the season, increasing on every write.
+        """
+        return await self.__version("matches", season)
+
+    async def stats(self) -> Dict[str, Union[int, str]]:
+        """Report statistics about the store.
+
+        Rows are counted in a worker thread, like every other query.
+
+        Returns:
+        -------
+        Dict[str, Union[int, str]]
+            Path of the database, stored rows and counters.
+        """
+
+        def count() -> Dict[str, int]:
+            with self.__lock:
+                return {
+                    table: self.__connection.execute(
+                        f"SELECT COUNT(*) FROM {table}"
+                    ).fetchone()[0]
+                    for table in ("players", "matches", "summary_stats")
+                }
+
+        counts: Dict[str, int] = await asyncio.to_thread(count)
+        stats: Dict[str, Union[int, str]] = {"path": str(self.path)}
+        stats.update(counts)
+        stats.update(self.__counters)
+
+        return stats
+
+    async def __version(self, table: str, season: str) -> int:
+        """Gets the version of the rows of a season in a table, 0 if never stored."""
+
+        def version() -> int:
+            with self.__lock:
+                row = self.__connection.execute(
+                    "SELECT version FROM versions WHERE season = ? AND tbl = ?",
+                    (season, table),
+                ).fetchone()
+            return int(row[0]) if row else 0
+
+        return await asyncio.to_thread(version)
+
+    @staticmethod
+    def __summary_record(row: Record) -> Record:
+        """Keeps the columns of a summary stats row belonging to the player's role."""
+        return {name: row[name] for name in SUMMARY_FIELDS[str(row["player_type"])]}
+
+    @staticmethod
+    def __insert(table: str, columns: Dict[str, str]) -> str:
+        """Builds the statement upserting a row of a table."""
+        names: List[str] = ["season", "link", *columns]
+        return (
+            f"INSERT OR REPLACE INTO {table} ({', '.join(names)}) "
+            f"VALUES ({', '.join('?' for _ in names)})"
+        )
+
+    async def __write(self, *statements: Statement) -> None:
+        """Runs statements, each over many rows, in a single transaction."""
+
+        def write() -> None:
+            with self.__lock, self.__connection:
+                for statement, rows in statements:
+                    self.__connection.executemany(statement, rows)
+            self.__counters["writes"] += 1
+
+        await asyncio.to_thread(write)
+
+    async def __read(self, query: str, parameters: Iterable[Any]) -> List[Record]:
+        """Runs a query and gets its rows as dictionaries."""
+
+        def read() -> List[Record]:
+            with self.__lock:
+                rows = self.__connection.execute(query, tuple(parameters)).fetchall()
+            self.__counters["reads"] += 1
+            if rows:
+                self.__counters["hits"] += 1
+            return [dict(row) for row in rows]
+
+        return await asyncio.to_thread(read)
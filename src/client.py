@@ -1,74 +1,186 @@
 """Client module."""
 
+import argparse
+import asyncio
 import json
 import time
+from http import HTTPStatus
 from pathlib import Path
-from random import randint
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Set, Tuple, Union
 
-import pandas as pd
-import requests
-from pandas import DataFrame
-from requests import Response
+import aiohttp
 from tqdm import tqdm
 
-from src.api.models import PlayerLink
+from src.analytics.season_matrix import SeasonMatrix, season_matrix_path
+from src.harvest.constants import (
+    ExportFormats,
+    HarvestDatasets,
+    HarvestStages,
+    JournalStatuses,
+    SinkConstants,
+)
+from src.harvest.export import DatasetExporter
+from src.harvest.journal import HarvestJournal, changed_game_day_rows
 
-# FIXME: the functions to connect to three endpoints are basically the same except for
-# the endpoint url. Make a single function that can accept different urls or a general
-# class where the classes that inherit it pass a different url.
+# FIXME: find a way to put player_name in the endpoints' urls
 
-# FIXME: what stated in the previous fixme applies as well in the client code, for
-# example when fectching mathces_data and players_summary_data. A common function can
-# probably be defined.
+# FIXME: change jsons type hints to pydantics correspective response models
 
-# FIXME: when an error occurs, only an empty dictionary - not even containing the name
-# of the player - is returned is retruned. a Dictionary following the pydantic model
-# structur, but containing information about the error should be returned instead.
+JsonData = Dict[str, Any]
+JsonPayload = Union[JsonData, List[JsonData]]
 
-# FIXME: find a way to put player_name in the endpoints' urls
 
-# FIXME: change jsons type hints to pydantics correspective response models
+class ClientConstants:
+    """Class containing default settings of the client."""
+
+    api_url: str = "http://127.0.0.1:8000"
+    year: str = "2024-25"
+    concurrency: int = 8
+    timeout: float = 60.0
+    data_folder: str = "data"
+    parquet_folder: str = "parquet"
+    matrix_folder: str = "matrix"
+
+
+class ApiEndpoints:
+    """Class containing the paths of the API endpoints used by the client."""
+
+    players_links: str = "/v1/players-links/{year}"
+    matches_stats: str = "/v1/matches-stats"
+    outfield_player_summary_stats: str = "/v1/player-summary-stats/outfield"
+    goalkeeper_summary_stats: str = "/v1/player-summary-stats/goalkeper"
+    player_summary_stats_batch: str = "/v1/player-summary-stats/batch"
+
+
+class ApiError(Exception):
+    """Exception raised when a request to the API fails.
+
+    Attributes:
+    ----------
+    status : Union[int, None]
+        HTTP status of the response, `None` if no response was received.
+    """
+
+    def __init__(self, message: str, status: Union[int, None] = None):  # noqa: D107
+        super().__init__(message)
+        self.status: Union[int, None] = status
+
+
+async def request_json(
+    session: aiohttp.ClientSession,
+    method: str,
+    path: str,
+    payload: Union[JsonPayload, None] = None,
+) -> JsonData:
+    """Sends a request to the API and decodes its JSON response.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
+    method : str
+        HTTP method, e.g. "GET".
+    path : str
+        Path of the endpoint, relative to the session base URL.
+    payload : Union[JsonPayload, None]
+        JSON body of the request, if any.
+
+    Returns:
+    -------
+    JsonData
+        Decoded JSON response.
+    """
+    data, _ = await request_json_if_changed(session, method, path, payload=payload)
+    assert data is not None
+
+    return data
+
+
+async def request_json_if_changed(
+    session: aiohttp.ClientSession,
+    method: str,
+    path: str,
+    payload: Union[JsonPayload, None] = None,
+    etag: Union[str, None] = None,
+) -> Tuple[Union[JsonData, None], Union[str, None]]:
+    """Sends a conditional request to the API and decodes its JSON response.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
+    method : str
+        HTTP method, e.g. "GET".
+    path : str
+        Path of the endpoint, relative to the session base URL.
+    payload : Union[JsonPayload, None]
+        JSON body of the request, if any.
+    etag : Union[str, None]
+        `ETag` of the data already known, sent as `If-None-Match`.
+
+    Returns:
+    -------
+    Tuple[Union[JsonData, None], Union[str, None]]
+        Decoded JSON response, `None` if unchanged since `etag`, and its `ETag`.
+    """
+    headers: Dict[str, str] = {"If-None-Match": etag} if etag else {}
+    try:
+        async with session.request(
+            method, path, json=payload, headers=headers
+        ) as response:
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                return None, etag
+            if response.status >= HTTPStatus.BAD_REQUEST:
+                detail: str = await response.text()
+                raise ApiError(
+                    f"{method} {path} failed with status {response.status}: {detail}",
+                    status=response.status,
+                )
+            data: JsonData = await response.json()
+            new_etag: Union[str, None] = response.headers.get("ETag")
+    except aiohttp.ClientError as e:
+        raise ApiError(f"{method} {path} failed: {e}") from e
+    except asyncio.TimeoutError as te:
+        raise ApiError(f"{method} {path} timed out.") from te
+    assert isinstance(data, Dict)
 
+    return data, new_etag
 
-def get_players_links(year: str) -> Union[Dict[str, List[Dict[str, str]]], None]:
+
+async def get_players_links(
+    session: aiohttp.ClientSession, year: str
+) -> List[Dict[str, str]]:
     """Gets players' names and links.
 
     Parameters
     ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
     year : str
         The year for which player links are to be fetched, e.g., "2023-24", "2022-23".
 
     Returns:
     -------
-    Union[Dict[str, List[Dict[str, str]]], None]
-        A dictionary with a key "data" containing a list of players' names and links.
-
-        Otherwise, None.
+    List[Dict[str, str]]
+        Players' names and links.
     """
-    url = f"http://127.0.0.1:8000/v1/players-links/{year}"
-    try:
-        response: Response = requests.get(
-            url,
-            timeout=15,
-            proxies={"http": "", "https": ""},
-        )
-        response.raise_for_status()
-        data: Dict[str, List[Dict[str, str]]] = response.json()
-        assert isinstance(data, Dict)
-        return data
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred: {e}")
-        return None
+    data: JsonData = await request_json(
+        session, "GET", ApiEndpoints.players_links.format(year=year)
+    )
+    players_links: List[Dict[str, str]] = data["data"]
 
+    return players_links
 
-def get_matches_stats(
-    player_link: Dict[str, str],
-) -> Dict[str, List[Union[int, float, str, None]]]:
+
+async def get_matches_stats(
+    session: aiohttp.ClientSession, player_link: Dict[str, str]
+) -> JsonData:
     """Get's information about a player performance in a match.
 
     Parameters
     ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
     player_link : Dict[str, str]
         Dictionary following the structure:
         - name: str
@@ -78,33 +190,48 @@ def get_matches_stats(
 
     Returns:
     -------
-    Dict[str, List[Union[int, float, str, None]]]
+    JsonData
         Information about a player performance in a match.
     """
-    url = "http://127.0.0.1:8000/v1/matches-stats"
-    try:
-        response: Response = requests.post(
-            url,
-            json=player_link,  # .json(),
-            timeout=15,
-            proxies={"http": "", "https": ""},
-        )
-        response.raise_for_status()
-        data: Dict[str, List[Union[int, float, str, None]]] = response.json()
-        assert isinstance(data, Dict)
-        return data
-    except requests.exceptions.HTTPError as e:
-        print(f"An error occurred: {e}")
-        print(f"Response content: {response.content.decode()}")
-        return {}
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred: {e}")
-        return {}
-
-
-def get_outfield_player_summary_stats(
+    return await request_json(
+        session, "POST", ApiEndpoints.matches_stats, payload=player_link
+    )
+
+
+async def get_matches_stats_if_changed(
+    session: aiohttp.ClientSession,
     player_link: Dict[str, str],
-) -> Dict[str, List[Union[int, float, str, None]]]:
+    etag: Union[str, None] = None,
+) -> Tuple[Union[JsonData, None], Union[str, None]]:
+    """Get's information about a player performance in a match, if it changed.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
+    player_link : Dict[str, str]
+        Dictionary following the structure:
+        - name: str
+        - link: str
+    etag : Union[str, None]
+        `ETag` of the match stats already known, if any.
+
+    player_link can be obtained from the `get_players_links` endpoint.
+
+    Returns:
+    -------
+    Tuple[Union[JsonData, None], Union[str, None]]
+        Information about a player performance in a match, `None` if unchanged
+        since `etag`, and its `ETag`.
+    """
+    return await request_json_if_changed(
+        session, "POST", ApiEndpoints.matches_stats, payload=player_link, etag=etag
+    )
+
+
+async def get_outfield_player_summary_stats(
+    session: aiohttp.ClientSession, player_link: Dict[str, str]
+) -> JsonData:
     """Get's information about an outfield player summary stats in a season.
 
     Outfield players are:
@@ -112,8 +239,13 @@ def get_outfield_player_summary_stats(
     - midfilders
     - defenders
 
+    The API answers with a 400 error, raised as an `ApiError`, if the player is a
+    goalkeeper.
+
     Parameters
     ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
     player_link : Dict[str, str]
         Dictionary following the structure:
         - name: str
@@ -123,37 +255,23 @@ def get_outfield_player_summary_stats(
 
     Returns:
     -------
-    Dict[str, List[Union[int, float, str, None]]]
+    JsonData
         Information about an outfield player summary stats in a season.
     """
-    url = "http://127.0.0.1:8000/v1/player-summary-stats/outfield"
-    try:
-        response: Response = requests.post(
-            url,
-            json=player_link,
-            timeout=15,
-            proxies={"http": "", "https": ""},
-        )
-        response.raise_for_status()
-        data: Dict[str, List[Union[int, float, str, None]]] = response.json()
-        assert isinstance(data, Dict)
-        return data
-    except requests.exceptions.HTTPError as e:
-        print(f"An error occurred: {e}")
-        print(f"Response content: {response.content.decode()}")
-        return {}
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred: {e}")
-        return {}
-
-
-def get_goalkeeper_summary_stats(
-    player_link: Dict[str, str],
-) -> Dict[str, List[Union[int, float, str, None]]]:
+    return await request_json(
+        session, "POST", ApiEndpoints.outfield_player_summary_stats, payload=player_link
+    )
+
+
+async def get_goalkeeper_summary_stats(
+    session: aiohttp.ClientSession, player_link: Dict[str, str]
+) -> JsonData:
     """Get's information about a goalkeeper summary stats in a season.
 
     Parameters
     ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
     player_link : Dict[str, str]
         Dictionary following the structure:
         - name: str
@@ -163,196 +281,495 @@ def get_goalkeeper_summary_stats(
 
     Returns:
     -------
-    Dict[str, List[Union[int, float, str, None]]]
+    JsonData
         Information about a goalkeeper summary stats in a season.
     """
-    url = "http://127.0.0.1:8000/v1/player-summary-stats/goalkeper"
-    try:
-        response: Response = requests.post(
-            url,
-            json=player_link,
-            timeout=15,
-            proxies={"http": "", "https": ""},
-        )
-        response.raise_for_status()
-        data: Dict[str, List[Union[int, float, str, None]]] = response.json()
-        assert isinstance(data, Dict)
-        return data
-    except requests.exceptions.HTTPError as e:
-        print(f"An error occurred: {e}")
-        print(f"Response content: {response.content.decode()}")
-        return {}
-    except requests.exceptions.RequestException as e:
-        print(f"An error occurred: {e}")
-        return {}
-
-
-def random_sleep() -> None:
-    """Sets a random sleep up to a maximum of 3 seconds."""
-    sleepy_number = randint(0, 10)
-    if sleepy_number in [3, 5, 7]:
-        time.sleep(randint(0, 300) / 100)
+    return await request_json(
+        session, "POST", ApiEndpoints.goalkeeper_summary_stats, payload=player_link
+    )
 
 
-if __name__ == "__main__":
-    # TODO: some code to startup and close the api
-    # TODO: add the possibility to expose a different port
-    # TODO: check if some type hints can be substituted by PlayerLink
+async def get_player_summary_stats(
+    session: aiohttp.ClientSession, player_link: Dict[str, str]
+) -> JsonData:
+    """Get's information about a player summary stats in a season, whatever its role.
+
+    The role-aware batch endpoint is asked for the single player, so that
+    goalkeepers are answered without first trying the outfield endpoint.
+
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
+    player_link : Dict[str, str]
+        Dictionary following the structure:
+        - name: str
+        - link: str
 
-    data_folder_path: Path = Path("data")
-    if not data_folder_path.exists():
-        data_folder_path.mkdir(parents=True, exist_ok=True)
+    player_link can be obtained from the `get_players_links` endpoint.
 
-    # Get players's links
-    YEAR = "2024-25"
-    players_links_json: Path = Path(f"data/players_links_{YEAR}.json")
+    Returns:
+    -------
+    JsonData
+        Information about the player summary stats in a season, under `data`, told
+        apart by its `player_type`.
+    """
+    response: JsonData = await request_json(
+        session,
+        "POST",
+        ApiEndpoints.player_summary_stats_batch,
+        payload=[player_link],
+    )
+    item: JsonData = response["data"][0]
+    if item.get("error") is not None:
+        raise ApiError(item["error"]["detail"], status=item["error"]["status_code"])
 
-    if not players_links_json.is_file():
-        data: Union[Dict[str, List[Dict[str, str]]], None] = get_players_links(
-            year=YEAR
+    return {"data": item["data"]}
+
+
+class Throughput:
+    """Live aggregate throughput of the harvest, shown on a single progress bar.
+
+    Every player counts twice: once for its match stats and once for its summary
+    stats, whatever its role. On refresh, summary stats count only for the players
+    whose match stats changed.
+    """
+
+    def __init__(self, total: int):  # noqa: D107
+        self.__started_at: float = time.monotonic()
+        self.__requests: int = 0
+        self.__done: Dict[str, int] = {
+            HarvestStages.matches: 0,
+            HarvestStages.summary: 0,
+        }
+        self.__unchanged: int = 0
+        self.__failed: int = 0
+        self.__total: int = total
+        self.__pbar = tqdm(total=total, desc="Harvesting", unit="item")
+
+    def request_sent(self) -> None:
+        """Counts a request sent to the API."""
+        self.__requests += 1
+
+    def done(self, stage: str) -> None:
+        """Counts an item completed by a stage."""
+        self.__done[stage] += 1
+        self.__refresh(advance=1)
+
+    def failed(self, stage: str, player_name: str, error: Exception) -> None:
+        """Counts an item that failed, reporting why."""
+        self.__failed += 1
+        tqdm.write(f"[{stage}] {player_name}: {error}")
+        self.__refresh(advance=1)
+
+    def unchanged(self) -> None:
+        """Counts an item found unchanged since the previous harvest."""
+        self.__unchanged += 1
+        self.__refresh(advance=1)
+
+    def expand(self, items: int) -> None:
+        """Adds items to be harvested, discovered while harvesting."""
+        self.__total += items
+        self.__pbar.total = self.__total
+        self.__refresh(advance=0)
+
+    def close(self) -> None:
+        """Closes the progress bar."""
+        self.__pbar.close()
+
+    def __refresh(self, advance: int) -> None:
+        """Updates the progress bar with the aggregate counters."""
+        elapsed: float = max(time.monotonic() - self.__started_at, 1e-9)
+        self.__pbar.set_postfix(
+            {
+                **self.__done,
+                "unchanged": self.__unchanged,
+                "failed": self.__failed,
+                "req/s": f"{self.__requests / elapsed:.1f}",
+            },
+            refresh=False,
         )
-        if data:
-            with players_links_json.open(mode="w", encoding="utf-8") as file:
-                json.dump(data, file, indent=4)
-        else:
-            print("Failed to retrieve data.")
-
-    with players_links_json.open(mode="r", encoding="utf-8") as file:
-        players_links = json.load(file)
-
-    # Get matches stats
-    matches_data_json = Path(f"data/matches_data_{YEAR}.json")
-    if not matches_data_json.is_file():
-        data_list: List[Dict[str, List[Union[int, float, str, None]]]] = []
-        with tqdm(
-            total=len(players_links.get("data")),
-            desc="Scraping players mathces information",
-            unit="player",
-        ) as pbar:
-            for player_link in players_links.get("data"):
-                player_name: str = player_link.get("name")
-                assert isinstance(player_name, str)
-                pbar.set_description(f"Scraping {player_name}")
-
-                match_data: Dict[str, List[Union[int, float, str, None]]] = (
-                    get_matches_stats(player_link=player_link)
-                )
-                assert isinstance(match_data, Dict)
-                data_list.append(match_data)
+        self.__pbar.update(advance)
+
 
-                random_sleep()
-                pbar.update(1)
+class HarvestPipeline:
+    """Matches and summary stages of the harvest, run as a pipeline.
 
-        matches_data: Dict[str, List[Dict[str, List[Union[int, float, str, None]]]]] = {
-            "data": data_list
+    Each stage has its own queue of players and runs its workers on the same
+    session. On refresh, the matches stage queues for the summary stage the
+    players whose match stats changed.
+
+    Attributes:
+    ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
+    journal : HarvestJournal
+        Journal the outcomes are recorded to.
+    throughput : Throughput
+        Progress of the harvest.
+    refresh : bool
+        Whether the match stats are requested again with their `ETag`.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        session: aiohttp.ClientSession,
+        journal: HarvestJournal,
+        throughput: Throughput,
+        refresh: bool = False,
+    ):
+        self.session: aiohttp.ClientSession = session
+        self.journal: HarvestJournal = journal
+        self.throughput: Throughput = throughput
+        self.refresh: bool = refresh
+        self.__queues: Dict[str, "asyncio.Queue[Union[Dict[str, str], None]]"] = {
+            HarvestStages.matches: asyncio.Queue(),
+            HarvestStages.summary: asyncio.Queue(),
         }
+        self.__queued_summaries: Set[str] = set()
+
+    def queue(self, stage: str, players_links: List[Dict[str, str]]) -> None:
+        """Queues players for a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        players_links : List[Dict[str, str]]
+            Players' names and links.
+        """
+        for player_link in players_links:
+            if stage == HarvestStages.summary:
+                self.__queued_summaries.add(player_link["link"])
+            self.__queues[stage].put_nowait(player_link)
+
+    async def run(self, concurrency: int) -> None:
+        """Runs the workers of both stages until every queued player is done.
+
+        Parameters
+        ----------
+        concurrency : int
+            Workers of each stage.
+        """
+
+        async def matches_stage() -> None:
+            await asyncio.gather(*(self.__matches_worker() for _ in range(concurrency)))
+            for _ in range(concurrency):
+                self.__queues[HarvestStages.summary].put_nowait(None)
+
+        for _ in range(concurrency):
+            self.__queues[HarvestStages.matches].put_nowait(None)
+        await asyncio.gather(
+            matches_stage(), *(self.__summary_worker() for _ in range(concurrency))
+        )
 
-        with matches_data_json.open(mode="w", encoding="utf-8") as file:
-            json.dump(matches_data, file, indent=4)
+    def __failed(
+        self, stage: str, player_link: Dict[str, str], error: ApiError
+    ) -> None:
+        """Records a player that failed in a stage."""
+        self.journal.record_failure(stage, player_link, str(error))
+        self.throughput.failed(stage, player_link["name"], error)
+
+    def __matches_changed(
+        self, player_link: Dict[str, str], data: JsonData, etag: Union[str, None]
+    ) -> None:
+        """Records new match stats, queueing the summary stats of changed players."""
+        previous: Union[JsonData, None] = (
+            self.journal.data(HarvestStages.matches, player_link)
+            if self.refresh
+            else None
+        )
+        if previous is None:
+            self.journal.record(
+                HarvestStages.matches,
+                player_link,
+                JournalStatuses.completed,
+                data=data,
+                etag=etag,
+            )
+        else:
+            self.journal.record(
+                HarvestStages.matches,
+                player_link,
+                JournalStatuses.updated,
+                data={"data": changed_game_day_rows(previous["data"], data["data"])},
+                etag=etag,
+            )
+        self.throughput.done(HarvestStages.matches)
+        if previous is None or player_link["link"] in self.__queued_summaries:
+            return
+        self.throughput.expand(1)
+        self.queue(HarvestStages.summary, [player_link])
+
+    def __matches_unchanged(
+        self, player_link: Dict[str, str], etag: Union[str, None]
+    ) -> None:
+        """Records match stats unchanged since the previous harvest."""
+        if (
+            self.journal.status(HarvestStages.matches, player_link)
+            != JournalStatuses.completed
+        ):
+            self.journal.record(
+                HarvestStages.matches,
+                player_link,
+                JournalStatuses.updated,
+                data={"data": []},
+                etag=etag,
+            )
+        self.throughput.unchanged()
+
+    async def __matches_worker(self) -> None:
+        """Harvests the match stats of the queued players."""
+        queue = self.__queues[HarvestStages.matches]
+        while (player_link := await queue.get()) is not None:
+            self.throughput.request_sent()
+            etag: Union[str, None] = (
+                self.journal.etag(HarvestStages.matches, player_link)
+                if self.refresh
+                else None
+            )
+            try:
+                data, new_etag = await get_matches_stats_if_changed(
+                    self.session, player_link, etag=etag
+                )
+            except ApiError as e:
+                self.__failed(HarvestStages.matches, player_link, e)
+                continue
+            if data is None:
+                self.__matches_unchanged(player_link, etag)
+            else:
+                self.__matches_changed(player_link, data, new_etag)
+
+    async def __summary_worker(self) -> None:
+        """Harvests the summary stats of the queued players, whatever their role."""
+        queue = self.__queues[HarvestStages.summary]
+        while (player_link := await queue.get()) is not None:
+            self.throughput.request_sent()
+            try:
+                data: JsonData = await get_player_summary_stats(
+                    self.session, player_link
+                )
+            except ApiError as e:
+                self.__failed(HarvestStages.summary, player_link, e)
+                continue
+            self.journal.record(
+                HarvestStages.summary, player_link, JournalStatuses.completed, data=data
+            )
+            self.throughput.done(HarvestStages.summary)
+
+
+async def harvest(
+    session: aiohttp.ClientSession,
+    players_links: List[Dict[str, str]],
+    journal: HarvestJournal,
+    concurrency: int = ClientConstants.concurrency,
+    refresh: bool = False,
+) -> None:
+    """Harvests the match stats and the summary stats of all the players.
+
+    The two stages run as a pipeline: every player is queued for both the matches
+    and the summary stages. Summary stats are requested once per player from the
+    role-aware batch endpoint, which reads the role from the page it parses, so
+    goalkeepers cost no extra request. Each stage runs `concurrency` workers
+    sharing the same connection pool, so requests are sent back to back and
+    throttled only by the API rate limiter.
+
+    The outcome of every player is checkpointed to the journal as soon as it is
+    known, and players already completed according to the journal are skipped.
+
+    On refresh, the match stats of every player are requested again with the
+    `ETag` recorded by the journal, and the API answers with an empty 304 response
+    for the players that did not change. Only the new or changed game-day rows of
+    the others are recorded, and only their summary stats are harvested again.
 
-    # Get outfield players summary stats
-    outfield_players_summary_data_json = Path(
-        f"data/outfiled_players_summary_stats_data_{YEAR}.json"
+    Parameters
+    ----------
+    session : aiohttp.ClientSession
+        Session shared by all the requests to the API.
+    players_links : List[Dict[str, str]]
+        Players' names and links.
+    journal : HarvestJournal
+        Journal the outcomes are recorded to.
+    concurrency : int
+        Workers of each stage.
+    refresh : bool
+        Whether to refresh the players already completed according to the journal.
+    """
+    pending_matches: List[Dict[str, str]] = (
+        list(players_links)
+        if refresh
+        else journal.pending(HarvestStages.matches, players_links)
     )
-    if not outfield_players_summary_data_json.is_file():
-        data_list = []
-        goalkeepers_links: List[PlayerLink] = []
-        with tqdm(
-            total=len(players_links.get("data")),
-            desc="Scraping outfield players summary stats information",
-            unit="player",
-        ) as pbar:
-            for player_link in players_links.get("data"):
-                player_name = player_link.get("name")
-                assert isinstance(player_name, str)
-                pbar.set_description(f"Scraping {player_name}")
-
-                player_summary_data: Dict[str, List[Union[int, float, str, None]]] = (
-                    get_outfield_player_summary_stats(player_link=player_link)
-                )
-                assert isinstance(player_summary_data, Dict)
+    pending_summaries: List[Dict[str, str]] = journal.pending(
+        HarvestStages.summary, players_links
+    )
+    throughput = Throughput(total=len(pending_matches) + len(pending_summaries))
+    pipeline = HarvestPipeline(session, journal, throughput, refresh=refresh)
+    pipeline.queue(HarvestStages.matches, pending_matches)
+    pipeline.queue(HarvestStages.summary, pending_summaries)
+    try:
+        await pipeline.run(concurrency)
+    finally:
+        throughput.close()
 
-                if not player_summary_data:
-                    if player_link is not None:
-                        goalkeepers_links.append(player_link)
-                        print(f"{player_name} added to goalkeepers list.")
-                else:
-                    data_list.append(player_summary_data)
 
-                random_sleep()
-                pbar.update(1)
+def write_json(path: Path, data: Any) -> None:
+    """Writes data to a JSON file.
 
-        players_summary_data: Dict[
-            str, List[Dict[str, List[Union[int, float, str, None]]]]
-        ] = {"data": data_list}
+    Parameters
+    ----------
+    path : Path
+        Path of the file.
+    data : Any
+        Data to write.
+    """
+    with path.open(mode="w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4)
 
-        with outfield_players_summary_data_json.open(
-            mode="w", encoding="utf-8"
-        ) as file:
-            json.dump(players_summary_data, file, indent=4)
 
-        goalkeepers_links_json: Dict[str, List[PlayerLink]] = {
-            "data": goalkeepers_links
-        }
-        goalkeepers_list_path = Path(f"data/goalkeepers_list_{YEAR}.json")
-        with goalkeepers_list_path.open(mode="w", encoding="utf-8") as file:
-            json.dump(goalkeepers_links_json, file, indent=4)
+def parse_args() -> argparse.Namespace:
+    """Parses the command line arguments of the client.
 
-    # Get goalkeepers players summary stats
-    goalkeepers_summary_data_json = Path(
-        f"data/goalkeepers_summary_stats_data_{YEAR}.json"
+    Returns:
+    -------
+    argparse.Namespace
+        Command line arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description="Harvest the stats of all the players of a season."
+    )
+    parser.add_argument("--year", default=ClientConstants.year, help="e.g. 2023-24")
+    parser.add_argument("--api-url", default=ClientConstants.api_url)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=ClientConstants.concurrency,
+        help="Workers of each stage of the harvest.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=ClientConstants.timeout,
+        help="Seconds allowed for a single request to the API.",
+    )
+    parser.add_argument("--data-folder", default=ClientConstants.data_folder)
+    parser.add_argument(
+        "--export",
+        nargs="*",
+        default=[],
+        choices=[ExportFormats.ndjson, ExportFormats.csv, ExportFormats.excel],
+        help="Formats derived from the Parquet datasets, none by default.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=SinkConstants.batch_size,
+        help="Rows buffered by each output file before being written.",
     )
-    if not goalkeepers_summary_data_json.is_file():
-        with goalkeepers_list_path.open(mode="r", encoding="utf-8") as file:
-            goalkeepers_links_json = json.load(file)
-        goalkeepers_links = goalkeepers_links_json.get("data")  # type: ignore
-        data_list = []
-        with tqdm(
-            total=len(goalkeepers_links),
-            desc="Scraping goalkeepers summary stats information",
-            unit="player",
-        ) as pbar:
-            for player_link in goalkeepers_links:
-                player_name = player_link.get("name")
-                assert isinstance(player_name, str)
-                pbar.set_description(f"Scraping {player_name}")
-
-                player_summary_data = get_goalkeeper_summary_stats(
-                    player_link=player_link
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Harvest only the players that failed or are missing in the journal.",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Harvest again only the players whose match stats changed since the "
+        "journal was last written, e.g. after a game day.",
+    )
+
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace) -> None:
+    """Harvests a season and writes its data to the data folder.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Command line arguments.
+    """
+    # TODO: some code to startup and close the api
+
+    year: str = args.year
+    data_folder_path: Path = Path(args.data_folder)
+    data_folder_path.mkdir(parents=True, exist_ok=True)
+    players_links_json: Path = data_folder_path / f"players_links_{year}.json"
+    goalkeepers_list_path: Path = data_folder_path / f"goalkeepers_list_{year}.json"
+    parquet_folder_path: Path = data_folder_path / ClientConstants.parquet_folder
+    matrix_folder_path: Path = data_folder_path / ClientConstants.matrix_folder
+    derived_paths: Dict[str, Path] = {
+        HarvestDatasets.matches: data_folder_path / f"matches_data_{year}",
+        HarvestDatasets.outfield: (
+            data_folder_path / f"outfiled_players_summary_stats_data_{year}"
+        ),
+        HarvestDatasets.goalkeepers: (
+            data_folder_path / f"goalkeepers_summary_stats_data_{year}"
+        ),
+    }
+    journal_folder_path: Path = data_folder_path / f"harvest_{year}"
+
+    connector = aiohttp.TCPConnector(limit=3 * args.concurrency)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(
+        base_url=args.api_url, connector=connector, timeout=timeout
+    ) as session:
+        # Get players's links
+        if not players_links_json.is_file():
+            write_json(
+                players_links_json,
+                {"data": await get_players_links(session=session, year=year)},
+            )
+        with players_links_json.open(mode="r", encoding="utf-8") as file:
+            players_links: List[Dict[str, str]] = json.load(file)["data"]
+
+        # Get matches stats and summary stats
+        with HarvestJournal(
+            journal_folder_path, resume=args.resume or args.refresh
+        ) as journal:
+            try:
+                await harvest(
+                    session=session,
+                    players_links=players_links,
+                    journal=journal,
+                    concurrency=args.concurrency,
+                    refresh=args.refresh,
                 )
-                assert isinstance(player_summary_data, Dict)
-                data_list.append(player_summary_data)
-
-                random_sleep()
-                pbar.update(1)
-
-        players_summary_data = {"data": data_list}
-
-        with goalkeepers_summary_data_json.open(mode="w", encoding="utf-8") as file:
-            json.dump(players_summary_data, file, indent=4)
-
-    # Export json files as Excel files
-    json_files: List[Path] = [
-        matches_data_json,
-        outfield_players_summary_data_json,
-        goalkeepers_summary_data_json,
-    ]
-    for file_path in json_files:
-        if file_path == matches_data_json:
-            with open(file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            open_json: List[Any] = []
-            for entry in data["data"]:  # type: ignore
-                if "data" in entry:
-                    open_json.extend(entry["data"])
-        else:
-            with open(file_path, "r", encoding="utf-8") as file:
-                data = json.load(file)
-            open_json: List[Any] = [  # type: ignore
-                entry["data"]
-                for entry in data["data"]  # type: ignore
-                if "data" in entry
-            ]
-        df: DataFrame = pd.DataFrame(open_json)
-        output_file: Path = file_path.with_suffix(".xlsx")
-        df.to_excel(output_file, index=False)
+            finally:
+                manifest: JsonData = journal.write_manifest(players_links)
+            print(f"Harvest manifest: {json.dumps(manifest['counts'])}")
+
+            write_json(
+                goalkeepers_list_path,
+                {"data": journal.goalkeepers_links(players_links)},
+            )
+
+            # Stream the datasets to Parquet and to the derived formats asked for
+            exporter = DatasetExporter(
+                parquet_root=parquet_folder_path,
+                formats=args.export,
+                batch_size=args.batch_size,
+            )
+            for dataset, derived_path in derived_paths.items():
+                exporter.export(
+                    entries=journal.completed(
+                        HarvestStages.matches
+                        if dataset == HarvestDatasets.matches
+                        else HarvestStages.summary
+                    ),
+                    dataset=dataset,
+                    season=year,
+                    derived_path=derived_path,
+                )
+
+            # Write the dense players x game days matrices of the match stats
+            SeasonMatrix.from_players(
+                (player_link, data["data"])
+                for player_link in players_links
+                if (data := journal.data(HarvestStages.matches, player_link))
+                is not None
+            ).save(season_matrix_path(matrix_folder_path, year))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
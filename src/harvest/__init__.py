@@ -0,0 +1 @@
+"""Main harvest init module."""
@@ -0,0 +1,39 @@
+"""Module for the constants of the client harvest."""
+
+
+class HarvestStages:
+    """Class containing the names of the stages of the harvest."""
+
+    matches: str = "matches"
+    summary: str = "summary"
+
+
+class HarvestDatasets:
+    """Class containing the names of the datasets exported from the harvest."""
+
+    matches: str = "matches"
+    outfield: str = "outfield"
+    goalkeepers: str = "goalkeepers"
+
+
+class JournalStatuses:
+    """Class containing the outcomes of a player in a stage of the harvest."""
+
+    completed: str = "completed"
+    updated: str = "updated"
+    failed: str = "failed"
+
+
+class ExportFormats:
+    """Class containing the formats the harvested datasets can be exported to."""
+
+    parquet: str = "parquet"
+    ndjson: str = "ndjson"
+    csv: str = "csv"
+    excel: str = "excel"
+
+
+class SinkConstants:
+    """Class containing default settings of the sinks records are streamed to."""
+
+    batch_size: int = 4096
@@ -0,0 +1,184 @@
+"""Module to export the harvested datasets as typed, columnar Parquet files."""
+
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Type, Union
+
+import pyarrow as pa
+from pydantic import BaseModel
+
+from src.api.models import (
+    GoalkeeperSummaryStats,
+    OutfieldPlayerSummaryStats,
+    SingleMatch,
+)
+from src.harvest.constants import ExportFormats, HarvestDatasets, SinkConstants
+from src.harvest.sinks import SUFFIXES, RecordSink, open_sink
+
+JsonData = Dict[str, Any]
+
+_ARROW_TYPES: Dict[type, pa.DataType] = {
+    int: pa.int32(),
+    float: pa.float64(),
+    str: pa.string(),
+}
+
+
+def arrow_schema(model: Type[BaseModel]) -> pa.Schema:
+    """Builds the Arrow schema mirroring a response model.
+
+    Fields are kept in the order of the model, optional fields are nullable and
+    `Literal` fields, e.g. `player_type`, are strings.
+
+    Parameters
+    ----------
+    model : Type[BaseModel]
+        Response model of a row of the dataset.
+
+    Returns:
+    -------
+    pa.Schema
+        Arrow schema of the dataset.
+    """
+    fields: List[pa.Field] = []
+    for name, field in model.__fields__.items():
+        arrow_type: pa.DataType = _ARROW_TYPES.get(field.type_, pa.string())
+        fields.append(pa.field(name, arrow_type, nullable=field.allow_none))
+
+    return pa.schema(fields)
+
+
+SCHEMAS: Dict[str, pa.Schema] = {
+    HarvestDatasets.matches: arrow_schema(SingleMatch),
+    HarvestDatasets.outfield: arrow_schema(OutfieldPlayerSummaryStats),
+    HarvestDatasets.goalkeepers: arrow_schema(GoalkeeperSummaryStats),
+}
+
+PLAYER_TYPES: Dict[str, str] = {
+    HarvestDatasets.outfield: "outfield",
+    HarvestDatasets.goalkeepers: "goalkeeper",
+}
+
+
+def dataset_rows(dataset: str, entries: Iterable[JsonData]) -> Iterable[JsonData]:
+    """Flattens the harvested data of each player into the rows of a dataset.
+
+    The outfield players and goalkeepers datasets are both read from the summary
+    stats, each keeping the players of its `player_type`.
+
+    Parameters
+    ----------
+    dataset : str
+        Name of the dataset, one of `HarvestDatasets`.
+    entries : Iterable[JsonData]
+        Harvested data of each player, as answered by the API.
+
+    Returns:
+    -------
+    Iterable[JsonData]
+        One row per game day for the match stats, one per player otherwise.
+    """
+    for entry in entries:
+        if "data" not in entry:
+            continue
+        if dataset == HarvestDatasets.matches:
+            yield from entry["data"]
+        elif entry["data"].get("player_type") == PLAYER_TYPES[dataset]:
+            yield entry["data"]
+
+
+def dataset_path(root: Union[str, Path], dataset: str, season: str) -> Path:
+    """Path of the Parquet file of a dataset of a season.
+
+    Files are partitioned Hive-style, e.g. `dataset=matches/season=2024-25/`, so
+    that `pyarrow.dataset` and `pandas.read_parquet` on `root` read the partitions
+    back as columns.
+
+    Parameters
+    ----------
+    root : Union[str, Path]
+        Root directory of the Parquet datasets.
+    dataset : str
+        Name of the dataset, one of `HarvestDatasets`.
+    season : str
+        Season, e.g. "2024-25".
+
+    Returns:
+    -------
+    Path
+        Path of the Parquet file.
+    """
+    return Path(root) / f"dataset={dataset}" / f"season={season}" / "part-0.parquet"
+
+
+class DatasetExporter:
+    """Streams the datasets of a harvest to Parquet and to the derived formats.
+
+    Rows are written one at a time to every sink, which flushes them in batches
+    of `batch_size`: memory is bounded by the batch, not by the dataset.
+
+    Attributes:
+    ----------
+    parquet_root : Path
+        Root directory of the Parquet datasets.
+    formats : List[str]
+        Derived formats to write, among `ExportFormats` other than Parquet.
+    batch_size : int
+        Number of rows buffered by each sink before being written.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        parquet_root: Union[str, Path],
+        formats: Iterable[str] = (),
+        batch_size: int = SinkConstants.batch_size,
+    ):
+        self.parquet_root: Path = Path(parquet_root)
+        self.formats: List[str] = list(dict.fromkeys(formats))
+        self.batch_size: int = batch_size
+
+    def export(
+        self,
+        entries: Iterable[JsonData],
+        dataset: str,
+        season: str,
+        derived_path: Path,
+    ) -> int:
+        """Streams a dataset of a season to Parquet and to the derived formats.
+
+        Parameters
+        ----------
+        entries : Iterable[JsonData]
+            Harvested data of each player, as answered by the API.
+        dataset : str
+            Name of the dataset, one of `HarvestDatasets`.
+        season : str
+            Season, e.g. "2024-25".
+        derived_path : Path
+            Path of the derived outputs, without suffix.
+
+        Returns:
+        -------
+        int
+            Number of rows written.
+        """
+        schema: pa.Schema = SCHEMAS[dataset]
+        paths: Dict[str, Path] = {
+            ExportFormats.parquet: dataset_path(self.parquet_root, dataset, season),
+            **{
+                export_format: Path(f"{derived_path}{SUFFIXES[export_format]}")
+                for export_format in self.formats
+            },
+        }
+        with ExitStack() as stack:
+            sinks: List[RecordSink] = [
+                stack.enter_context(
+                    open_sink(export_format, path, schema, self.batch_size)
+                )
+                for export_format, path in paths.items()
+            ]
+            for row in dataset_rows(dataset, entries):
+                for sink in sinks:
+                    sink.write(row)
+
+        return sinks[0].written
@@ -0,0 +1,446 @@
+"""Module to checkpoint the client harvest so that it can be resumed."""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, NamedTuple, Tuple, Union
+
+from src.harvest.constants import HarvestStages, JournalStatuses
+
+JsonData = Dict[str, Any]
+JournalKey = Tuple[str, str]
+
+
+class JournalEntry(NamedTuple):
+    """NamedTuple.
+
+    Outcome of a player in a stage, as recorded in the journal.
+
+    Where:
+    - [0] = stage: str
+    - [1] = name: str
+    - [2] = link: str
+    - [3] = status: str
+    - [4] = recorded_at: float
+    - [5] = data: Union[JsonData, None]
+    - [6] = error: Union[str, None]
+    - [7] = etag: Union[str, None]
+    """
+
+    stage: str
+    name: str
+    link: str
+    status: str
+    recorded_at: float
+    data: Union[JsonData, None] = None
+    error: Union[str, None] = None
+    etag: Union[str, None] = None
+
+
+def merge_game_day_rows(
+    rows: List[JsonData], new_rows: List[JsonData]
+) -> List[JsonData]:
+    """Merges game-day rows, the new ones replacing those of the same game day.
+
+    Parameters
+    ----------
+    rows : List[JsonData]
+        Rows of a player, one per game day.
+    new_rows : List[JsonData]
+        Rows to merge into them.
+
+    Returns:
+    -------
+    List[JsonData]
+        Merged rows, sorted by game day.
+    """
+    by_game_day: Dict[Any, JsonData] = {row["game_day"]: row for row in rows}
+    by_game_day.update((row["game_day"], row) for row in new_rows)
+
+    return [by_game_day[game_day] for game_day in sorted(by_game_day)]
+
+
+def changed_game_day_rows(
+    rows: List[JsonData], new_rows: List[JsonData]
+) -> List[JsonData]:
+    """Gets the game-day rows that are new or differ from the previous ones.
+
+    Parameters
+    ----------
+    rows : List[JsonData]
+        Previous rows of a player, one per game day.
+    new_rows : List[JsonData]
+        Current rows of the player.
+
+    Returns:
+    -------
+    List[JsonData]
+        Rows of `new_rows` not found, identical, in `rows`.
+    """
+    by_game_day: Dict[Any, JsonData] = {row["game_day"]: row for row in rows}
+
+    return [row for row in new_rows if by_game_day.get(row["game_day"]) != row]
+
+
+class HarvestJournal:
+    """Append-only journal of the outcome of each player in each stage.
+
+    Every outcome is appended to `journal.ndjson` and flushed as soon as it is
+    known, so an interrupted harvest loses at most the requests in flight. When
+    resuming, the journal is replayed and the last outcome of each player wins:
+    completed players are skipped, failed and missing ones are harvested again. A
+    `manifest.json` summarizes the completed, failed and pending players of each
+    stage.
+
+    A refresh appends, for each player whose match stats changed, an `updated`
+    entry carrying only the new or changed game-day rows, which are merged into
+    the previous ones when the journal is read back.
+
+    Only the status, the `ETag` and the offsets of the data entries of each player
+    are kept in memory: data is read back from the journal when needed, so memory
+    does not grow with the size of the harvest.
+
+    Attributes:
+    ----------
+    directory : Path
+        Directory of the journal and the manifest.
+    """
+
+    def __init__(self, directory: Union[str, Path], resume: bool = False):  # noqa: D107
+        self.directory: Path = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.__statuses: Dict[JournalKey, str] = {}
+        self.__etags: Dict[JournalKey, str] = {}
+        self.__offsets: Dict[JournalKey, List[int]] = {}
+        if resume:
+            for offset, entry in self.__entries():
+                self.__remember(entry, offset)
+        self.__file: IO[bytes] = self.journal_path.open(mode="ab" if resume else "wb")
+        if resume and self.__file.tell() > 0 and not self.__ends_with_newline():
+            self.__file.write(b"\n")
+        self.__reader: Union[IO[bytes], None] = None
+
+    @property
+    def journal_path(self) -> Path:
+        """Path of the journal."""
+        return self.directory / "journal.ndjson"
+
+    @property
+    def manifest_path(self) -> Path:
+        """Path of the manifest."""
+        return self.directory / "manifest.json"
+
+    def __enter__(self) -> "HarvestJournal":  # noqa: D105
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:  # noqa: D105
+        self.close()
+
+    def close(self) -> None:
+        """Closes the journal."""
+        if not self.__file.closed:
+            self.__file.close()
+        if self.__reader is not None:
+            self.__reader.close()
+            self.__reader = None
+
+    def record(
+        self,
+        stage: str,
+        player_link: Dict[str, str],
+        status: str,
+        data: Union[JsonData, None] = None,
+        etag: Union[str, None] = None,
+    ) -> None:
+        """Appends the outcome of a player in a stage to the journal.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        player_link : Dict[str, str]
+            Name and link of the player.
+        status : str
+            Outcome, one of `JournalStatuses`.
+        data : Union[JsonData, None]
+            Data harvested, if completed.
+        etag : Union[str, None]
+            `ETag` of the data, to ask the API only for changes on refresh.
+        """
+        self.__append(
+            JournalEntry(
+                stage=stage,
+                name=player_link["name"],
+                link=player_link["link"],
+                status=status,
+                recorded_at=time.time(),
+                data=data,
+                etag=etag,
+            )
+        )
+
+    def record_failure(
+        self, stage: str, player_link: Dict[str, str], error: str
+    ) -> None:
+        """Appends to the journal that a player failed in a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        player_link : Dict[str, str]
+            Name and link of the player.
+        error : str
+            Why the player failed.
+        """
+        self.__append(
+            JournalEntry(
+                stage=stage,
+                name=player_link["name"],
+                link=player_link["link"],
+                status=JournalStatuses.failed,
+                recorded_at=time.time(),
+                error=error,
+            )
+        )
+
+    def status(self, stage: str, player_link: Dict[str, str]) -> Union[str, None]:
+        """Gets the last outcome of a player in a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        player_link : Dict[str, str]
+            Name and link of the player.
+
+        Returns:
+        -------
+        Union[str, None]
+            Last outcome, `None` if the player was never harvested in the stage.
+        """
+        return self.__statuses.get((stage, player_link["link"]))
+
+    def etag(self, stage: str, player_link: Dict[str, str]) -> Union[str, None]:
+        """Gets the `ETag` of the last data of a player in a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        player_link : Dict[str, str]
+            Name and link of the player.
+
+        Returns:
+        -------
+        Union[str, None]
+            `ETag` of the data, `None` if unknown.
+        """
+        return self.__etags.get((stage, player_link["link"]))
+
+    def pending(
+        self, stage: str, players_links: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Gets the players still to be harvested in a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        players_links : List[Dict[str, str]]
+            Names and links of the players of the season.
+
+        Returns:
+        -------
+        List[Dict[str, str]]
+            Players that failed or were never harvested in the stage.
+        """
+        return [
+            player_link
+            for player_link in players_links
+            if self.status(stage, player_link) != JournalStatuses.completed
+        ]
+
+    def goalkeepers_links(
+        self, players_links: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """Gets the players whose summary stats are those of a goalkeeper.
+
+        Parameters
+        ----------
+        players_links : List[Dict[str, str]]
+            Names and links of the players of the season.
+
+        Returns:
+        -------
+        List[Dict[str, str]]
+            Names and links of the goalkeepers.
+        """
+        goalkeepers: List[Dict[str, str]] = []
+        for player_link in players_links:
+            data: Union[JsonData, None] = self.data(HarvestStages.summary, player_link)
+            if data is not None and data["data"].get("player_type") == "goalkeeper":
+                goalkeepers.append(player_link)
+        return goalkeepers
+
+    def entries(self) -> Iterator[JournalEntry]:
+        """Reads the journal, skipping a last line left incomplete by a crash.
+
+        Returns:
+        -------
+        Iterator[JournalEntry]
+            Entries in the order they were recorded.
+        """
+        for _, entry in self.__entries():
+            yield entry
+
+    def data(self, stage: str, player_link: Dict[str, str]) -> Union[JsonData, None]:
+        """Gets the data of a player completed in a stage.
+
+        Game-day rows of `updated` entries are merged into the data of the player.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+        player_link : Dict[str, str]
+            Name and link of the player.
+
+        Returns:
+        -------
+        Union[JsonData, None]
+            Data of the last completed outcome of the player, kept even if a later
+            refresh of the player failed, `None` if never completed.
+        """
+        return self.__read_data((stage, player_link["link"]))
+
+    def completed(self, stage: str) -> Iterator[JsonData]:
+        """Gets the data of the players completed in a stage, one at a time.
+
+        Parameters
+        ----------
+        stage : str
+            Stage of the harvest, one of `HarvestStages`.
+
+        Returns:
+        -------
+        Iterator[JsonData]
+            Data of the last completed outcome of each player, kept even if a later
+            refresh of the player failed.
+        """
+        keys: List[JournalKey] = [key for key in self.__offsets if key[0] == stage]
+        for key in keys:
+            data: Union[JsonData, None] = self.__read_data(key)
+            if data is not None:
+                yield data
+
+    def write_manifest(self, players_links: List[Dict[str, str]]) -> JsonData:
+        """Writes the manifest of the completed, failed and pending players.
+
+        Parameters
+        ----------
+        players_links : List[Dict[str, str]]
+            Names and links of the players of the season.
+
+        Returns:
+        -------
+        JsonData
+            Content of the manifest.
+        """
+        stages: Dict[str, Dict[str, List[str]]] = {}
+        for stage in (HarvestStages.matches, HarvestStages.summary):
+            summary: Dict[str, List[str]] = {
+                JournalStatuses.completed: [],
+                JournalStatuses.failed: [],
+                "pending": [],
+            }
+            for player_link in players_links:
+                status: Union[str, None] = self.status(stage, player_link)
+                if status == JournalStatuses.completed:
+                    summary[JournalStatuses.completed].append(player_link["link"])
+                elif status == JournalStatuses.failed:
+                    summary[JournalStatuses.failed].append(player_link["link"])
+                else:
+                    summary["pending"].append(player_link["link"])
+            stages[stage] = summary
+        manifest: JsonData = {
+            "updated_at": time.time(),
+            "players": len(players_links),
+            "counts": {
+                stage: {status: len(links) for status, links in summary.items()}
+                for stage, summary in stages.items()
+            },
+            "stages": stages,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=4)
+        os.replace(tmp_path, self.manifest_path)
+
+        return manifest
+
+    def __append(self, entry: JournalEntry) -> None:
+        """Writes an entry to the journal and flushes it."""
+        offset: int = self.__file.tell()
+        self.__file.write(json.dumps(entry._asdict()).encode("utf-8") + b"\n")
+        self.__file.flush()
+        self.__remember(entry, offset)
+
+    def __ends_with_newline(self) -> bool:
+        """Whether the last line of the journal was completely written."""
+        with self.journal_path.open(mode="rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def __entries(self) -> Iterator[Tuple[int, JournalEntry]]:
+        """Reads the journal with the offset of each entry."""
+        if not self.journal_path.is_file():
+            return
+        with self.journal_path.open(mode="rb") as file:
+            offset: int = 0
+            for line in file:
+                try:
+                    yield offset, JournalEntry(**json.loads(line))
+                except (json.JSONDecodeError, TypeError):
+                    pass
+                offset += len(line)
+
+    def __read_data(self, key: JournalKey) -> Union[JsonData, None]:
+        """Reads the data of a player in a stage, merging its updated rows."""
+        offsets: Union[List[int], None] = self.__offsets.get(key)
+        if not offsets:
+            return None
+        if self.__reader is None:
+            self.__reader = self.journal_path.open(mode="rb")
+        data: Union[JsonData, None] = None
+        for offset in offsets:
+            self.__reader.seek(offset)
+            entry = JournalEntry(**json.loads(self.__reader.readline()))
+            assert entry.data is not None
+            if data is None:
+                data = entry.data
+            else:
+                data = {
+                    **data,
+                    "data": merge_game_day_rows(data["data"], entry.data["data"]),
+                }
+
+        return data
+
+    def __remember(self, entry: JournalEntry, offset: int) -> None:
+        """Keeps the last outcome of a player in a stage."""
+        key: JournalKey = (entry.stage, entry.link)
+        if entry.data is not None:
+            if entry.status == JournalStatuses.completed:
+                self.__offsets[key] = [offset]
+            elif entry.status == JournalStatuses.updated and key in self.__offsets:
+                self.__offsets[key].append(offset)
+        self.__statuses[key] = (
+            JournalStatuses.completed
+            if entry.status == JournalStatuses.updated
+            else entry.status
+        )
+        if entry.etag is not None:
+            self.__etags[key] = entry.etag
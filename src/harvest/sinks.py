@@ -0,0 +1,233 @@
+"""Module to write harvested records one at a time, flushing them in batches."""
+
+import csv
+import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Type, Union
+
+import openpyxl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.harvest.constants import ExportFormats, SinkConstants
+
+JsonData = Dict[str, Any]
+
+
+class RecordSink(ABC):
+    """Base class of the sinks records are streamed to.
+
+    Records are buffered and written in batches of `batch_size`, so that memory
+    is bounded by the batch whatever the number of records written. Subclasses
+    implement `_write_batch` and `_close`.
+
+    Attributes:
+    ----------
+    path : Path
+        Path of the file written.
+    schema : pa.Schema
+        Schema of the records, giving the order of the columns.
+    batch_size : int
+        Number of records buffered before being written.
+    written : int
+        Number of records written so far.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        path: Union[str, Path],
+        schema: pa.Schema,
+        batch_size: int = SinkConstants.batch_size,
+    ):
+        self.path: Path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.schema: pa.Schema = schema
+        self.batch_size: int = batch_size
+        self.written: int = 0
+        self.__batch: List[JsonData] = []
+
+    def __enter__(self) -> "RecordSink":  # noqa: D105
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:  # noqa: D105
+        self.close()
+
+    def write(self, record: JsonData) -> None:
+        """Writes a record, flushing the batch once full.
+
+        Parameters
+        ----------
+        record : JsonData
+            Record following `schema`.
+        """
+        self.__batch.append(record)
+        if len(self.__batch) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records: Iterable[JsonData]) -> None:
+        """Writes records one at a time.
+
+        Parameters
+        ----------
+        records : Iterable[JsonData]
+            Records following `schema`.
+        """
+        for record in records:
+            self.write(record)
+
+    def flush(self) -> None:
+        """Writes the records buffered so far."""
+        if not self.__batch:
+            return
+        self._write_batch(self.__batch)
+        self.written += len(self.__batch)
+        self.__batch = []
+
+    def close(self) -> None:
+        """Flushes the last records and closes the file."""
+        self.flush()
+        self._close()
+
+    @abstractmethod
+    def _write_batch(self, records: List[JsonData]) -> None:
+        """Writes a batch of records."""
+
+    @abstractmethod
+    def _close(self) -> None:
+        """Closes the file."""
+
+
+class NdjsonSink(RecordSink):
+    """Sink writing one JSON object per line."""
+
+    def __init__(  # noqa: D107
+        self,
+        path: Union[str, Path],
+        schema: pa.Schema,
+        batch_size: int = SinkConstants.batch_size,
+    ):
+        super().__init__(path, schema, batch_size)
+        self.__file: IO[str] = self.path.open(mode="w", encoding="utf-8")
+
+    def _write_batch(self, records: List[JsonData]) -> None:
+        self.__file.write(
+            "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        )
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
+
+
+class CsvSink(RecordSink):
+    """Sink writing a CSV file with a header row."""
+
+    def __init__(  # noqa: D107
+        self,
+        path: Union[str, Path],
+        schema: pa.Schema,
+        batch_size: int = SinkConstants.batch_size,
+    ):
+        super().__init__(path, schema, batch_size)
+        self.__file: IO[str] = self.path.open(mode="w", encoding="utf-8", newline="")
+        self.__writer = csv.DictWriter(
+            self.__file, fieldnames=schema.names, extrasaction="ignore"
+        )
+        self.__writer.writeheader()
+
+    def _write_batch(self, records: List[JsonData]) -> None:
+        self.__writer.writerows(records)
+        self.__file.flush()
+
+    def _close(self) -> None:
+        self.__file.close()
+
+
+class ParquetSink(RecordSink):
+    """Sink writing a Parquet file, one row group per batch."""
+
+    def __init__(  # noqa: D107
+        self,
+        path: Union[str, Path],
+        schema: pa.Schema,
+        batch_size: int = SinkConstants.batch_size,
+    ):
+        super().__init__(path, schema, batch_size)
+        self.__writer = pq.ParquetWriter(self.path, schema, compression="zstd")
+
+    def _write_batch(self, records: List[JsonData]) -> None:
+        self.__writer.write_table(pa.Table.from_pylist(records, schema=self.schema))
+
+    def _close(self) -> None:
+        self.__writer.close()
+
+
+class ExcelSink(RecordSink):
+    """Sink writing an Excel file through a write-only, streaming workbook."""
+
+    def __init__(  # noqa: D107
+        self,
+        path: Union[str, Path],
+        schema: pa.Schema,
+        batch_size: int = SinkConstants.batch_size,
+    ):
+        super().__init__(path, schema, batch_size)
+        self.__workbook = openpyxl.Workbook(write_only=True)
+        self.__sheet = self.__workbook.create_sheet()
+        self.__sheet.append(schema.names)
+
+    def _write_batch(self, records: List[JsonData]) -> None:
+        for record in records:
+            self.__sheet.append([record.get(name) for name in self.schema.names])
+
+    def _close(self) -> None:
+        self.__workbook.save(self.path)
+
+
+SINKS: Dict[str, Type[RecordSink]] = {
+    ExportFormats.parquet: ParquetSink,
+    ExportFormats.ndjson: NdjsonSink,
+    ExportFormats.csv: CsvSink,
+    ExportFormats.excel: ExcelSink,
+}
+
+SUFFIXES: Dict[str, str] = {
+    ExportFormats.parquet: ".parquet",
+    ExportFormats.ndjson: ".ndjson",
+    ExportFormats.csv: ".csv",
+    ExportFormats.excel: ".xlsx",
+}
+
+
+def open_sink(
+    export_format: str,
+    path: Union[str, Path],
+    schema: pa.Schema,
+    batch_size: int = SinkConstants.batch_size,
+) -> RecordSink:
+    """Opens the sink of a format.
+
+    Parameters
+    ----------
+    export_format : str
+        Format of the file, one of `ExportFormats`.
+    path : Union[str, Path]
+        Path of the file.
+    schema : pa.Schema
+        Schema of the records.
+    batch_size : int
+        Number of records buffered before being written.
+
+    Returns:
+    -------
+    RecordSink
+        Sink of the format.
+    """
+    try:
+        sink_class: Type[RecordSink] = SINKS[export_format]
+    except KeyError as e:
+        raise ValueError(f"Unknown export format '{export_format}'.") from e
+    sink: RecordSink = sink_class(path, schema, batch_size)
+
+    return sink
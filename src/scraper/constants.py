@@ -1,5 +1,7 @@
 """Module for constants."""
 
+from typing import Tuple
+
 
 class CommonConstants:
     """Class containg common constants."""
@@ -11,3 +13,55 @@ class PlayerLinksConstants(CommonConstants):
     """Class containing constants to fetch players links."""
 
     fantacalcio_link: str = "https://www.fantacalcio.it/quotazioni-fantacalcio"
+
+
+class FetcherConstants:
+    """Class containing default settings of the shared HTTP connection pool."""
+
+    limit: int = 100
+    limit_per_host: int = 10
+    keepalive_timeout: float = 30.0
+    ttl_dns_cache: int = 300
+    total_timeout: float = 5.0
+
+
+class RateLimiterConstants:
+    """Class containing default settings of the rate limiter of the fetch layer."""
+
+    rate: float = 4.0
+    burst: int = 8
+    min_rate: float = 0.25
+    backoff_factor: float = 0.5
+    recovery_step: float = 0.05
+    throttle_statuses: Tuple[int, ...] = (429, 503)
+
+
+class RetryConstants:
+    """Class containing default settings of the retries of the fetch layer."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    circuit_failure_threshold: int = 5
+    circuit_reset_timeout: float = 30.0
+
+
+class ParserConstants:
+    """Class containing default settings of the pool pages are parsed in."""
+
+    pool_size: int = 2
+    memo_entries: int = 1024
+
+
+class FetchEndpoints:
+    """Class containing the names of the kinds of page fetched from the website."""
+
+    player: str = "player"
+    players_links: str = "players-links"
+
+
+class PlayerRolesConstants:
+    """Class containing constants about players' roles."""
+
+    goalkeeper_roles: Tuple[str, ...] = ("portiere", "goalkeeper")
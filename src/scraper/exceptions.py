@@ -7,3 +7,7 @@ class PageStructureError(Exception):
 
 class FetchError(Exception):
     """Exception raised when fetching the page fails."""
+
+
+class CircuitOpenError(FetchError):
+    """Exception raised when requests to a host are short-circuited."""
@@ -0,0 +1,369 @@
+"""Module to extract all the fields of a page in a single traversal of the document."""
+
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+from lxml import etree
+
+from src.scraper.exceptions import PageStructureError
+
+FieldValues = List[Union[str, None]]
+
+
+class Scope(NamedTuple):
+    """NamedTuple.
+
+    Selects the `position`-th element, in document order, with the given tag and
+    class.
+
+    Where:
+    - [0] = tag: str
+    - [1] = class_: str
+    - [2] = position: int
+    """
+
+    tag: str
+    class_: str
+    position: int = 0
+
+
+class FieldSpec(NamedTuple):
+    """NamedTuple.
+
+    Declares how to extract a field: which elements to select and what to read.
+    `class_` follows BeautifulSoup semantics: a single class matches any element
+    having it, several space-separated classes match the whole `class` attribute.
+
+    Where:
+    - [0] = name: str, name of the field.
+    - [1] = tag: str, tag of the selected elements.
+    - [2] = class_: Union[str, None], class of the selected elements, any if `None`.
+    - [3] = attr: Union[str, None], attribute to read, the stripped text if `None`.
+    - [4] = first: bool, whether only the first selected element is read.
+    - [5] = within: Union[Scope, None], element the selected ones must descend from.
+    """
+
+    name: str
+    tag: str
+    class_: Union[str, None] = None
+    attr: Union[str, None] = None
+    first: bool = False
+    within: Union[Scope, None] = None
+
+
+class ExtractedFields:
+    """Values extracted from a page, by field name.
+
+    Attributes:
+    ----------
+    values : Dict[str, FieldValues]
+        Values of each field. Fields whose `within` scope was not found in the page
+        are missing.
+    """
+
+    def __init__(self, values: Dict[str, FieldValues]):  # noqa: D107
+        self.values: Dict[str, FieldValues] = values
+
+    def copy(self) -> "ExtractedFields":
+        """Gets a copy of the values, which can be changed without affecting these.
+
+        Returns:
+        -------
+        ExtractedFields
+            Values of every field, in new lists.
+        """
+        return ExtractedFields(
+            values={name: list(values) for name, values in self.values.items()}
+        )
+
+    def all(self, name: str) -> FieldValues:
+        """Gets all the values of a field.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+
+        Returns:
+        -------
+        FieldValues
+            Values of the field, in document order.
+        """
+        try:
+            return self.values[name]
+        except KeyError as e:
+            raise PageStructureError(
+                f"Unexpected page structure while extracting '{name}'."
+            ) from e
+
+    def first(self, name: str) -> Union[str, None]:
+        """Gets the first value of a field, which must have been found.
+
+        Parameters
+        ----------
+        name : str
+            Name of the field.
+
+        Returns:
+        -------
+        Union[str, None]
+            First value of the field.
+        """
+        values: FieldValues = self.all(name)
+        if not values:
+            raise PageStructureError(
+                f"Unexpected page structure: no element found for '{name}'."
+            )
+        return values[0]
+
+
+def _class_matches(classes: List[str], wanted: Union[str, None]) -> bool:
+    """Tells whether an element's classes match a selector class."""
+    if wanted is None:
+        return True
+    return wanted in classes or " ".join(classes) == wanted
+
+
+def _descends_from(tag: Tag, ancestor: Tag) -> bool:
+    """Tells whether `tag` is nested, at any depth, inside `ancestor`."""
+    return any(parent is ancestor for parent in tag.parents)
+
+
+def _classes(tag: Tag) -> List[str]:
+    """Gets the classes of an element."""
+    classes: Union[str, List[str], None] = tag.get("class")
+    if isinstance(classes, str):
+        return classes.split()
+    return classes or []
+
+
+def _selects(
+    field: FieldSpec, tag: Tag, classes: List[str], scope_tags: Dict[Scope, Tag]
+) -> bool:
+    """Tells whether a field selects an element, given the scopes found so far."""
+    if not _class_matches(classes, field.class_):
+        return False
+    if field.within is None:
+        return True
+    ancestor: Union[Tag, None] = scope_tags.get(field.within)
+    return ancestor is not None and _descends_from(tag, ancestor)
+
+
+def _read(field: FieldSpec, tag: Tag) -> Union[str, None]:
+    """Reads the value of a field from a selected element."""
+    if field.attr is None:
+        return tag.get_text().strip()
+    value: Union[str, List[str], None] = tag.get(field.attr)
+    if isinstance(value, list):
+        return " ".join(value)
+    return value
+
+
+def xpath_class(class_: Union[str, None]) -> str:
+    """Builds the XPath predicate equivalent to a BeautifulSoup `class_` filter.
+
+    Parameters
+    ----------
+    class_ : Union[str, None]
+        Class to match, any if `None`.
+
+    Returns:
+    -------
+    str
+        XPath predicate, empty if any class matches.
+    """
+    if class_ is None:
+        return ""
+    if " " in class_.strip():
+        return f"[normalize-space(@class)='{class_}']"
+    return f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_} ')]"
+
+
+def _scope_xpath(scope: Scope) -> str:
+    """Builds the XPath selecting the element of a scope."""
+    return f"(//{scope.tag}{xpath_class(scope.class_)})[{scope.position + 1}]"
+
+
+def _field_xpath(field: FieldSpec) -> str:
+    """Builds the XPath selecting the elements of a field."""
+    path: str = f"//{field.tag}{xpath_class(field.class_)}"
+    if field.within is not None:
+        path = _scope_xpath(field.within) + path
+    if field.first:
+        path = f"({path})[1]"
+    return path
+
+
+def select_elements(xpath: etree.XPath, root: etree._Element) -> List[etree._Element]:
+    """Evaluates an XPath expression, keeping only the elements it selects.
+
+    Parameters
+    ----------
+    xpath : etree.XPath
+        Compiled expression.
+    root : etree._Element
+        Element the expression is evaluated on.
+
+    Returns:
+    -------
+    List[etree._Element]
+        Selected elements, in document order.
+    """
+    result = xpath(root)
+    if not isinstance(result, list):
+        return []
+    return [element for element in result if isinstance(element, etree._Element)]
+
+
+_STRING_VALUE = etree.XPath("string()")
+
+
+class ExtractionSpec:
+    """A set of field specs compiled once and evaluated in a single traversal.
+
+    Attributes:
+    ----------
+    fields : List[FieldSpec]
+        Declared fields.
+    """
+
+    def __init__(self, fields: Iterable[FieldSpec]):  # noqa: D107
+        self.fields: List[FieldSpec] = list(fields)
+        self.__fields_by_tag: Dict[str, List[FieldSpec]] = {}
+        self.__scopes_by_tag: Dict[str, List[Scope]] = {}
+        self.__field_xpaths: List[Tuple[FieldSpec, etree.XPath]] = []
+        self.__scope_xpaths: Dict[Scope, etree.XPath] = {}
+        for field in self.fields:
+            self.__fields_by_tag.setdefault(field.tag, []).append(field)
+            self.__field_xpaths.append((field, etree.XPath(_field_xpath(field))))
+            if field.within is not None:
+                scopes = self.__scopes_by_tag.setdefault(field.within.tag, [])
+                if field.within not in scopes:
+                    scopes.append(field.within)
+                    self.__scope_xpaths[field.within] = etree.XPath(
+                        _scope_xpath(field.within)
+                    )
+
+    def extract(self, soup: BeautifulSoup) -> ExtractedFields:
+        """Extracts all the fields walking the document only once.
+
+        Parameters
+        ----------
+        soup : BeautifulSoup
+            Parsed page.
+
+        Returns:
+        -------
+        ExtractedFields
+            Values of every field.
+        """
+        values: Dict[str, FieldValues] = {field.name: [] for field in self.fields}
+        scope_counts: Dict[Scope, int] = {}
+        scope_tags: Dict[Scope, Tag] = {}
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            scopes: List[Scope] = self.__scopes_by_tag.get(element.name, [])
+            fields: List[FieldSpec] = self.__fields_by_tag.get(element.name, [])
+            if not scopes and not fields:
+                continue
+            classes: List[str] = _classes(element)
+            for scope in scopes:
+                if _class_matches(classes, scope.class_):
+                    count: int = scope_counts.get(scope, 0)
+                    if count == scope.position:
+                        scope_tags[scope] = element
+                    scope_counts[scope] = count + 1
+            for field in fields:
+                if field.first and values[field.name]:
+                    continue
+                if _selects(field, element, classes, scope_tags):
+                    values[field.name].append(_read(field, element))
+
+        for field in self.fields:
+            if field.within is not None and field.within not in scope_tags:
+                values.pop(field.name, None)
+
+        return ExtractedFields(values=values)
+
+    def extract_lxml(self, root: etree._Element) -> ExtractedFields:
+        """Extracts all the fields running the precompiled XPath expressions.
+
+        It is the `lxml` equivalent of `extract`, and gives the same result without
+        building a BeautifulSoup tree.
+
+        Parameters
+        ----------
+        root : etree._Element
+            Root of the page parsed with `lxml.html`.
+
+        Returns:
+        -------
+        ExtractedFields
+            Values of every field.
+        """
+        found_scopes: Dict[Scope, bool] = {
+            scope: bool(select_elements(xpath, root))
+            for scope, xpath in self.__scope_xpaths.items()
+        }
+        values: Dict[str, FieldValues] = {}
+        for field, xpath in self.__field_xpaths:
+            if field.within is not None and not found_scopes[field.within]:
+                continue
+            elements: List[etree._Element] = select_elements(xpath, root)
+            if field.attr is None:
+                values[field.name] = [
+                    str(_STRING_VALUE(element)).strip() for element in elements
+                ]
+            else:
+                values[field.name] = [element.get(field.attr) for element in elements]
+
+        return ExtractedFields(values=values)
+
+    def is_complete(self, fields: ExtractedFields) -> bool:
+        """Tells whether every scoped field and every `first` field was found.
+
+        Parameters
+        ----------
+        fields : ExtractedFields
+            Values extracted from a page.
+
+        Returns:
+        -------
+        bool
+            `True` if the page matched the whole spec.
+        """
+        for field in self.fields:
+            if field.name not in fields.values:
+                return False
+            if field.first and not fields.values[field.name]:
+                return False
+        return True
+
+
+X_AXIS_VALUES = Scope(tag="div", class_="x-axis", position=1)
+TEAM_LINK = Scope(tag="a", class_="team-name team-link", position=0)
+
+PLAYER_PAGE = ExtractionSpec(
+    [
+        # Match stats, one value per game day
+        FieldSpec("grade", "span", "grade", attr="data-value"),
+        FieldSpec("fanta_grade", "span", "fanta-grade", attr="data-value"),
+        FieldSpec("bonus", "span", attr="data-primary-value", within=X_AXIS_VALUES),
+        FieldSpec("malus", "span", attr="data-secondary-value", within=X_AXIS_VALUES),
+        FieldSpec("home_team", "span", "team-home"),
+        FieldSpec("guest_team", "span", "team-away"),
+        FieldSpec("match_score", "span", "match-score"),
+        FieldSpec("sub_in", "span", "sub-in", attr="data-minute"),
+        FieldSpec("sub_out", "span", "sub-out", attr="data-minute"),
+        # Summary stats
+        FieldSpec("avg_grade", "span", "badge badge-primary avg", first=True),
+        FieldSpec("role", "span", "role", attr="title", first=True),
+        FieldSpec("mantra_role", "span", "role role-mantra", attr="title", first=True),
+        FieldSpec("team", "meta", attr="content", first=True, within=TEAM_LINK),
+        FieldSpec("description", "div", "description", first=True),
+        FieldSpec("stats_values", "td", "value"),
+        FieldSpec("stats_pills", "span", "pill"),
+    ]
+)
@@ -0,0 +1,451 @@
+"""Module to manage the shared HTTP connection pool used by all scrapers."""
+
+import asyncio
+from functools import partial
+from http import HTTPStatus
+from types import SimpleNamespace, TracebackType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, Union
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from src.scraper.constants import (
+    FetcherConstants,
+    RateLimiterConstants,
+    RetryConstants,
+)
+from src.scraper.exceptions import FetchError
+from src.scraper.page_cache import PageCache, PageCacheEntry
+from src.scraper.rate_limiter import RateLimiter, parse_retry_after
+from src.scraper.retry import CircuitBreaker, RetryPolicy, backoff_delay
+from src.scraper.single_flight import SingleFlight
+
+TraceCallback = Callable[
+    [aiohttp.ClientSession, SimpleNamespace, object], Awaitable[None]
+]
+
+
+class Fetcher:
+    """Class wrapping a pooled `aiohttp.ClientSession` shared by all the scrapers.
+
+    A single `Fetcher` is meant to live as long as the application. Reusing its
+    connector gives keep-alive connections, a DNS cache and per-host connection
+    limits to every page fetched by the scrapers.
+
+    Attributes:
+    ----------
+    limit : int
+        Maximum number of simultaneous connections.
+    limit_per_host : int
+        Maximum number of simultaneous connections to the same host.
+    keepalive_timeout : float
+        Seconds an idle connection is kept open for reuse.
+    ttl_dns_cache : int
+        Seconds a resolved host is kept in the DNS cache.
+    total_timeout : float
+        Total seconds allowed for a single request.
+    connect_timeout : Union[float, None]
+        Seconds allowed to acquire a connection, `None` for no specific limit.
+    read_timeout : Union[float, None]
+        Seconds allowed between two reads, `None` for no specific limit.
+    page_cache : Union[PageCache, None]
+        On-disk cache of the fetched pages, `None` to always download them.
+    rate_limiter : Union[RateLimiter, None]
+        Limiter every download waits for, `None` to send requests right away.
+    retry_policy : RetryPolicy
+        Retry policy of the pages without a specific one, the default
+        `RetryPolicy` if `None` is given.
+    retry_policies : Dict[str, RetryPolicy]
+        Retry policies by kind of page, one of `FetchEndpoints`.
+    circuit_failure_threshold : int
+        Consecutive failures suspending the requests to a host.
+    circuit_reset_timeout : float
+        Seconds the requests to a host stay suspended before a trial request.
+    """
+
+    def __init__(  # noqa: D107, PLR0913
+        self,
+        *,
+        limit: int = FetcherConstants.limit,
+        limit_per_host: int = FetcherConstants.limit_per_host,
+        keepalive_timeout: float = FetcherConstants.keepalive_timeout,
+        ttl_dns_cache: int = FetcherConstants.ttl_dns_cache,
+        total_timeout: float = FetcherConstants.total_timeout,
+        connect_timeout: Union[float, None] = None,
+        read_timeout: Union[float, None] = None,
+        page_cache: Union[PageCache, None] = None,
+        rate_limiter: Union[RateLimiter, None] = None,
+        retry_policy: Union[RetryPolicy, None] = None,
+        retry_policies: Union[Dict[str, RetryPolicy], None] = None,
+        circuit_failure_threshold: int = RetryConstants.circuit_failure_threshold,
+        circuit_reset_timeout: float = RetryConstants.circuit_reset_timeout,
+    ):
+        self.limit: int = limit
+        self.limit_per_host: int = limit_per_host
+        self.keepalive_timeout: float = keepalive_timeout
+        self.ttl_dns_cache: int = ttl_dns_cache
+        self.total_timeout: float = total_timeout
+        self.connect_timeout: Union[float, None] = connect_timeout
+        self.read_timeout: Union[float, None] = read_timeout
+        self.page_cache: Union[PageCache, None] = page_cache
+        self.rate_limiter: Union[RateLimiter, None] = rate_limiter
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.retry_policies: Dict[str, RetryPolicy] = dict(retry_policies or {})
+        self.circuit_failure_threshold: int = circuit_failure_threshold
+        self.circuit_reset_timeout: float = circuit_reset_timeout
+        self.__breakers: Dict[str, CircuitBreaker] = {}
+        self.__single_flight: SingleFlight[bytes] = SingleFlight()
+        self.__session: Union[aiohttp.ClientSession, None] = None
+        self.__counters: Dict[str, int] = {
+            "requests": 0,
+            "failures": 0,
+            "retries": 0,
+            "bytes_received": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+        }
+
+    async def __aenter__(self) -> "Fetcher":  # noqa: D105
+        await self.start()
+        return self
+
+    async def __aexit__(  # noqa: D105
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the underlying session is open."""
+        return self.__session is not None and not self.__session.closed
+
+    async def start(self) -> None:
+        """Open the pooled session. It must be called within a running event loop."""
+        if self.is_started:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.ttl_dns_cache,
+            use_dns_cache=True,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+        self.__session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self.__build_trace_config()],
+        )
+
+    async def close(self) -> None:
+        """Close the pooled session and all its connections."""
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    async def fetch(self, url: str, endpoint: Union[str, None] = None) -> bytes:
+        """Asynchronously fetch the content of a page.
+
+        When a page cache is configured, a fresh cached page is returned without
+        contacting the website, and a stale one is revalidated with a conditional
+        request. Failed downloads are retried following the retry policy of
+        `endpoint`, unless the circuit breaker of the host is open. Concurrent
+        fetches of the same URL as the same kind of page share a single download,
+        so each kind keeps its own retry policy.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page to fetch.
+        endpoint : Union[str, None]
+            Kind of page, one of `FetchEndpoints`, picking the retry policy.
+
+        Returns:
+        -------
+        bytes
+            Raw content of the page.
+        """
+        return await self.__single_flight.do(
+            (url, endpoint), partial(self.__fetch, url=url, endpoint=endpoint)
+        )
+
+    async def __fetch(self, url: str, endpoint: Union[str, None] = None) -> bytes:
+        """Fetch a page from the page cache or the website.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page to fetch.
+        endpoint : Union[str, None]
+            Kind of page, one of `FetchEndpoints`, picking the retry policy.
+
+        Returns:
+        -------
+        bytes
+            Raw content of the page.
+        """
+        if self.page_cache is None:
+            content, _, _ = await self.__download(url=url, endpoint=endpoint)
+            assert isinstance(content, bytes)
+            return content
+
+        entry: Union[PageCacheEntry, None] = await asyncio.to_thread(
+            self.page_cache.lookup, url
+        )
+        if entry is not None and self.page_cache.is_fresh(entry):
+            return await asyncio.to_thread(self.page_cache.read, entry)
+        self.page_cache.miss(url)
+
+        content, etag, last_modified = await self.__download(
+            url=url,
+            headers=PageCache.conditional_headers(entry),
+            endpoint=endpoint,
+        )
+        if content is None:
+            assert entry is not None
+            entry = await asyncio.to_thread(self.page_cache.revalidated, entry)
+            return await asyncio.to_thread(self.page_cache.read, entry, False)
+        await asyncio.to_thread(
+            self.page_cache.store, url, content, etag, last_modified
+        )
+
+        return content
+
+    async def __download(
+        self,
+        url: str,
+        headers: Union[Dict[str, str], None] = None,
+        endpoint: Union[str, None] = None,
+    ) -> Tuple[Union[bytes, None], Union[str, None], Union[str, None]]:
+        """Download a page from the website, retrying failed attempts.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page to download.
+        headers : Union[Dict[str, str], None]
+            Additional request headers, e.g. conditional ones.
+        endpoint : Union[str, None]
+            Kind of page, one of `FetchEndpoints`, picking the retry policy.
+
+        Returns:
+        -------
+        Tuple[Union[bytes, None], Union[str, None], Union[str, None]]
+            Raw content of the page, `None` if the website answered
+            `304 Not Modified`, followed by its `ETag` and `Last-Modified` headers.
+        """
+        policy: RetryPolicy = self.retry_policies.get(
+            endpoint or "", self.retry_policy
+        )
+        breaker: CircuitBreaker = self.__breaker(url)
+        attempt: int = 0
+        while True:
+            attempt += 1
+            breaker.before_request()
+            retry_after: Union[float, None] = None
+            try:
+                result = await self.__attempt(url=url, headers=headers)
+            except aiohttp.ClientResponseError as e:
+                if e.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if e.status not in policy.retry_statuses:
+                    raise self.__failed(f"Error fetching URL {url}: {e}") from e
+                if e.headers is not None:
+                    retry_after = parse_retry_after(e.headers.get("Retry-After"))
+                error: FetchError = FetchError(f"Error fetching URL {url}: {e}")
+                cause: BaseException = e
+            except aiohttp.ClientError as e:
+                breaker.record_failure()
+                error = FetchError(f"Error fetching URL {url}: {e}")
+                cause = e
+            except asyncio.TimeoutError as te:
+                breaker.record_failure()
+                if not policy.retry_on_timeout:
+                    raise self.__failed(f"Request to {url} timed out.") from te
+                error = FetchError(f"Request to {url} timed out.")
+                cause = te
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return result
+            if attempt >= policy.max_attempts:
+                self.__counters["failures"] += 1
+                raise error from cause
+            self.__counters["retries"] += 1
+            await asyncio.sleep(backoff_delay(policy, attempt, retry_after))
+
+    async def __attempt(
+        self,
+        url: str,
+        headers: Union[Dict[str, str], None] = None,
+    ) -> Tuple[Union[bytes, None], Union[str, None], Union[str, None]]:
+        """Send a single request to the website.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page to download.
+        headers : Union[Dict[str, str], None]
+            Additional request headers, e.g. conditional ones.
+
+        Returns:
+        -------
+        Tuple[Union[bytes, None], Union[str, None], Union[str, None]]
+            Raw content of the page, `None` if the website answered
+            `304 Not Modified`, followed by its `ETag` and `Last-Modified` headers.
+        """
+        if not self.is_started:
+            await self.start()
+        assert isinstance(self.__session, aiohttp.ClientSession)
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        self.__counters["requests"] += 1
+        self.__counters["in_flight"] += 1
+        self.__counters["max_in_flight"] = max(
+            self.__counters["max_in_flight"], self.__counters["in_flight"]
+        )
+        try:
+            async with self.__session.get(url, headers=headers) as response:
+                self.__record_response(response)
+                if response.status == HTTPStatus.NOT_MODIFIED:
+                    return None, None, None
+                response.raise_for_status()
+                content: bytes = await response.read()
+                etag: Union[str, None] = response.headers.get("ETag")
+                last_modified: Union[str, None] = response.headers.get(
+                    "Last-Modified"
+                )
+        finally:
+            self.__counters["in_flight"] -= 1
+        self.__counters["bytes_received"] += len(content)
+
+        return content, etag, last_modified
+
+    def __failed(self, message: str) -> FetchError:
+        """Count a request that failed for good and build its error."""
+        self.__counters["failures"] += 1
+        return FetchError(message)
+
+    def __breaker(self, url: str) -> CircuitBreaker:
+        """Get the circuit breaker of the host of a URL."""
+        host: str = urlsplit(url).netloc
+        breaker: Union[CircuitBreaker, None] = self.__breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host=host,
+                failure_threshold=self.circuit_failure_threshold,
+                reset_timeout=self.circuit_reset_timeout,
+            )
+            self.__breakers[host] = breaker
+        return breaker
+
+    def circuit_breakers_stats(self) -> List[Dict[str, Union[int, float, str]]]:
+        """Report statistics about the circuit breaker of each host.
+
+        Returns:
+        -------
+        List[Dict[str, Union[int, float, str]]]
+            Host, state and counters of each circuit.
+        """
+        return [breaker.stats() for breaker in self.__breakers.values()]
+
+    def stats(self) -> Dict[str, Union[int, float, bool]]:
+        """Report statistics about the connection pool.
+
+        Returns:
+        -------
+        Dict[str, Union[int, float, bool]]
+            Pool configuration and counters collected since the pool was created.
+        """
+        stats: Dict[str, Union[int, float, bool]] = {
+            "started": self.is_started,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "keepalive_timeout": self.keepalive_timeout,
+            "ttl_dns_cache": self.ttl_dns_cache,
+            "total_timeout": self.total_timeout,
+            "coalesced": self.__single_flight.stats()["coalesced"],
+        }
+        stats.update(self.__counters)
+
+        return stats
+
+    def __record_response(self, response: aiohttp.ClientResponse) -> None:
+        """Let the rate limiter back off or recover depending on the response."""
+        if self.rate_limiter is None:
+            return
+        if response.status in RateLimiterConstants.throttle_statuses:
+            self.rate_limiter.throttled(
+                parse_retry_after(response.headers.get("Retry-After"))
+            )
+        else:
+            self.rate_limiter.succeeded()
+
+    def __build_trace_config(self) -> aiohttp.TraceConfig:
+        """Build a trace config counting connection and DNS cache reuse."""
+
+        def counter(key: str) -> TraceCallback:
+            async def increment(
+                session: aiohttp.ClientSession,
+                context: SimpleNamespace,
+                params: object,
+            ) -> None:
+                self.__counters[key] += 1
+
+            return increment
+
+        trace_config = aiohttp.TraceConfig()
+        # The signals are typed differently by each aiosignal release
+        signals: Dict[str, Any] = {
+            "connections_created": trace_config.on_connection_create_end,
+            "connections_reused": trace_config.on_connection_reuseconn,
+            "dns_cache_hits": trace_config.on_dns_cache_hit,
+            "dns_cache_misses": trace_config.on_dns_cache_miss,
+        }
+        for key, signal in signals.items():
+            signal.append(counter(key))
+
+        return trace_config
+
+
+async def fetch_content(
+    url: str,
+    fetcher: Union[Fetcher, None] = None,
+    endpoint: Union[str, None] = None,
+) -> bytes:
+    """Fetch a page with the shared `fetcher`, or with a one-off one if missing.
+
+    Parameters
+    ----------
+    url : str
+        URL of the page to fetch.
+    fetcher : Union[Fetcher, None]
+        Shared fetcher. When `None` a short-lived fetcher is opened and closed
+        around the single request.
+    endpoint : Union[str, None]
+        Kind of page, one of `FetchEndpoints`, picking the retry policy.
+
+    Returns:
+    -------
+    bytes
+        Raw content of the page.
+    """
+    if fetcher is not None:
+        return await fetcher.fetch(url, endpoint=endpoint)
+    async with Fetcher() as one_off_fetcher:
+        return await one_off_fetcher.fetch(url, endpoint=endpoint)
@@ -0,0 +1,67 @@
+"""Module to get both players' match stats and summary stats from a single fetch."""
+
+from typing import Union
+
+from src.api.models import PlayerLink
+from src.scraper.extraction import ExtractedFields
+from src.scraper.fetcher import Fetcher
+from src.scraper.get_matches_stats import GetMatchesStats
+from src.scraper.get_players_stats import (
+    GetGoalkeeperSummaryStats,
+    GetOufieldPlayerSummaryStats,
+    scrape_role_aware_summary_stats,
+)
+from src.scraper.parser import PageParser
+
+
+class GetFullPlayerStats:
+    """Class to scrape a player's match stats and summary stats in a single pass.
+
+    The player page is fetched and parsed once and its fields are extracted in a
+    single traversal, then shared between `GetMatchesStats` and the
+    role-appropriate summary stats scraper.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        player_link: PlayerLink,
+        fetcher: Union[Fetcher, None] = None,
+        parser: Union[PageParser, None] = None,
+    ):
+        self.player_link: PlayerLink = player_link
+        self.fetcher: Union[Fetcher, None] = fetcher
+        self.parser: Union[PageParser, None] = parser
+        self.matches: GetMatchesStats = GetMatchesStats(
+            player_link=player_link, fetcher=fetcher, parser=parser
+        )
+        self.summary: Union[
+            GetOufieldPlayerSummaryStats, GetGoalkeeperSummaryStats, None
+        ] = None
+
+    @property
+    def is_goalkeeper(self) -> bool:
+        """Whether the scraped player is a goalkeeper."""
+        return isinstance(self.summary, GetGoalkeeperSummaryStats)
+
+    async def scrape_all(self) -> None:
+        """Fetch the page once and scrape match stats and summary stats from it."""
+        await self.matches.fetch_page()
+        assert isinstance(self.matches.fields, ExtractedFields)
+        await self.extract_all(fields=self.matches.fields)
+
+    async def extract_all(self, fields: ExtractedFields) -> None:
+        """Scrape match stats and summary stats from an already parsed page.
+
+        Parameters
+        ----------
+        fields : ExtractedFields
+            Fields extracted from the player page.
+        """
+        self.matches.fields = fields
+        await self.matches.extract_all()
+        self.summary = await scrape_role_aware_summary_stats(
+            player_link=self.player_link,
+            fetcher=self.fetcher,
+            parser=self.parser,
+            fields=fields,
+        )
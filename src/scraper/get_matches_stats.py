@@ -1,25 +1,33 @@
 """Module to get players historical stats."""
 
-import asyncio
 from typing import List, Tuple, Union
 
-import aiohttp
 from bs4 import BeautifulSoup
-from bs4.element import Tag
 
 from src.api.models import PlayerLink
 from src.scraper import utils
-from src.scraper.exceptions import FetchError, PageStructureError
+from src.scraper.constants import FetchEndpoints
+from src.scraper.extraction import ExtractedFields
+from src.scraper.fetcher import Fetcher, fetch_content
+from src.scraper.parser import PageParser, parse_player_page
 from src.scraper.utils import check_for_soup
 
 
 class GetMatchesStats:
     """Class to get players' match stats."""
 
-    def __init__(self, player_link: PlayerLink):  # noqa: D107
+    def __init__(  # noqa: D107
+        self,
+        player_link: PlayerLink,
+        fetcher: Union[Fetcher, None] = None,
+        parser: Union[PageParser, None] = None,
+    ):
         self.name: str = str(player_link.name)
         self.url: str = str(player_link.link)
+        self.fetcher: Union[Fetcher, None] = fetcher
+        self.parser: Union[PageParser, None] = parser
         self.soup: Union[BeautifulSoup, None] = None
+        self.fields: Union[ExtractedFields, None] = None
         self.game_day: Union[List[int], None] = None
         self.grade: Union[List[Union[float, None]], None] = None
         self.fanta_grade: Union[List[Union[float, None]], None] = None
@@ -33,18 +41,13 @@ class GetMatchesStats:
         self.sub_out: Union[List[Union[float, None]], None] = None
 
     async def fetch_page(self) -> None:
-        """Asynchronously fetch the page content and parse it with BeautifulSoup."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                assert isinstance(self.url, str)
-                async with session.get(self.url, timeout=5) as response:
-                    response.raise_for_status()
-                    content: bytes = await response.read()
-                    self.soup = BeautifulSoup(content, "lxml")
-        except aiohttp.ClientError as e:
-            raise FetchError(f"Error fetching URL {self.url}: {e}") from e
-        except asyncio.TimeoutError as te:
-            raise FetchError(f"Request to {self.url} timed out.") from te
+        """Asynchronously fetch the page content and extract its fields."""
+        content: bytes = await fetch_content(
+            url=self.url, fetcher=self.fetcher, endpoint=FetchEndpoints.player
+        )
+        self.fields = await parse_player_page(
+            content=content, parser=self.parser, key=self.url
+        )
 
     def get_game_day(self) -> List[int]:
         """Gets game days.
@@ -68,11 +71,9 @@ class GetMatchesStats:
             List of grades.
         """
         grades: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="grade"):
-            grade: Union[float, None] = utils.str_to_none(
-                str_to_replace=span.get("data-value")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("grade"):
+            grade: Union[float, None] = utils.str_to_none(str_to_replace=value)
             assert isinstance(grade, float) or grade is None
             grades.append(grade)
         self.grade = grades
@@ -92,11 +93,9 @@ class GetMatchesStats:
             List of grades.
         """
         fanta_grades: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="fanta-grade"):
-            fanta_grade: Union[float, None] = utils.str_to_none(
-                str_to_replace=span.get("data-value")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("fanta_grade"):
+            fanta_grade: Union[float, None] = utils.str_to_none(str_to_replace=value)
             assert isinstance(fanta_grade, float) or fanta_grade is None
             fanta_grades.append(fanta_grade)
         self.fanta_grade = fanta_grades
@@ -113,19 +112,9 @@ class GetMatchesStats:
             List of grades.
         """
         bonus: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        x_axis_list: List[Tag] = self.soup.find_all("div", class_="x-axis")
-        if len(x_axis_list) > 1:
-            x_axis: Tag = x_axis_list[1]
-            if not isinstance(x_axis, Tag):
-                raise PageStructureError("Expected a Tag object for x_axis.")
-        else:
-            raise PageStructureError(
-                """Expected at least two 'div' elements with class 'x-axis',
-                but found fewer."""
-            )
-        for span in x_axis.find_all("span"):
-            one_bonus = utils.str_to_none(str_to_replace=span.get("data-primary-value"))
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("bonus"):
+            one_bonus = utils.str_to_none(str_to_replace=value)
             assert isinstance(one_bonus, float) or one_bonus is None
             bonus.append(one_bonus)
         self.bonus = bonus
@@ -142,21 +131,9 @@ class GetMatchesStats:
             List of grades.
         """
         malus: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        x_axis_list: List[Tag] = self.soup.find_all("div", class_="x-axis")
-        if len(x_axis_list) > 1:
-            x_axis: Tag = x_axis_list[1]
-            if not isinstance(x_axis, Tag):
-                raise PageStructureError("Expected a Tag object for x_axis.")
-        else:
-            raise PageStructureError(
-                """Expected at least two 'div' elements with class 'x-axis',
-                but found fewer."""
-            )
-        for span in x_axis.find_all("span"):
-            one_malus = utils.str_to_none(
-                str_to_replace=span.get("data-secondary-value")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("malus"):
+            one_malus = utils.str_to_none(str_to_replace=value)
             assert isinstance(one_malus, float) or one_malus is None
             malus.append(one_malus)
         self.malus = malus
@@ -173,12 +150,10 @@ class GetMatchesStats:
             List of guest teams.
         """
         home_teams: List[str] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="team-home")[
+        assert isinstance(self.fields, ExtractedFields)
+        for home_team in self.fields.all("home_team")[
             :-2
         ]:  # [:-2] removes two inexisting matches
-            assert isinstance(span, Tag)
-            home_team: str = span.text.strip()
             assert isinstance(home_team, str)
             home_teams.append(home_team)
         self.home_team = home_teams
@@ -195,12 +170,10 @@ class GetMatchesStats:
             List of guest teams.
         """
         guest_teams: List[str] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="team-away")[
+        assert isinstance(self.fields, ExtractedFields)
+        for guest_team in self.fields.all("guest_team")[
             :-2
         ]:  # [:-2] removes two inexisting matches
-            assert isinstance(span, Tag)
-            guest_team: str = span.text.strip()
             assert isinstance(guest_team, str)
             guest_teams.append(guest_team)
         self.guest_team = guest_teams
@@ -220,10 +193,8 @@ class GetMatchesStats:
         """
         home_team_scores: List[int] = []
         guest_team_scores: List[int] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="match-score"):
-            assert isinstance(span, Tag)
-            match_score: str = span.text.strip()
+        assert isinstance(self.fields, ExtractedFields)
+        for match_score in self.fields.all("match_score"):
             assert isinstance(match_score, str)
             home_team_score_str, guest_team_score_str = match_score.split("-")
             home_team_score = int(home_team_score_str)
@@ -252,11 +223,9 @@ class GetMatchesStats:
             List of minutues a player entered the field as a substitution.
         """
         subs_in: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="sub-in"):
-            sub_in: Union[float, None] = utils.empty_to_none(
-                value=span.get("data-minute")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("sub_in"):
+            sub_in: Union[float, None] = utils.empty_to_none(value=value)
             assert isinstance(sub_in, float) or sub_in is None
             subs_in.append(sub_in)
         self.sub_in = subs_in
@@ -277,11 +246,9 @@ class GetMatchesStats:
             List of minutues a player exited the field as a substitution.
         """
         subs_out: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="sub-out"):
-            sub_out: Union[float, None] = utils.empty_to_none(
-                value=span.get("data-minute")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("sub_out"):
+            sub_out: Union[float, None] = utils.empty_to_none(value=value)
             assert isinstance(sub_out, float) or sub_out is None
             subs_out.append(sub_out)
         self.sub_out = subs_out
@@ -291,7 +258,10 @@ class GetMatchesStats:
     async def scrape_all(self) -> None:
         """Fetch the page and scrape all available stats."""
         await self.fetch_page()
+        await self.extract_all()
 
+    async def extract_all(self) -> None:
+        """Scrape all available stats from the already fetched page."""
         self.get_game_day()
         await self.get_grade()
         await self.get_fanta_grade()
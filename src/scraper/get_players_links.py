@@ -1,14 +1,10 @@
 """Module to get players links. Links are necessary to scrape players data."""
 
-import asyncio
 from typing import Dict, List, Union
 
-import aiohttp
-from bs4 import BeautifulSoup
-from bs4.element import NavigableString, Tag
-
-from src.scraper.constants import PlayerLinksConstants
-from src.scraper.exceptions import FetchError, PageStructureError
+from src.scraper.constants import FetchEndpoints, PlayerLinksConstants
+from src.scraper.fetcher import Fetcher, fetch_content
+from src.scraper.parser import PageParser, RawPlayerLink, parse_players_links
 
 
 class GetPlayersLinks:
@@ -18,29 +14,36 @@ class GetPlayersLinks:
     ----------
     year : str
         The year for which player links are to be fetched, e.g., "2023-24", "2022-23".
+    fetcher : Union[Fetcher, None]
+        Shared fetcher used to download the page. A one-off fetcher is used if `None`.
+    parser : Union[PageParser, None]
+        Shared parser used to parse the page. BeautifulSoup is used if `None`.
     """
 
-    def __init__(self, year: str):  # noqa: D107
+    def __init__(  # noqa: D107
+        self,
+        year: str,
+        fetcher: Union[Fetcher, None] = None,
+        parser: Union[PageParser, None] = None,
+    ):
         self.year: str = year
+        self.fetcher: Union[Fetcher, None] = fetcher
+        self.parser: Union[PageParser, None] = parser
         self.__url: str = self.__construct_url()
-        self.__soup: Union[BeautifulSoup, None] = None
+        self.__raw_links: Union[List[RawPlayerLink], None] = None
 
     def __construct_url(self) -> str:
         """Construct the full URL for fetching player links."""
         return f"{PlayerLinksConstants.fantacalcio_link}/{self.year}/"
 
     async def __fetch_page(self) -> None:
-        """Asynchronously fetch the page content and parse it with BeautifulSoup."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.__url, timeout=5) as response:
-                    response.raise_for_status()
-                    content: bytes = await response.read()
-                    self.__soup = BeautifulSoup(content, "lxml")
-        except aiohttp.ClientError as e:
-            raise FetchError(f"Error fetching URL {self.__url}: {e}") from e
-        except asyncio.TimeoutError as te:
-            raise FetchError(f"Request to {self.__url} timed out.") from te
+        """Asynchronously fetch the page content and extract the players' links."""
+        content: bytes = await fetch_content(
+            url=self.__url, fetcher=self.fetcher, endpoint=FetchEndpoints.players_links
+        )
+        self.__raw_links = await parse_players_links(
+            content=content, parser=self.parser, key=self.__url
+        )
 
     async def get_links(self) -> List[Dict[str, str]]:
         """Asynchronously extract player links from the webpage.
@@ -50,68 +53,14 @@ class GetPlayersLinks:
         List[Dict[str, str]]
             List of dictionaries containing players' names and links.
         """
-        if not self.__soup:
+        if self.__raw_links is None:
             await self.__fetch_page()
-        assert isinstance(self.__soup, BeautifulSoup)
-        try:
-            container: Union[Tag, NavigableString, None] = self.__soup.find(
-                "div", class_="container"
-            )
-            assert isinstance(container, Tag)
-            table_overflow: Union[Tag, NavigableString, None] = container.find(
-                "div", class_="table-overflow"
-            )
-            assert isinstance(table_overflow, Tag)
-            table: Union[Tag, NavigableString, None] = table_overflow.find("table")
-            assert isinstance(table, Tag)
-            links: List[Tag] = table.find_all("a", class_="player-name player-link")
-            assert isinstance(links, List)
-
-            data: List[Dict[str, str]] = []
-            for link in links:
-                player_dict: Dict[str, str] = {
-                    "name": link.get_text(separator="\n", strip=True),
-                    "link": self.__get_attribute_as_str(tag=link, attr_name="href"),
-                }
-                assert isinstance(player_dict, Dict)
-                assert (
-                    isinstance(player_dict.get("name"), str)
-                    and player_dict.get("name") is not None
-                )
-                assert (
-                    isinstance(player_dict.get("link"), str)
-                    and player_dict.get("link") is not None
-                )
-                if player_dict.get("link")[-7:] != self.year:  # type: ignore
-                    player_dict["link"] = f'{player_dict.get("link")}/{self.year}'
-                data.append(player_dict)
-            return data
-        except AttributeError as e:
-            raise PageStructureError(
-                "Unexpected page structure while extracting player links"
-            ) from e
-
-    @staticmethod
-    def __get_attribute_as_str(tag: Tag, attr_name: str) -> str:
-        """Safely retrieve an attribute value from a BeautifulSoup Tag as a string.
-
-        Parameters
-        ----------
-        tag : Tag
-            The BeautifulSoup Tag object from which to retrieve the attribute.
-        attr_name : str
-            The name of the attribute to retrieve.
+        assert isinstance(self.__raw_links, list)
 
-        Returns:
-        -------
-        str
-            The attribute value as a string. If the attribute is not found or its
-            value is `None`, returns an empty string.
-        """
-        attr_value: Union[str, List[str], None] = tag.get(attr_name)
-        if isinstance(attr_value, str):
-            return attr_value
-        elif isinstance(attr_value, list):
-            return attr_value[0] if attr_value else ""
-        else:
-            return ""
+        data: List[Dict[str, str]] = []
+        for name, link in self.__raw_links:
+            player_dict: Dict[str, str] = {"name": name, "link": link}
+            if link[-7:] != self.year:
+                player_dict["link"] = f"{link}/{self.year}"
+            data.append(player_dict)
+        return data
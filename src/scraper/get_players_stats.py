@@ -1,25 +1,33 @@
 """Module to get players' stats."""
 
-import asyncio
 from typing import List, NamedTuple, Union
 
-import aiohttp
 from bs4 import BeautifulSoup
-from bs4.element import ResultSet, Tag
 
 from src.api.models import PlayerLink
 from src.scraper import utils
-from src.scraper.exceptions import FetchError
+from src.scraper.constants import FetchEndpoints
+from src.scraper.extraction import ExtractedFields, FieldValues
+from src.scraper.fetcher import Fetcher, fetch_content
+from src.scraper.parser import PageParser, parse_player_page
 from src.scraper.utils import check_for_soup
 
 
 class BasePlayerSummaryStats:
     """Class to scrpae a player summary statistics in a specific seasons."""
 
-    def __init__(self, player_link: PlayerLink):  # noqa: D107
+    def __init__(  # noqa: D107
+        self,
+        player_link: PlayerLink,
+        fetcher: Union[Fetcher, None] = None,
+        parser: Union[PageParser, None] = None,
+    ):
         self.name: str = str(player_link.name)
         self.url: str = str(player_link.link)
+        self.fetcher: Union[Fetcher, None] = fetcher
+        self.parser: Union[PageParser, None] = parser
         self.soup: Union[BeautifulSoup, None] = None
+        self.fields: Union[ExtractedFields, None] = None
         self.avg_grade: Union[float, None] = None
         self.avg_fanta_grade: Union[float, None] = None
         self.median_grade: Union[float, None] = None
@@ -30,26 +38,19 @@ class BasePlayerSummaryStats:
         self.description: Union[str, None] = None
 
     async def fetch_page(self) -> None:
-        # FIXME: this method is repeated from GetMatchesStats make a common class from
-        # which they can inherit
-        """Asynchronously fetches the page content and parse it with BeautifulSoup."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                assert isinstance(self.url, str)
-                async with session.get(self.url, timeout=5) as response:
-                    response.raise_for_status()
-                    content: bytes = await response.read()
-                    self.soup = BeautifulSoup(content, "lxml")
-        except aiohttp.ClientError as e:
-            raise FetchError(f"Error fetching URL {self.url}: {e}") from e
-        except asyncio.TimeoutError as te:
-            raise FetchError(f"Request to {self.url} timed out.") from te
+        """Asynchronously fetch the page content and extract its fields."""
+        content: bytes = await fetch_content(
+            url=self.url, fetcher=self.fetcher, endpoint=FetchEndpoints.player
+        )
+        self.fields = await parse_player_page(
+            content=content, parser=self.parser, key=self.url
+        )
 
     @check_for_soup
     async def get_avg_grade(self) -> Union[float, None]:
         """Gets the average grade."""
-        assert isinstance(self.soup, BeautifulSoup)
-        span: str = self.soup.find("span", class_="badge badge-primary avg").text
+        assert isinstance(self.fields, ExtractedFields)
+        span: Union[str, None] = self.fields.first("avg_grade")
         assert isinstance(span, str)
         avg_grade: Union[float, None] = utils.str_to_none(span)
         assert isinstance(avg_grade, float) or avg_grade is None
@@ -60,8 +61,8 @@ class BasePlayerSummaryStats:
     @check_for_soup
     async def get_avg_fanta_grade(self) -> Union[float, None]:
         """Gets the average fanta grade."""
-        assert isinstance(self.soup, BeautifulSoup)
-        span: str = self.soup.find("span", class_="badge badge-primary avg").text
+        assert isinstance(self.fields, ExtractedFields)
+        span: Union[str, None] = self.fields.first("avg_grade")
         assert isinstance(span, str)
         avg_fanta_grade: Union[float, None] = utils.str_to_none(span)
         assert isinstance(avg_fanta_grade, float) or avg_fanta_grade is None
@@ -73,11 +74,9 @@ class BasePlayerSummaryStats:
     async def get_median_grade(self) -> Union[float, None]:
         """Gets the median grade obtained by a player."""
         grades: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="grade"):
-            grade: Union[float, None] = utils.str_to_none(
-                str_to_replace=span.get("data-value")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("grade"):
+            grade: Union[float, None] = utils.str_to_none(str_to_replace=value)
             assert isinstance(grade, float) or grade is None
             grades.append(grade)
         median_grade: Union[float, None] = utils.safe_median(grades)
@@ -89,11 +88,9 @@ class BasePlayerSummaryStats:
     async def get_median_fanta_grade(self) -> Union[float, None]:
         """Gets the median fanta_grade obtained by a player."""
         fanta_grades: List[Union[float, None]] = []
-        assert isinstance(self.soup, BeautifulSoup)
-        for span in self.soup.find_all("span", class_="fanta-grade"):
-            fanta_grade: Union[float, None] = utils.str_to_none(
-                str_to_replace=span.get("data-value")
-            )
+        assert isinstance(self.fields, ExtractedFields)
+        for value in self.fields.all("fanta_grade"):
+            fanta_grade: Union[float, None] = utils.str_to_none(str_to_replace=value)
             assert isinstance(fanta_grade, float) or fanta_grade is None
             fanta_grades.append(fanta_grade)
         median_fanta_grade: Union[float, None] = utils.safe_median(fanta_grades)
@@ -104,10 +101,8 @@ class BasePlayerSummaryStats:
     @check_for_soup
     async def get_role(self) -> str:
         """Gets the role of the player."""
-        assert isinstance(self.soup, BeautifulSoup)
-        span: Tag = self.soup.find("span", class_="role")
-        assert isinstance(span, Tag)
-        role: str = span.get("title")
+        assert isinstance(self.fields, ExtractedFields)
+        role: Union[str, None] = self.fields.first("role")
         assert isinstance(role, str)
         self.role = role
 
@@ -116,10 +111,8 @@ class BasePlayerSummaryStats:
     @check_for_soup
     async def get_mantra_role(self) -> str:
         """Gets the role of the player."""
-        assert isinstance(self.soup, BeautifulSoup)
-        span: Tag = self.soup.find("span", class_="role role-mantra")
-        assert isinstance(span, Tag)
-        mantra_role: str = span.get("title")
+        assert isinstance(self.fields, ExtractedFields)
+        mantra_role: Union[str, None] = self.fields.first("mantra_role")
         assert isinstance(mantra_role, str)
         self.mantra_role = mantra_role
 
@@ -128,14 +121,8 @@ class BasePlayerSummaryStats:
     @check_for_soup
     async def get_team(self) -> str:
         """Get team of the player."""
-        assert isinstance(self.soup, BeautifulSoup)
-        a: ResultSet[Tag] = self.soup.find_all("a", class_="team-name team-link")
-        assert isinstance(a, ResultSet)
-        first_tag: Tag = a[0]
-        assert isinstance(first_tag, Tag)
-        meta: Tag = first_tag.find("meta")
-        assert isinstance(meta, Tag)
-        team: str = meta.get("content")
+        assert isinstance(self.fields, ExtractedFields)
+        team: Union[str, None] = self.fields.first("team")
         assert isinstance(team, str)
         self.team = team
 
@@ -144,10 +131,8 @@ class BasePlayerSummaryStats:
     @check_for_soup
     async def get_description(self) -> str:
         """Get  description of the player."""
-        assert isinstance(self.soup, BeautifulSoup)
-        div: Tag = self.soup.find("div", class_="description")
-        assert isinstance(div, Tag)
-        description: str = div.text.strip()
+        assert isinstance(self.fields, ExtractedFields)
+        description: Union[str, None] = self.fields.first("description")
         assert isinstance(description, str)
         self.description = description
 
@@ -156,7 +141,10 @@ class BasePlayerSummaryStats:
     async def scrape_common_stats(self) -> None:
         """Scrapes common stats shared by all players independently from the role."""
         await self.fetch_page()
+        await self.extract_common_stats()
 
+    async def extract_common_stats(self) -> None:
+        """Scrapes common stats from the already fetched page."""
         await self.get_avg_grade()
         await self.get_avg_fanta_grade()
         await self.get_median_grade()
@@ -214,8 +202,13 @@ class GetOufieldPlayerSummaryStats(BasePlayerSummaryStats):
     - defenders
     """
 
-    def __init__(self, player_link: PlayerLink):  # noqa: D107
-        super().__init__(player_link)
+    def __init__(  # noqa: D107
+        self,
+        player_link: PlayerLink,
+        fetcher: Union[Fetcher, None] = None,
+        parser: Union[PageParser, None] = None,
+    ):
+        super().__init__(player_link=player_link, fetcher=fetcher, parser=parser)
         self.graded_matches: Union[int, None] = None
         self.goals: Union[int, None] = None
         self.assists: Union[int, None] = None
@@ -231,19 +224,19 @@ class GetOufieldPlayerSummaryStats(BasePlayerSummaryStats):
     @check_for_soup
     async def get_graded_matches_goals_assists(self) -> GradedMatchesGoalsAssistsTuple:
         """Gets graded matches, goals, and assists."""
-        assert isinstance(self.soup, BeautifulSoup)
-        td: ResultSet[Tag] = self.soup.find_all("td", class_="value")
-        assert isinstance(td, ResultSet)
+        assert isinstance(self.fields, ExtractedFields)
+        td: FieldValues = self.fields.all("stats_values")
+        assert isinstance(td, list)
 
-        graded_matches = int(td[0].text)
+        graded_matches = int(str(td[0]))
         assert isinstance(graded_matches, int)
         self.graded_matches = graded_matches
 
-        goals = int(td[1].text)
+        goals = int(str(td[1]))
         assert isinstance(goals, int)
         self.goals = goals
 
-        assists = int(td[2].text)
+        assists = int(str(td[2]))
         assert isinstance(assists, int)
         self.assists = assists
 
@@ -258,27 +251,23 @@ class GetOufieldPlayerSummaryStats(BasePlayerSummaryStats):
         self,
     ) -> GoalsInfoPenaltiesInfoCardsInfoTuple:
         """Gets information about goals, penalties, autogoals, and cards."""
-        assert isinstance(self.soup, BeautifulSoup)
-        span: ResultSet[Tag] = self.soup.find_all("span", class_="pill")
-        assert isinstance(span, ResultSet)
-
-        home_game_goals, away_game_goals = span[0].text.split("/")
-        assert isinstance(home_game_goals, str)
-        assert isinstance(away_game_goals, str)
-        home_game_goals = int(home_game_goals)
+        assert isinstance(self.fields, ExtractedFields)
+        span: FieldValues = self.fields.all("stats_pills")
+        assert isinstance(span, list)
+
+        home_game_goals_str, away_game_goals_str = str(span[0]).split("/")
+        home_game_goals: int = int(home_game_goals_str)
         assert isinstance(home_game_goals, int)
         self.home_game_goals = home_game_goals
-        away_game_goals = int(away_game_goals)
+        away_game_goals: int = int(away_game_goals_str)
         assert isinstance(away_game_goals, int)
         self.away_game_goals = away_game_goals
 
-        penalties_scored, penalties_shot = span[2].text.split("/")
-        assert isinstance(penalties_scored, str)
-        assert isinstance(penalties_shot, str)
-        penalties_scored = int(penalties_scored)
+        penalties_scored_str, penalties_shot_str = str(span[2]).split("/")
+        penalties_scored: int = int(penalties_scored_str)
         assert isinstance(penalties_scored, int)
         self.penalties_scored = penalties_scored
-        penalties_shot = int(penalties_shot)
+        penalties_shot: int = int(penalties_shot_str)
         assert isinstance(penalties_shot, int)
         self.penalties_shot = penalties_shot
         penalties_ratio: Union[float, None] = utils.safe_zero_division(
@@ -288,14 +277,14 @@ class GetOufieldPlayerSummaryStats(BasePlayerSummaryStats):
         assert isinstance(penalties_ratio, float) or penalties_ratio is None
         self.penalties_ratio = penalties_ratio
 
-        autogoals: int = int(span[4].text)
+        autogoals: int = int(str(span[4]))
         assert isinstance(autogoals, int)
         self.autogoals = autogoals
 
-        yellow_cards: int = int(span[1].text)
+        yellow_cards: int = int(str(span[1]))
         assert isinstance(yellow_cards, int)
         self.yellow_cards = yellow_cards
-        red_cards: int = int(span[3].text)
+        red_cards: int = int(str(span[3]))
         assert isinstance(red_cards, int)
         self.red_cards = red_cards
 
@@ -312,7 +301,12 @@ class GetOufieldPlayerSummaryStats(BasePlayerSummaryStats):
 
     async def scrape_all(self) -> None:
         """Scrapes all stats for outfield players."""
-        await self.scrape_common_stats()
+        await self.fetch_page()
+        await self.extract_all()
+
+    async def extract_all(self) -> None:
+        """Scrapes all stats for outfield players from the already fetched page."""
+        await self.extract_common_stats()
         await self.get_graded_matches_goals_assists()
         await self.get_goals_info_penalties_info_cards_info()
 
@@ -354,8 +348,13 @@ class GoalsConcededPenaltiesSavedInfoCardsInfoTuple(NamedTuple):
 class GetGoalkeeperSummaryStats(BasePlayerSummaryStats):
     """Class to scrape goalkeepers summary stats."""
 
-    def __init__(self, player_link: PlayerLink):  # noqa: D107
-        super().__init__(player_link)
+    def __init__(  # noqa: D107
+        self,
+        player_link: PlayerLink,
+        fetcher: Union[Fetcher, None] = None,
+        parser: Union[PageParser, None] = None,
+    ):
+        super().__init__(player_link=player_link, fetcher=fetcher, parser=parser)
         self.graded_matches: Union[int, None] = None
         self.goals_conceded: Union[int, None] = None
         self.assists: Union[int, None] = None
@@ -371,19 +370,19 @@ class GetGoalkeeperSummaryStats(BasePlayerSummaryStats):
         self,
     ) -> GradedMatchesGoalsConcededAssistsTuple:
         """Gets graded matches, goals, and assists."""
-        assert isinstance(self.soup, BeautifulSoup)
-        td: ResultSet[Tag] = self.soup.find_all("td", class_="value")
-        assert isinstance(td, ResultSet)
+        assert isinstance(self.fields, ExtractedFields)
+        td: FieldValues = self.fields.all("stats_values")
+        assert isinstance(td, list)
 
-        graded_matches = int(td[0].text)
+        graded_matches = int(str(td[0]))
         assert isinstance(graded_matches, int)
         self.graded_matches = graded_matches
 
-        goals_conceded = int(td[1].text)
+        goals_conceded = int(str(td[1]))
         assert isinstance(goals_conceded, int)
         self.goals_conceded = goals_conceded
 
-        assists = int(td[2].text)
+        assists = int(str(td[2]))
         assert isinstance(assists, int)
         self.assists = assists
 
@@ -398,34 +397,30 @@ class GetGoalkeeperSummaryStats(BasePlayerSummaryStats):
         self,
     ) -> GoalsConcededPenaltiesSavedInfoCardsInfoTuple:
         """Gets information about goals, penalties, autogoals, and cards."""
-        assert isinstance(self.soup, BeautifulSoup)
-        span: ResultSet[Tag] = self.soup.find_all("span", class_="pill")
-        assert isinstance(span, ResultSet)
-
-        home_game_goals_conceded, away_game_goals_conceded = span[0].text.split("/")
-        assert isinstance(home_game_goals_conceded, str)
-        assert isinstance(away_game_goals_conceded, str)
-        home_game_goals_conceded = int(home_game_goals_conceded)
+        assert isinstance(self.fields, ExtractedFields)
+        span: FieldValues = self.fields.all("stats_pills")
+        assert isinstance(span, list)
+
+        home_conceded_str, away_conceded_str = str(span[0]).split("/")
+        home_game_goals_conceded: int = int(home_conceded_str)
         assert isinstance(home_game_goals_conceded, int)
         self.home_game_goals_conceded = home_game_goals_conceded
-        away_game_goals_conceded = int(away_game_goals_conceded)
+        away_game_goals_conceded: int = int(away_conceded_str)
         assert isinstance(away_game_goals_conceded, int)
         self.away_game_goals_conceded = away_game_goals_conceded
 
-        penalties_saved: Union[str, int] = span[2].text
-        assert isinstance(penalties_saved, str) or isinstance(penalties_saved, int)
-        penalties_saved = int(penalties_saved)
+        penalties_saved: int = int(str(span[2]))
         assert isinstance(penalties_saved, int)
         self.penalties_saved = penalties_saved
 
-        autogoals: int = int(span[4].text)
+        autogoals: int = int(str(span[4]))
         assert isinstance(autogoals, int)
         self.autogoals = autogoals
 
-        yellow_cards: int = int(span[1].text)
+        yellow_cards: int = int(str(span[1]))
         assert isinstance(yellow_cards, int)
         self.yellow_cards = yellow_cards
-        red_cards: int = int(span[3].text)
+        red_cards: int = int(str(span[3]))
         assert isinstance(red_cards, int)
         self.red_cards = red_cards
 
@@ -440,6 +435,57 @@ class GetGoalkeeperSummaryStats(BasePlayerSummaryStats):
 
     async def scrape_all(self) -> None:
         """Scrapes all stats for goalkeepers."""
-        await self.scrape_common_stats()
+        await self.fetch_page()
+        await self.extract_all()
+
+    async def extract_all(self) -> None:
+        """Scrapes all stats for goalkeepers from the already fetched page."""
+        await self.extract_common_stats()
         await self.get_graded_matches_goals_conceded_assists()
         await self.get_goals_conceded_penalties_saved_info_cards_info()
+
+
+async def scrape_role_aware_summary_stats(
+    player_link: PlayerLink,
+    fetcher: Union[Fetcher, None] = None,
+    parser: Union[PageParser, None] = None,
+    fields: Union[ExtractedFields, None] = None,
+) -> Union[GetOufieldPlayerSummaryStats, GetGoalkeeperSummaryStats]:
+    """Scrapes a player summary stats picking the scraper that matches its role.
+
+    The role is read from the same parsed page the stats are extracted from, so the
+    page is fetched and parsed only once whatever the role of the player.
+
+    Parameters
+    ----------
+    player_link : PlayerLink
+        Input object containing the player's name and link.
+    fetcher : Union[Fetcher, None]
+        Shared fetcher used to download the page. A one-off fetcher is used if `None`.
+    parser : Union[PageParser, None]
+        Shared parser used to parse the page. BeautifulSoup is used if `None`.
+    fields : Union[ExtractedFields, None]
+        Fields already extracted from the player page. The page is fetched if
+        `None`.
+
+    Returns:
+    -------
+    Union[GetOufieldPlayerSummaryStats, GetGoalkeeperSummaryStats]
+        Scraper on which all the stats have already been extracted.
+    """
+    scraper: Union[GetOufieldPlayerSummaryStats, GetGoalkeeperSummaryStats] = (
+        GetOufieldPlayerSummaryStats(
+            player_link=player_link, fetcher=fetcher, parser=parser
+        )
+    )
+    scraper.fields = fields
+    role: str = await scraper.get_role()
+    if utils.is_goalkeeper(role):
+        outfield_scraper = scraper
+        scraper = GetGoalkeeperSummaryStats(
+            player_link=player_link, fetcher=fetcher, parser=parser
+        )
+        scraper.fields = outfield_scraper.fields
+    await scraper.extract_all()
+
+    return scraper
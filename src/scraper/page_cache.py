@@ -0,0 +1,285 @@
+"""Module to persist the raw pages fetched by the scrapers on disk."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Union
+
+import zstandard
+
+from src.scraper.exceptions import FetchError
+
+
+class PageCacheEntry(NamedTuple):
+    """NamedTuple.
+
+    Where:
+    - [0] = url: str
+    - [1] = digest: str
+    - [2] = codec: str
+    - [3] = fetched_at: float
+    - [4] = etag: Union[str, None]
+    - [5] = last_modified: Union[str, None]
+    """
+
+    url: str
+    digest: str
+    codec: str
+    fetched_at: float
+    etag: Union[str, None]
+    last_modified: Union[str, None]
+
+
+class PageCache:
+    """Content-addressed, compressed on-disk cache of raw pages.
+
+    Pages are stored once per distinct content under `objects/`, named after the
+    SHA-256 of their content and compressed with zstd. An index keyed by URL, under
+    `index/`, records which content a URL pointed to and the validators (`ETag`,
+    `Last-Modified`) needed to revalidate it with a conditional request.
+
+    Attributes:
+    ----------
+    directory : Path
+        Root directory of the cache.
+    fresh_for : float
+        Seconds a cached page is served without contacting the website.
+    immutable_patterns : List[str]
+        URLs containing any of these substrings, e.g. a past season like "2022-23",
+        never expire.
+    offline : bool
+        Whether pages are served only from the cache, never from the website.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        directory: Union[str, Path],
+        fresh_for: float,
+        immutable_patterns: Iterable[str] = (),
+        offline: bool = False,
+    ):
+        self.directory: Path = Path(directory)
+        self.fresh_for: float = fresh_for
+        self.immutable_patterns: List[str] = list(immutable_patterns)
+        self.offline: bool = offline
+        self.codec: str = "zst"
+        self.__counters: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stored": 0,
+        }
+        (self.directory / "index").mkdir(parents=True, exist_ok=True)
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+
+    def lookup(self, url: str) -> Union[PageCacheEntry, None]:
+        """Looks up the index entry of a URL.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+
+        Returns:
+        -------
+        Union[PageCacheEntry, None]
+            The index entry, or `None` if the URL was never cached.
+        """
+        index_path: Path = self.__index_path(url)
+        try:
+            with index_path.open(mode="r", encoding="utf-8") as file:
+                entry = PageCacheEntry(**json.load(file))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            return None
+        if not self.__object_path(entry.digest, entry.codec).is_file():
+            return None
+
+        return entry
+
+    def is_fresh(self, entry: PageCacheEntry) -> bool:
+        """Whether a cached page can be served without contacting the website."""
+        if self.offline:
+            return True
+        if any(pattern in entry.url for pattern in self.immutable_patterns):
+            return True
+        return time.time() - entry.fetched_at < self.fresh_for
+
+    def read(self, entry: PageCacheEntry, hit: bool = True) -> bytes:
+        """Reads the content of a cached page.
+
+        Parameters
+        ----------
+        entry : PageCacheEntry
+            Index entry of the page.
+        hit : bool
+            Whether the page is served fresh from the cache and counts as a hit,
+            rather than read after a revalidation.
+
+        Returns:
+        -------
+        bytes
+            Raw content of the page.
+        """
+        compressed: bytes = self.__object_path(entry.digest, entry.codec).read_bytes()
+        if hit:
+            self.__counters["hits"] += 1
+
+        return self.__decompress(compressed)
+
+    def store(
+        self,
+        url: str,
+        content: bytes,
+        etag: Union[str, None] = None,
+        last_modified: Union[str, None] = None,
+    ) -> PageCacheEntry:
+        """Stores the content of a page and points its URL to it.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        content : bytes
+            Raw content of the page.
+        etag : Union[str, None]
+            `ETag` header returned by the website, if any.
+        last_modified : Union[str, None]
+            `Last-Modified` header returned by the website, if any.
+
+        Returns:
+        -------
+        PageCacheEntry
+            The new index entry of the page.
+        """
+        digest: str = hashlib.sha256(content).hexdigest()
+        object_path: Path = self.__object_path(digest, self.codec)
+        if not object_path.is_file():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            self.__atomic_write(object_path, self.__compress(content))
+        entry = PageCacheEntry(
+            url=url,
+            digest=digest,
+            codec=self.codec,
+            fetched_at=time.time(),
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self.__write_entry(entry)
+        self.__counters["stored"] += 1
+
+        return entry
+
+    def revalidated(self, entry: PageCacheEntry) -> PageCacheEntry:
+        """Marks a cached page as confirmed unchanged by the website.
+
+        Parameters
+        ----------
+        entry : PageCacheEntry
+            Index entry of the page.
+
+        Returns:
+        -------
+        PageCacheEntry
+            The index entry with a refreshed fetch time.
+        """
+        entry = entry._replace(fetched_at=time.time())
+        self.__write_entry(entry)
+        self.__counters["revalidated"] += 1
+
+        return entry
+
+    def miss(self, url: str) -> None:
+        """Records that a URL had to be downloaded, raising if offline.
+
+        Parameters
+        ----------
+        url : str
+            URL of the page.
+        """
+        self.__counters["misses"] += 1
+        if self.offline:
+            raise FetchError(
+                f"Page {url} is not cached and the page cache is offline."
+            )
+
+    @staticmethod
+    def conditional_headers(entry: Union[PageCacheEntry, None]) -> Dict[str, str]:
+        """Builds the headers to revalidate a cached page.
+
+        Parameters
+        ----------
+        entry : Union[PageCacheEntry, None]
+            Index entry of the page, if cached.
+
+        Returns:
+        -------
+        Dict[str, str]
+            `If-None-Match` and/or `If-Modified-Since` headers.
+        """
+        headers: Dict[str, str] = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def stats(self) -> Dict[str, Union[int, float, bool, str]]:
+        """Report statistics about the page cache.
+
+        Returns:
+        -------
+        Dict[str, Union[int, float, bool, str]]
+            Cache configuration and counters.
+        """
+        stats: Dict[str, Union[int, float, bool, str]] = {
+            "directory": str(self.directory),
+            "codec": self.codec,
+            "fresh_for": self.fresh_for,
+            "offline": self.offline,
+        }
+        stats.update(self.__counters)
+
+        return stats
+
+    def __index_path(self, url: str) -> Path:
+        """Path of the index entry of a URL."""
+        key: str = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / "index" / f"{key}.json"
+
+    def __object_path(self, digest: str, codec: str) -> Path:
+        """Path of a stored content."""
+        return self.directory / "objects" / digest[:2] / f"{digest}.{codec}"
+
+    def __write_entry(self, entry: PageCacheEntry) -> None:
+        """Writes the index entry of a URL."""
+        data: bytes = json.dumps(entry._asdict()).encode("utf-8")
+        self.__atomic_write(self.__index_path(entry.url), data)
+
+    @staticmethod
+    def __atomic_write(path: Path, data: bytes) -> None:
+        """Writes a file so that readers never see it partially written."""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def __compress(content: bytes) -> bytes:
+        """Compresses a page content with zstd."""
+        compressed: bytes = zstandard.ZstdCompressor().compress(content)
+        return compressed
+
+    @staticmethod
+    def __decompress(compressed: bytes) -> bytes:
+        """Decompresses a page content compressed with zstd."""
+        content: bytes = zstandard.ZstdDecompressor().decompress(compressed)
+        return content
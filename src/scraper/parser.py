@@ -0,0 +1,452 @@
+"""Module to parse the raw pages fetched by the scrapers."""
+
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Tuple, TypeVar, Union
+
+import lxml.html
+from bs4 import BeautifulSoup
+from bs4.element import NavigableString, Tag
+from lxml import etree
+
+from src.scraper.constants import ParserConstants
+from src.scraper.exceptions import PageStructureError
+from src.scraper.extraction import (
+    PLAYER_PAGE,
+    ExtractedFields,
+    select_elements,
+    xpath_class,
+)
+from src.scraper.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RawPlayerLink = Tuple[str, str]
+
+PLAYERS_LINKS_XPATH = etree.XPath(
+    f"((((//div{xpath_class('container')})[1]"
+    f"//div{xpath_class('table-overflow')})[1]"
+    f"//table)[1]"
+    f"//a{xpath_class('player-name player-link')})"
+)
+_TEXT_NODES = etree.XPath(".//text()")
+
+
+class ParserBackends:
+    """Class containing the names of the available parser backends."""
+
+    bs4: str = "bs4"
+    lxml: str = "lxml"
+
+
+class ParserPools:
+    """Class containing the kinds of pool pages can be parsed in."""
+
+    none: str = "none"
+    thread: str = "thread"
+    process: str = "process"
+
+
+def extract_player_fields(content: bytes, backend: str) -> Tuple[ExtractedFields, bool]:
+    """Extracts the fields of a player page.
+
+    With the `lxml` backend the page is parsed with `lxml.html` and fields are
+    extracted by precompiled XPath expressions, without building a BeautifulSoup
+    tree. Whenever that fails or the page does not match the expected structure,
+    the page is parsed again with BeautifulSoup, which is also the `bs4` backend.
+
+    Parameters
+    ----------
+    content : bytes
+        Raw content of the player page.
+    backend : str
+        Name of the backend, one of `ParserBackends`.
+
+    Returns:
+    -------
+    Tuple[ExtractedFields, bool]
+        Values of every field of `PLAYER_PAGE`, and whether the page fell back to
+        BeautifulSoup.
+    """
+    if backend == ParserBackends.lxml:
+        try:
+            fields: ExtractedFields = PLAYER_PAGE.extract_lxml(
+                lxml.html.document_fromstring(content)
+            )
+            if PLAYER_PAGE.is_complete(fields):
+                return fields, False
+        except (etree.ParserError, etree.XPathError, ValueError) as e:
+            logger.debug("lxml failed to parse a player page: %s", e)
+        return PLAYER_PAGE.extract(BeautifulSoup(content, "lxml")), True
+
+    return PLAYER_PAGE.extract(BeautifulSoup(content, "lxml")), False
+
+
+def extract_players_links(
+    content: bytes, backend: str
+) -> Tuple[List[RawPlayerLink], bool]:
+    """Extracts the names and links of the players listed in a season page.
+
+    Parameters
+    ----------
+    content : bytes
+        Raw content of the season page.
+    backend : str
+        Name of the backend, one of `ParserBackends`.
+
+    Returns:
+    -------
+    Tuple[List[RawPlayerLink], bool]
+        Name and link of each player, in document order, and whether the page fell
+        back to BeautifulSoup.
+    """
+    if backend == ParserBackends.lxml:
+        try:
+            links: List[RawPlayerLink] = _players_links_lxml(content)
+            if links:
+                return links, False
+        except (etree.ParserError, etree.XPathError, ValueError) as e:
+            logger.debug("lxml failed to parse a season page: %s", e)
+        return _players_links_bs4(content), True
+
+    return _players_links_bs4(content), False
+
+
+def _players_links_lxml(content: bytes) -> List[RawPlayerLink]:
+    """Extracts the players' names and links with XPath."""
+    root: etree._Element = lxml.html.document_fromstring(content)
+    links: List[RawPlayerLink] = []
+    for link in select_elements(PLAYERS_LINKS_XPATH, root):
+        text_nodes = _TEXT_NODES(link)
+        assert isinstance(text_nodes, list)
+        texts: List[str] = [str(text).strip() for text in text_nodes]
+        name: str = "\n".join(text for text in texts if text)
+        links.append((name, link.get("href") or ""))
+    return links
+
+
+def _players_links_bs4(content: bytes) -> List[RawPlayerLink]:
+    """Extracts the players' names and links with BeautifulSoup."""
+    soup = BeautifulSoup(content, "lxml")
+    try:
+        container: Union[Tag, NavigableString, None] = soup.find(
+            "div", class_="container"
+        )
+        assert isinstance(container, Tag)
+        table_overflow: Union[Tag, NavigableString, None] = container.find(
+            "div", class_="table-overflow"
+        )
+        assert isinstance(table_overflow, Tag)
+        table: Union[Tag, NavigableString, None] = table_overflow.find("table")
+        assert isinstance(table, Tag)
+        links: List[Tag] = table.find_all("a", class_="player-name player-link")
+        assert isinstance(links, List)
+    except AttributeError as e:
+        raise PageStructureError(
+            "Unexpected page structure while extracting player links"
+        ) from e
+
+    return [
+        (
+            link.get_text(separator="\n", strip=True),
+            _get_attribute_as_str(tag=link, attr_name="href"),
+        )
+        for link in links
+    ]
+
+
+def _get_attribute_as_str(tag: Tag, attr_name: str) -> str:
+    """Safely retrieve an attribute value from a BeautifulSoup Tag as a string.
+
+    Parameters
+    ----------
+    tag : Tag
+        The BeautifulSoup Tag object from which to retrieve the attribute.
+    attr_name : str
+        The name of the attribute to retrieve.
+
+    Returns:
+    -------
+    str
+        The attribute value as a string. If the attribute is not found or its
+        value is `None`, returns an empty string.
+    """
+    attr_value: Union[str, List[str], None] = tag.get(attr_name)
+    if isinstance(attr_value, str):
+        return attr_value
+    elif isinstance(attr_value, list):
+        return attr_value[0] if attr_value else ""
+    else:
+        return ""
+
+
+class PageParser:
+    """Parses raw pages off the event loop and extracts the fields of the scrapers.
+
+    Parsing is CPU-bound: run on the event loop, it stalls every other request
+    while a page is parsed. Pages are therefore parsed in a small thread pool by
+    default, or a process pool, and only the extracted fields are sent back, never
+    the parsed tree. With the `none` pool pages are parsed on the calling thread.
+    Concurrent parses of the same page, identified by its URL and the SHA-256 of
+    its content, share a single parse. Every caller gets its own copy of the
+    result, never an object shared with other callers or with the memo.
+
+    The fields extracted from the last `memo_entries` distinct contents are kept
+    by the SHA-256 of the content, so a page that did not change since it was
+    last parsed, e.g. revalidated by the page cache, is never parsed again.
+
+    Attributes:
+    ----------
+    backend : str
+        Name of the backend, one of `ParserBackends`.
+    pool : str
+        Kind of pool pages are parsed in, one of `ParserPools`.
+    max_workers : int
+        Number of workers of the pool, `ParserConstants.pool_size` by default.
+    memo_entries : int
+        Maximum number of contents whose fields are kept, none if 0.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        backend: str = ParserBackends.bs4,
+        pool: str = ParserPools.thread,
+        max_workers: Union[int, None] = None,
+        memo_entries: int = ParserConstants.memo_entries,
+    ):
+        if backend not in (ParserBackends.bs4, ParserBackends.lxml):
+            raise ValueError(f"Unknown parser backend '{backend}'.")
+        if pool not in (ParserPools.none, ParserPools.thread, ParserPools.process):
+            raise ValueError(f"Unknown parser pool '{pool}'.")
+        self.backend: str = backend
+        self.pool: str = pool
+        self.max_workers: int = max_workers or ParserConstants.pool_size
+        self.memo_entries: int = memo_entries
+        self.__memo: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self.__executor: Union[Executor, None] = None
+        self.__player_flights: SingleFlight[ExtractedFields] = SingleFlight()
+        self.__links_flights: SingleFlight[List[RawPlayerLink]] = SingleFlight()
+        self.__counters: Dict[str, int] = {
+            "parsed": 0,
+            "memo_hits": 0,
+            "fallbacks": 0,
+            "pending": 0,
+            "max_pending": 0,
+        }
+
+    async def __aenter__(self) -> "PageParser":  # noqa: D105
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:  # noqa: D105
+        await self.close()
+
+    @property
+    def is_started(self) -> bool:
+        """Whether the pool has been started."""
+        return self.__executor is not None
+
+    def start(self) -> None:
+        """Start the pool pages are parsed in, if any."""
+        if self.__executor is not None or self.pool == ParserPools.none:
+            return
+        if self.pool == ParserPools.process:
+            self.__executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        else:
+            self.__executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="page-parser"
+            )
+
+    async def close(self) -> None:
+        """Shut the pool down, cancelling the pages still waiting to be parsed."""
+        if self.__executor is None:
+            return
+        executor: Executor = self.__executor
+        self.__executor = None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def player_fields(
+        self, content: bytes, key: Union[str, None] = None
+    ) -> ExtractedFields:
+        """Extracts the fields of a player page.
+
+        Parameters
+        ----------
+        content : bytes
+            Raw content of the player page.
+        key : Union[str, None]
+            URL of the page, to share the parse with concurrent callers of the same
+            content.
+
+        Returns:
+        -------
+        ExtractedFields
+            Values of every field of `PLAYER_PAGE`.
+        """
+        digest: str = hashlib.sha256(content).hexdigest()
+        parse = partial(self.__parse, extract_player_fields, content, digest)
+        fields: ExtractedFields = (
+            await parse()
+            if key is None
+            else await self.__player_flights.do((key, digest), parse)
+        )
+
+        return fields.copy()
+
+    async def players_links(
+        self, content: bytes, key: Union[str, None] = None
+    ) -> List[RawPlayerLink]:
+        """Extracts the names and links of the players listed in a season page.
+
+        Parameters
+        ----------
+        content : bytes
+            Raw content of the season page.
+        key : Union[str, None]
+            URL of the page, to share the parse with concurrent callers of the same
+            content.
+
+        Returns:
+        -------
+        List[RawPlayerLink]
+            Name and link of each player, in document order.
+        """
+        digest: str = hashlib.sha256(content).hexdigest()
+        parse = partial(self.__parse, extract_players_links, content, digest)
+        links: List[RawPlayerLink] = (
+            await parse()
+            if key is None
+            else await self.__links_flights.do((key, digest), parse)
+        )
+
+        return list(links)
+
+    def stats(self) -> Dict[str, Union[int, str, bool]]:
+        """Report statistics about the parser.
+
+        `pending` counts the pages submitted and not parsed yet, `queue_depth` those
+        of them still waiting for a free worker, always 0 without a pool.
+
+        Returns:
+        -------
+        Dict[str, Union[int, str, bool]]
+            Parser configuration and counters.
+        """
+        stats: Dict[str, Union[int, str, bool]] = {
+            "started": self.is_started,
+            "backend": self.backend,
+            "pool": self.pool,
+            "max_workers": self.max_workers,
+            "memoized": len(self.__memo),
+            "queue_depth": (
+                max(0, self.__counters["pending"] - self.max_workers)
+                if self.pool != ParserPools.none
+                else 0
+            ),
+            "coalesced": self.__player_flights.stats()["coalesced"]
+            + self.__links_flights.stats()["coalesced"],
+        }
+        stats.update(self.__counters)
+
+        return stats
+
+    async def __run(
+        self, func: Callable[[bytes, str], Tuple[T, bool]], content: bytes
+    ) -> Tuple[T, bool]:
+        """Runs an extraction function in the pool, or inline without one."""
+        if self.__executor is None:
+            return func(content, self.backend)
+        self.__counters["pending"] += 1
+        self.__counters["max_pending"] = max(
+            self.__counters["max_pending"], self.__counters["pending"]
+        )
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.__executor, func, content, self.backend
+            )
+        finally:
+            self.__counters["pending"] -= 1
+
+    async def __parse(
+        self, func: Callable[[bytes, str], Tuple[T, bool]], content: bytes, digest: str
+    ) -> T:
+        """Runs an extraction function, unless the content was already parsed."""
+        memo_key: Tuple[str, str] = (func.__name__, digest)
+        if memo_key in self.__memo:
+            self.__memo.move_to_end(memo_key)
+            self.__counters["memo_hits"] += 1
+            memoized: T = self.__memo[memo_key]
+            return memoized
+        result, fell_back = await self.__run(func, content)
+        self.__counters["parsed"] += 1
+        if fell_back:
+            self.__counters["fallbacks"] += 1
+        if self.memo_entries > 0:
+            self.__memo[memo_key] = result
+            while len(self.__memo) > self.memo_entries:
+                self.__memo.popitem(last=False)
+
+        return result
+
+
+async def parse_player_page(
+    content: bytes,
+    parser: Union[PageParser, None] = None,
+    key: Union[str, None] = None,
+) -> ExtractedFields:
+    """Extracts the fields of a player page with the given parser.
+
+    Parameters
+    ----------
+    content : bytes
+        Raw content of the player page.
+    parser : Union[PageParser, None]
+        Shared parser. The page is parsed with BeautifulSoup on the calling thread if
+        `None`.
+    key : Union[str, None]
+        URL of the page, to share the parse with concurrent callers.
+
+    Returns:
+    -------
+    ExtractedFields
+        Values of every field of `PLAYER_PAGE`.
+    """
+    if parser is None:
+        fields, _ = extract_player_fields(content, ParserBackends.bs4)
+        return fields
+    return await parser.player_fields(content, key=key)
+
+
+async def parse_players_links(
+    content: bytes,
+    parser: Union[PageParser, None] = None,
+    key: Union[str, None] = None,
+) -> List[RawPlayerLink]:
+    """Extracts the players' names and links of a season page with the given parser.
+
+    Parameters
+    ----------
+    content : bytes
+        Raw content of the season page.
+    parser : Union[PageParser, None]
+        Shared parser. The page is parsed with BeautifulSoup on the calling thread if
+        `None`.
+    key : Union[str, None]
+        URL of the page, to share the parse with concurrent callers.
+
+    Returns:
+    -------
+    List[RawPlayerLink]
+        Name and link of each player, in document order.
+    """
+    if parser is None:
+        links, _ = extract_players_links(content, ParserBackends.bs4)
+        return links
+    return await parser.players_links(content, key=key)
@@ -0,0 +1,163 @@
+"""Module to limit the rate of the requests sent to the website."""
+
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Union
+
+from src.scraper.constants import RateLimiterConstants
+
+
+def parse_retry_after(value: Union[str, None]) -> Union[float, None]:
+    """Parses a `Retry-After` header into the seconds to wait.
+
+    Parameters
+    ----------
+    value : Union[str, None]
+        Value of the header, either a number of seconds or an HTTP date.
+
+    Returns:
+    -------
+    Union[float, None]
+        Seconds to wait, or `None` if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at: float = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - time.time())
+
+
+class RateLimiter:
+    """Adaptive token bucket shared by all the requests sent to the website.
+
+    The bucket holds up to `burst` tokens and is refilled at the current rate.
+    Every request takes a token, waiting for one if the bucket is empty. When the
+    website answers `429 Too Many Requests` or `503 Service Unavailable`, the
+    current rate is multiplied by `backoff_factor` and no request is sent until the
+    `Retry-After` delay has passed. Every other response raises the rate again by
+    `recovery_step` requests per second, up to `rate`.
+
+    Attributes:
+    ----------
+    rate : float
+        Maximum requests per second. `0` disables the limiter.
+    burst : int
+        Maximum number of requests sent back to back.
+    min_rate : float
+        Requests per second the rate never backs off below.
+    backoff_factor : float
+        Factor the rate is multiplied by when the website throttles.
+    recovery_step : float
+        Requests per second the rate is raised by after each response that is not
+        throttled.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        rate: float = RateLimiterConstants.rate,
+        burst: int = RateLimiterConstants.burst,
+        min_rate: float = RateLimiterConstants.min_rate,
+        backoff_factor: float = RateLimiterConstants.backoff_factor,
+        recovery_step: float = RateLimiterConstants.recovery_step,
+    ):
+        self.rate: float = rate
+        self.burst: int = max(1, burst)
+        self.min_rate: float = min(min_rate, rate)
+        self.backoff_factor: float = backoff_factor
+        self.recovery_step: float = recovery_step
+        self.current_rate: float = rate
+        self.__tokens: float = float(self.burst)
+        self.__updated_at: float = time.monotonic()
+        self.__blocked_until: float = 0.0
+        self.__lock: asyncio.Lock = asyncio.Lock()
+        self.__counters: Dict[str, int] = {
+            "acquired": 0,
+            "delayed": 0,
+            "throttled": 0,
+        }
+
+    @property
+    def is_enabled(self) -> bool:
+        """Whether requests are rate limited."""
+        return self.rate > 0
+
+    async def acquire(self) -> None:
+        """Waits until a request can be sent, then takes a token."""
+        if not self.is_enabled:
+            return
+        async with self.__lock:
+            delayed: bool = False
+            while True:
+                now: float = time.monotonic()
+                self.__refill(now)
+                if now < self.__blocked_until:
+                    wait: float = self.__blocked_until - now
+                elif self.__tokens >= 1:
+                    self.__tokens -= 1
+                    break
+                else:
+                    wait = (1 - self.__tokens) / self.current_rate
+                delayed = True
+                await asyncio.sleep(wait)
+            self.__counters["acquired"] += 1
+            if delayed:
+                self.__counters["delayed"] += 1
+
+    def throttled(self, retry_after: Union[float, None] = None) -> None:
+        """Backs off after the website asked to slow down.
+
+        Parameters
+        ----------
+        retry_after : Union[float, None]
+            Seconds to wait before the next request, from the `Retry-After` header.
+            One refill interval at the reduced rate if `None`.
+        """
+        if not self.is_enabled:
+            return
+        now: float = time.monotonic()
+        self.__refill(now)
+        self.current_rate = max(self.min_rate, self.current_rate * self.backoff_factor)
+        if retry_after is None:
+            retry_after = 1 / self.current_rate
+        self.__blocked_until = max(self.__blocked_until, now + retry_after)
+        self.__tokens = 0.0
+        self.__counters["throttled"] += 1
+
+    def succeeded(self) -> None:
+        """Gradually recovers the rate after a response that was not throttled."""
+        if self.current_rate < self.rate:
+            self.current_rate = min(self.rate, self.current_rate + self.recovery_step)
+
+    def stats(self) -> Dict[str, Union[int, float, bool]]:
+        """Report statistics about the rate limiter.
+
+        Returns:
+        -------
+        Dict[str, Union[int, float, bool]]
+            Limiter configuration, current rate and counters.
+        """
+        stats: Dict[str, Union[int, float, bool]] = {
+            "enabled": self.is_enabled,
+            "rate": self.rate,
+            "burst": self.burst,
+            "min_rate": self.min_rate,
+            "current_rate": round(self.current_rate, 3),
+            "blocked_for": round(max(0.0, self.__blocked_until - time.monotonic()), 3),
+        }
+        stats.update(self.__counters)
+
+        return stats
+
+    def __refill(self, now: float) -> None:
+        """Adds the tokens earned since the last refill at the current rate."""
+        elapsed: float = now - self.__updated_at
+        self.__updated_at = now
+        self.__tokens = min(
+            float(self.burst), self.__tokens + elapsed * self.current_rate
+        )
@@ -0,0 +1,165 @@
+"""Module to retry failed requests and stop sending them to hosts that are down."""
+
+import random
+import time
+from typing import Dict, NamedTuple, Tuple, Union
+
+from src.scraper.constants import RetryConstants
+from src.scraper.exceptions import CircuitOpenError
+
+
+class RetryPolicy(NamedTuple):
+    """NamedTuple.
+
+    Declares how many times and how late a failed request is sent again. Only
+    idempotent `GET` requests are sent by the fetch layer, so all of them are safe
+    to retry.
+
+    Where:
+    - [0] = max_attempts: int, attempts including the first one.
+    - [1] = base_delay: float, seconds of the first backoff, doubled every attempt.
+    - [2] = max_delay: float, maximum seconds of a backoff.
+    - [3] = retry_statuses: Tuple[int, ...], HTTP statuses worth retrying.
+    - [4] = retry_on_timeout: bool, whether timed out requests are retried.
+    """
+
+    max_attempts: int = RetryConstants.max_attempts
+    base_delay: float = RetryConstants.base_delay
+    max_delay: float = RetryConstants.max_delay
+    retry_statuses: Tuple[int, ...] = RetryConstants.retry_statuses
+    retry_on_timeout: bool = True
+
+
+def backoff_delay(
+    policy: RetryPolicy,
+    attempt: int,
+    retry_after: Union[float, None] = None,
+) -> float:
+    """Computes the seconds to wait before the next attempt.
+
+    Backoffs grow exponentially with "full jitter": a random delay between zero and
+    the exponential bound, so that concurrent requests failing together do not
+    retry together.
+
+    Parameters
+    ----------
+    policy : RetryPolicy
+        Retry policy of the request.
+    attempt : int
+        Number of the attempt that just failed, starting from 1.
+    retry_after : Union[float, None]
+        Seconds the website asked to wait, if any, which the delay never undercuts.
+
+    Returns:
+    -------
+    float
+        Seconds to wait.
+    """
+    bound: float = min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1))
+    delay: float = random.uniform(0, bound)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, policy.max_delay))
+    return delay
+
+
+class CircuitStates:
+    """Class containing the states of a circuit breaker."""
+
+    closed: str = "closed"
+    open: str = "open"
+    half_open: str = "half-open"
+
+
+class CircuitBreaker:
+    """Circuit breaker of the requests sent to a single host.
+
+    After `failure_threshold` consecutive failures the circuit opens and requests
+    fail right away, instead of waiting for a host that is down to time out. Once
+    `reset_timeout` seconds have passed, a single trial request is let through: the
+    circuit closes if it succeeds and opens again if it fails.
+
+    Attributes:
+    ----------
+    host : str
+        Host the requests are sent to.
+    failure_threshold : int
+        Consecutive failures opening the circuit.
+    reset_timeout : float
+        Seconds the circuit stays open before a trial request.
+    """
+
+    def __init__(  # noqa: D107
+        self,
+        host: str,
+        failure_threshold: int = RetryConstants.circuit_failure_threshold,
+        reset_timeout: float = RetryConstants.circuit_reset_timeout,
+    ):
+        self.host: str = host
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.state: str = CircuitStates.closed
+        self.__failures: int = 0
+        self.__opened_at: float = 0.0
+        self.__trial_in_flight: bool = False
+        self.__counters: Dict[str, int] = {
+            "opened": 0,
+            "short_circuited": 0,
+        }
+
+    def before_request(self) -> None:
+        """Lets a request through, or raises if the circuit is open."""
+        if self.state == CircuitStates.open:
+            if time.monotonic() - self.__opened_at < self.reset_timeout:
+                self.__short_circuit()
+            self.state = CircuitStates.half_open
+        if self.state == CircuitStates.half_open:
+            if self.__trial_in_flight:
+                self.__short_circuit()
+            self.__trial_in_flight = True
+
+    def record_success(self) -> None:
+        """Closes the circuit after a request reached the host."""
+        self.state = CircuitStates.closed
+        self.__failures = 0
+        self.__trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Counts a failed request, opening the circuit if needed."""
+        self.__failures += 1
+        self.__trial_in_flight = False
+        if (
+            self.state == CircuitStates.half_open
+            or self.__failures >= self.failure_threshold
+        ):
+            if self.state != CircuitStates.open:
+                self.__counters["opened"] += 1
+            self.state = CircuitStates.open
+            self.__opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Lets another trial through after a request ended without an outcome."""
+        self.__trial_in_flight = False
+
+    def stats(self) -> Dict[str, Union[int, float, str]]:
+        """Report statistics about the circuit breaker.
+
+        Returns:
+        -------
+        Dict[str, Union[int, float, str]]
+            Host, state and counters of the circuit.
+        """
+        stats: Dict[str, Union[int, float, str]] = {
+            "host": self.host,
+            "state": self.state,
+            "consecutive_failures": self.__failures,
+        }
+        stats.update(self.__counters)
+
+        return stats
+
+    def __short_circuit(self) -> None:
+        """Fails a request without sending it."""
+        self.__counters["short_circuited"] += 1
+        raise CircuitOpenError(
+            f"Requests to {self.host} are suspended after repeated failures."
+        )
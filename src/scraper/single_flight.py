@@ -0,0 +1,86 @@
+"""Module to coalesce identical concurrent calls into a single one."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    """Outstanding call shared by all the callers of the same key."""
+
+    def __init__(self, task: "asyncio.Task[T]"):  # noqa: D107
+        self.task: "asyncio.Task[T]" = task
+        self.waiters: int = 0
+
+
+class SingleFlight(Generic[T]):
+    """Registry of in-flight calls keyed by e.g. URL, or URL and kind of page.
+
+    The first caller of a key starts the call in its own task, and the callers of
+    the same key arriving before it completes await that very task instead of
+    starting another one. A caller that is cancelled leaves the others waiting;
+    once every caller has gone, the call itself is cancelled.
+    """
+
+    def __init__(self) -> None:  # noqa: D107
+        self.__calls: Dict[Hashable, _Call[T]] = {}
+        self.__counters: Dict[str, int] = {
+            "calls": 0,
+            "coalesced": 0,
+            "abandoned": 0,
+        }
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls outstanding."""
+        return len(self.__calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Runs `func`, or joins the outstanding call of `key` if any.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key identifying identical calls.
+        func : Callable[[], Awaitable[T]]
+            Coroutine function making the call.
+
+        Returns:
+        -------
+        T
+            Result of the call, shared by all its callers.
+        """
+        call: Union[_Call[T], None] = self.__calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(func()))
+            self.__calls[key] = call
+            call.task.add_done_callback(lambda _: self.__forget(key, call))
+            self.__counters["calls"] += 1
+        else:
+            self.__counters["coalesced"] += 1
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                self.__forget(key, call)
+                call.task.cancel()
+                self.__counters["abandoned"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Report statistics about the coalesced calls.
+
+        Returns:
+        -------
+        Dict[str, int]
+            Calls made, callers that joined an outstanding call and calls cancelled
+            because every caller had gone.
+        """
+        return dict(self.__counters)
+
+    def __forget(self, key: Hashable, call: "_Call[T]") -> None:
+        """Removes a call from the registry, unless already replaced."""
+        if self.__calls.get(key) is call:
+            del self.__calls[key]
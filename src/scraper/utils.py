@@ -4,10 +4,12 @@ from functools import wraps
 from statistics import median
 from typing import Any, Awaitable, Callable, List, TypeVar, Union
 
+from src.scraper.constants import PlayerRolesConstants
 from src.scraper.exceptions import PageStructureError
+from src.scraper.extraction import PLAYER_PAGE
 
 
-def str_to_none(str_to_replace: str) -> Union[float, None]:
+def str_to_none(str_to_replace: Union[str, None]) -> Union[float, None]:
     """Converts a string with a comma as the decimal separator to a float."""
     if str_to_replace is None or str_to_replace == "":
         return None
@@ -42,7 +44,7 @@ def safe_zero_division(
     return result
 
 
-def empty_to_none(value: str) -> Union[float, None]:
+def empty_to_none(value: Union[str, None]) -> Union[float, None]:
     """Transforms empty strings to `None`, therefore to a float."""
     if value is None or value == "":
         return None
@@ -54,9 +56,13 @@ F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
 
 
 def check_for_soup(func: F) -> F:
-    """Decorator that ensures the BeautifulSoup object is initialized before
+    """Decorator that ensures the page is fetched and its fields are extracted before
     executing the decorated method.
 
+    Fields are extracted when the page is fetched, or from the BeautifulSoup object
+    with a single traversal of the document if one was set, the first time a
+    decorated method is called, then reused by all the following ones.
+
     Parameters
     ----------
     func : Callable[..., Awaitable[Any]]
@@ -70,8 +76,11 @@ def check_for_soup(func: F) -> F:
 
     @wraps(func)
     async def wrapper(self, *args, **kwargs) -> Any:  # type: ignore
-        if not self.soup:
-            await self.fetch_page()
+        if self.fields is None:
+            if self.soup is None:
+                await self.fetch_page()
+            else:
+                self.fields = PLAYER_PAGE.extract(self.soup)
         try:
             return await func(self, *args, **kwargs)
         except AttributeError as e:
@@ -105,3 +114,21 @@ def safe_median(data: List[Union[int, float, None]]) -> Union[float, None]:
     assert isinstance(median_value, float)
 
     return median_value
+
+
+def is_goalkeeper(role: Union[str, None]) -> bool:
+    """Tells whether a role scraped from a player page is the goalkeeper one.
+
+    Parameters
+    ----------
+    role : Union[str, None]
+        Role of the player, as returned by `BasePlayerSummaryStats.get_role`.
+
+    Returns:
+    -------
+    bool
+        `True` if the player is a goalkeeper, `False` otherwise.
+    """
+    if role is None:
+        return False
+    return role.strip().lower() in PlayerRolesConstants.goalkeeper_roles
@@ -0,0 +1,218 @@
+"""Tests of the parser backends over recorded pages."""
+
+import asyncio
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import lxml.html
+import pytest
+from bs4 import BeautifulSoup
+
+from src.api.models import PlayerLink
+from src.scraper.exceptions import PageStructureError
+from src.scraper.extraction import PLAYER_PAGE, ExtractedFields
+from src.scraper.get_full_player_stats import GetFullPlayerStats
+from src.scraper.get_matches_stats import GetMatchesStats
+from src.scraper.parser import (
+    PageParser,
+    ParserBackends,
+    _players_links_bs4,
+    _players_links_lxml,
+    extract_player_fields,
+    extract_players_links,
+)
+
+FIXTURES: Path = Path(__file__).parent / "fixtures"
+PLAYER_PAGES: Tuple[str, ...] = ("player_outfield.html", "player_goalkeeper.html")
+PLAYER_LINK: PlayerLink = PlayerLink(
+    name="Barella",
+    link="https://www.fantacalcio.it/serie-a/squadre/inter/barella/2103/2024-25",
+)
+
+
+def read_fixture(name: str) -> bytes:
+    """Reads a recorded page."""
+    return (FIXTURES / name).read_bytes()
+
+
+def scraped_stats(fields: ExtractedFields) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Runs the match stats and summary stats scrapers over extracted fields."""
+    scraper: GetFullPlayerStats = GetFullPlayerStats(player_link=PLAYER_LINK)
+    asyncio.run(scraper.extract_all(fields=fields))
+    ignored: Tuple[str, ...] = ("fields", "soup")
+    return (
+        {k: v for k, v in vars(scraper.matches).items() if k not in ignored},
+        {k: v for k, v in vars(scraper.summary).items() if k not in ignored},
+    )
+
+
+def structure_changed_page() -> bytes:
+    """A player page whose bonus and malus chart is no longer in the second axis."""
+    content: str = read_fixture("player_outfield.html").decode("utf-8")
+    return content.replace('<div class="x-axis">', '<div class="y-axis">').encode()
+
+
+@pytest.mark.parametrize("page", PLAYER_PAGES)
+def test_extract_and_extract_lxml_are_identical(page: str):
+    """Both backends extract the same values from a player page."""
+    content: bytes = read_fixture(page)
+    bs4_fields: ExtractedFields = PLAYER_PAGE.extract(BeautifulSoup(content, "lxml"))
+    lxml_fields: ExtractedFields = PLAYER_PAGE.extract_lxml(
+        lxml.html.document_fromstring(content)
+    )
+
+    assert PLAYER_PAGE.is_complete(bs4_fields)
+    assert lxml_fields.values == bs4_fields.values
+
+
+@pytest.mark.parametrize("page", PLAYER_PAGES)
+def test_scrapers_are_identical_across_backends(page: str):
+    """Every scraper gets the same stats whatever the backend."""
+    content: bytes = read_fixture(page)
+    bs4_fields, bs4_fell_back = extract_player_fields(content, ParserBackends.bs4)
+    lxml_fields, lxml_fell_back = extract_player_fields(content, ParserBackends.lxml)
+
+    assert not bs4_fell_back
+    assert not lxml_fell_back
+    assert scraped_stats(lxml_fields) == scraped_stats(bs4_fields)
+
+
+def test_goalkeeper_page_is_scraped_as_goalkeeper():
+    """The role read from the page picks the goalkeeper scraper."""
+    fields, _ = extract_player_fields(
+        read_fixture("player_goalkeeper.html"), ParserBackends.lxml
+    )
+    scraper: GetFullPlayerStats = GetFullPlayerStats(player_link=PLAYER_LINK)
+    asyncio.run(scraper.extract_all(fields=fields))
+
+    assert scraper.is_goalkeeper
+    assert scraper.summary is not None
+    assert "goals_conceded" in vars(scraper.summary)
+    assert "goals" not in vars(scraper.summary)
+
+
+def test_players_links_are_identical_across_backends():
+    """Both backends list the same players in the same order."""
+    content: bytes = read_fixture("players_links.html")
+    links, fell_back = extract_players_links(content, ParserBackends.lxml)
+
+    assert not fell_back
+    assert links == _players_links_lxml(content) == _players_links_bs4(content)
+    assert [link for _, link in links] == [
+        "https://www.fantacalcio.it/serie-a/squadre/inter/barella/2103/2024-25",
+        "https://www.fantacalcio.it/serie-a/squadre/inter/sommer/4430/2024-25",
+    ]
+
+
+def test_changed_structure_falls_back_to_bs4():
+    """A page missing a scoped element is parsed again with BeautifulSoup."""
+    fields, fell_back = extract_player_fields(
+        structure_changed_page(), ParserBackends.lxml
+    )
+
+    assert fell_back
+    assert not PLAYER_PAGE.is_complete(fields)
+    assert fields.all("grade") == ["6,5", "7", "", "6", "5,5", "7,5"]
+
+
+def test_changed_structure_raises_page_structure_error():
+    """Fields missing from a changed page raise instead of reading empty values."""
+    content: bytes = structure_changed_page()
+    fields, _ = extract_player_fields(content, ParserBackends.lxml)
+
+    with pytest.raises(PageStructureError):
+        fields.all("bonus")
+    with pytest.raises(PageStructureError):
+        fields.first("bonus")
+
+    scraper: GetMatchesStats = GetMatchesStats(player_link=PLAYER_LINK)
+    scraper.fields = fields
+    with pytest.raises(PageStructureError):
+        asyncio.run(scraper.get_bonus())
+
+
+def test_page_parser_counts_fallbacks():
+    """The shared parser reports the pages that fell back to BeautifulSoup."""
+
+    async def parse() -> Dict[str, Any]:
+        async with PageParser(backend=ParserBackends.lxml) as parser:
+            await parser.player_fields(read_fixture("player_outfield.html"))
+            await parser.player_fields(structure_changed_page())
+            return parser.stats()
+
+    stats: Dict[str, Any] = asyncio.run(parse())
+
+    assert stats["parsed"] == stats["fallbacks"] + 1
+    assert stats["fallbacks"] == 1
+
+
+def test_page_parser_coalesces_concurrent_parses_of_the_same_content():
+    """Concurrent callers of the same URL and content share a single parse."""
+    content: bytes = read_fixture("player_outfield.html")
+
+    async def parse() -> Tuple[List[ExtractedFields], Dict[str, Any]]:
+        async with PageParser(backend=ParserBackends.lxml) as parser:
+            results: List[ExtractedFields] = list(
+                await asyncio.gather(
+                    parser.player_fields(content, key=PLAYER_LINK.link),
+                    parser.player_fields(content, key=PLAYER_LINK.link),
+                )
+            )
+            return results, parser.stats()
+
+    (first, second), stats = asyncio.run(parse())
+
+    assert stats["coalesced"] == 1
+    assert stats["parsed"] == 1
+    assert first.values == second.values
+    assert first is not second
+    first.values["grade"].clear()
+    assert second.all("grade")
+
+
+def test_page_parser_does_not_coalesce_different_contents_of_the_same_url():
+    """A caller holding newer content of a URL never gets the parse of older one."""
+    pages: List[bytes] = [read_fixture(page) for page in PLAYER_PAGES]
+
+    async def parse() -> Tuple[List[ExtractedFields], Dict[str, Any]]:
+        async with PageParser(backend=ParserBackends.lxml) as parser:
+            results: List[ExtractedFields] = list(
+                await asyncio.gather(
+                    *(
+                        parser.player_fields(content, key=PLAYER_LINK.link)
+                        for content in pages
+                    )
+                )
+            )
+            return results, parser.stats()
+
+    results, stats = asyncio.run(parse())
+
+    assert stats["coalesced"] == 0
+    assert stats["parsed"] == len(pages)
+    assert [fields.first("role") for fields in results] == [
+        extract_player_fields(content, ParserBackends.lxml)[0].first("role")
+        for content in pages
+    ]
+    assert results[0].first("role") != results[1].first("role")
+
+
+def test_page_parser_memo_evicts_least_recently_used_contents():
+    """Only the last `memo_entries` distinct contents are kept, by recency."""
+    outfield, goalkeeper = (read_fixture(page) for page in PLAYER_PAGES)
+
+    async def parse() -> List[Dict[str, Any]]:
+        stats: List[Dict[str, Any]] = []
+        async with PageParser(backend=ParserBackends.lxml, memo_entries=1) as parser:
+            for content in (outfield, outfield, goalkeeper, outfield):
+                fields: ExtractedFields = await parser.player_fields(content)
+                assert PLAYER_PAGE.is_complete(fields)
+                fields.values.clear()
+                stats.append(parser.stats())
+        return stats
+
+    stats: List[Dict[str, Any]] = asyncio.run(parse())
+
+    assert [step["memo_hits"] for step in stats] == [0, 1, 1, 1]
+    assert [step["parsed"] for step in stats] == [1, 1, 2, 3]
+    assert all(step["memoized"] == 1 for step in stats)
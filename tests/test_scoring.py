@@ -0,0 +1,109 @@
+"""Tests of the fanta grades recomputed under custom league rules."""
+
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from src.analytics.rules import SITE_RULES, ScoringRules
+from src.analytics.scoring import recompute_fanta_grades
+from src.analytics.season_matrix import SeasonMatrix
+
+GOALKEEPER: Dict[str, str] = {"name": "Portiere", "link": "goalkeeper/2024-25"}
+MIDFIELDER: Dict[str, str] = {"name": "Mezzala", "link": "midfielder/2024-25"}
+SUMMARIES: Dict[str, Dict[str, Any]] = {
+    # Transferred from Atalanta to Bologna after the third game day
+    GOALKEEPER["link"]: {
+        "role": "Goalkeeper",
+        "player_type": "goalkeeper",
+        "team": "Bologna",
+    },
+    MIDFIELDER["link"]: {
+        "role": "Centrocampista",
+        "player_type": "outfield",
+        "team": "Inter",
+        "goals": 1,
+        "assists": 1,
+        "yellow_cards": 1,
+    },
+}
+
+
+def match(
+    game_day: int,
+    teams: Tuple[str, str],
+    score: Tuple[int, int],
+    grade: float,
+    points: float = 0.0,
+) -> Dict[str, Any]:
+    """A row of the match stats of a player, graded as the site does.
+
+    `points` are the bonus of the game day if positive, the malus if negative.
+    """
+    return {
+        "game_day": game_day,
+        "grade": grade,
+        "fanta_grade": grade + points,
+        "bonus": max(points, 0.0),
+        "malus": -min(points, 0.0),
+        "home_team": teams[0],
+        "guest_team": teams[1],
+        "home_team_score": score[0],
+        "guest_team_score": score[1],
+        "subsitution_in": None,
+        "subsitution_out": None,
+    }
+
+
+def season_matrix() -> SeasonMatrix:
+    """A season of a transferred goalkeeper and of a midfielder."""
+    goalkeeper: List[Dict[str, Any]] = [
+        match(1, ("Atalanta", "Como"), (0, 0), 6.0, 1.0),
+        match(2, ("Genoa", "Atalanta"), (2, 0), 5.5, -2.0),
+        match(3, ("Atalanta", "Empoli"), (1, 0), 6.5, 1.0),
+        match(4, ("Bologna", "Como"), (0, 0), 6.0, 1.0),
+        match(5, ("Lecce", "Bologna"), (0, 1), 6.0, 1.0),
+        match(6, ("Bologna", "Monza"), (3, 2), 5.0, -2.0),
+    ]
+    midfielder: List[Dict[str, Any]] = [
+        match(1, ("Inter", "Torino"), (2, 1), 7.0, 4.0),
+        match(2, ("Parma", "Inter"), (0, 0), 6.0, -0.5),
+    ]
+    return SeasonMatrix.from_players(
+        [
+            (GOALKEEPER, [dict(row, name=GOALKEEPER["name"]) for row in goalkeeper]),
+            (MIDFIELDER, [dict(row, name=MIDFIELDER["name"]) for row in midfielder]),
+        ]
+    )
+
+
+def test_site_rules_give_back_the_site_fanta_grades():
+    """The site's rules recompute exactly the fanta grades published by the site."""
+    matrix: SeasonMatrix = season_matrix()
+    fanta_grades: npt.NDArray[np.float64] = recompute_fanta_grades(
+        matrix, SUMMARIES, [SITE_RULES]
+    )
+
+    np.testing.assert_allclose(fanta_grades[0], matrix["fanta_grade"])
+
+
+def test_custom_rules_follow_the_team_of_each_game_day():
+    """Clean sheets and goals conceded are counted against each day's team."""
+    rules: ScoringRules = ScoringRules(
+        name="custom",
+        goal=4.0,
+        goal_conceded=-0.5,
+        clean_sheet_by_role={"goalkeeper": 0.5},
+    )
+    matrix: SeasonMatrix = season_matrix()
+    fanta_grades: npt.NDArray[np.float64] = recompute_fanta_grades(
+        matrix, SUMMARIES, [rules]
+    )
+
+    goalkeeper: int = matrix.row(GOALKEEPER["link"])
+    midfielder: int = matrix.row(MIDFIELDER["link"])
+    np.testing.assert_allclose(
+        fanta_grades[0, goalkeeper, :6], [6.5, 4.5, 7.0, 6.5, 6.5, 4.0]
+    )
+    np.testing.assert_allclose(fanta_grades[0, midfielder, :2], [12.0, 5.5])
+    assert np.isnan(fanta_grades[0, :, 6:]).all()